@@ -1,12 +1,16 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Request, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import os
 import json
+import hashlib
+import tempfile
+import threading
+from collections import Counter
+from contextlib import nullcontext
 from datetime import datetime
 import uuid
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
-import PyPDF2
-import docx
 # Import both processors - enhanced one is primary, original as fallback
 try:
     from enhanced_nlp_processor import EnhancedResumeMatcherNLP
@@ -16,20 +20,81 @@ except ImportError:
     from nlp_processor import ResumeMatcherNLP
     ENHANCED_NLP_AVAILABLE = False
     
-from database import Database
+from database import Database, decode_cursor, MATCH_COMPONENTS
+from score_cache import create_score_cache
+from score_materializer import ScoreMaterializer
+from ingestion_queue import IngestionQueue, IngestionError
+from text_extraction import ExtractionError, extract_text, get_extraction_pool, EXTRACTOR_VERSION
+from nlp_processor import FEATURES_VERSION, MATCH_DETAIL_SECTIONS, SECTION_ANALYZER
+from extraction_sandbox import ExtractionSandbox
+from bulk_ingest import BulkIngester
+from responses import api_response, dumps_json, init_app as init_responses, versioned
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class UploadLimitRequest(Request):
+    """A request whose body limit is BULK_INGEST_MAX_BYTES for bulk ingestion and MAX_CONTENT_LENGTH otherwise"""
+    
+    @property
+    def max_content_length(self):
+        if self.endpoint == 'bulk_ingest':
+            return BULK_INGEST_MAX_BYTES
+        return super().max_content_length
+
 app = Flask(__name__)
+app.request_class = UploadLimitRequest
 CORS(app)
+init_responses(app)
 
 # Configuration
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt'}
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+SCORE_CACHE_MAX_ENTRIES = int(os.environ.get('SCORE_CACHE_MAX_ENTRIES', 10000))
+SCORE_CACHE_MAX_BYTES = int(os.environ.get('SCORE_CACHE_MAX_BYTES', 64 * 1024 * 1024))  # 64MB
+# 'sqlite' shares scores between all worker processes on the host, 'memory' keeps them per process
+SCORE_CACHE_BACKEND = os.environ.get('SCORE_CACHE_BACKEND', 'sqlite')
+SCORE_CACHE_SHARED_MAX_ENTRIES = int(os.environ.get('SCORE_CACHE_SHARED_MAX_ENTRIES', 200000))
+SCORE_CACHE_SHARED_MAX_BYTES = int(os.environ.get('SCORE_CACHE_SHARED_MAX_BYTES', 512 * 1024 * 1024))  # 512MB
+SCORE_SWEEP_INTERVAL = float(os.environ.get('SCORE_SWEEP_INTERVAL', 30))  # seconds between stale score sweeps
+INGESTION_WORKERS = int(os.environ.get('INGESTION_WORKERS', 2))
+INGESTION_LEASE_SECONDS = float(os.environ.get('INGESTION_LEASE_SECONDS', 300))  # requeue jobs of crashed workers after this
+# Uploads are buffered in memory up to this size before spilling to an anonymous temp file
+UPLOAD_SPOOL_MAX_BYTES = int(os.environ.get('UPLOAD_SPOOL_MAX_BYTES', 2 * 1024 * 1024))  # 2MB
+# Keep a copy of each successfully processed upload in UPLOAD_FOLDER
+PERSIST_UPLOADS = os.environ.get('PERSIST_UPLOADS', 'true').lower() == 'true'
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 50))
+PDF_MAX_CHARS = int(os.environ.get('PDF_MAX_CHARS', 200000))
+# Also extract the text of DOCX table cells (python-docx's paragraph list skips them)
+DOCX_INCLUDE_TABLES = os.environ.get('DOCX_INCLUDE_TABLES', 'false').lower() == 'true'
+# Cached text and features are only reused if extraction options and code versions match
+DOCUMENT_CACHE_VERSION = (f"{EXTRACTOR_VERSION}.{FEATURES_VERSION}.{PDF_MAX_PAGES}.{PDF_MAX_CHARS}"
+                          f".{int(DOCX_INCLUDE_TABLES)}")
+# Sandbox processes extracting uploads with a per-file timeout and memory cap (0 extracts in-process)
+EXTRACTION_SANDBOX_WORKERS = int(os.environ.get('EXTRACTION_SANDBOX_WORKERS', 2))
+EXTRACTION_TIMEOUT = float(os.environ.get('EXTRACTION_TIMEOUT', 30))  # seconds per file
+EXTRACTION_MEMORY_LIMIT = int(os.environ.get('EXTRACTION_MEMORY_LIMIT', 512 * 1024 * 1024))  # 512MB per worker
+# Processes used to extract page ranges of long PDFs in parallel when extracting in-process (0 disables);
+# by default one core is left for the web workers, so single-core hosts extract sequentially
+PDF_EXTRACTION_WORKERS = int(os.environ.get('PDF_EXTRACTION_WORKERS', min(4, (os.cpu_count() or 1) - 1)))
+BULK_INGEST_EXTENSIONS = {'zip', 'jsonl'}
+BULK_INGEST_WORKERS = int(os.environ.get('BULK_INGEST_WORKERS', max(EXTRACTION_SANDBOX_WORKERS, 1)))
+BULK_INGEST_BATCH_SIZE = int(os.environ.get('BULK_INGEST_BATCH_SIZE', 200))  # documents per transaction
+# Bulk archives have their own upload limit instead of MAX_CONTENT_LENGTH
+BULK_INGEST_MAX_BYTES = int(os.environ.get('BULK_INGEST_MAX_BYTES', 2 * 1024 * 1024 * 1024))  # 2GB
+DEFAULT_PAGE_SIZE = int(os.environ.get('DEFAULT_PAGE_SIZE', 100))  # rows per list page
+MAX_PAGE_SIZE = 500  # stays under the SQLite host parameter limit of older builds
+# Above this many documents, matching scores only the top candidates by full-text rank (0 scores everything)
+MATCH_CANDIDATE_LIMIT = int(os.environ.get('MATCH_CANDIDATE_LIMIT', 1000))
+FTS_QUERY_TERMS = int(os.environ.get('FTS_QUERY_TERMS', 64))  # most frequent terms of a document searched for
+MATCH_STREAM_CHUNK_SIZE = int(os.environ.get('MATCH_STREAM_CHUNK_SIZE', 50))  # resumes loaded and stored per chunk when streaming
+# Optional sections of match responses that ``fields=`` selects; ``fields=summary`` leaves them all out
+MATCH_RESULT_FIELDS = ('skills_analysis', 'component_scores', 'experience_analysis', 'recommendations', 'metadata')
+JOB_MATCH_FIELDS = ('skills_analysis', 'component_scores', 'recommendations')
+LIST_MATCH_FIELDS = ('common_skills', 'missing_skills', 'match_details')
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
@@ -38,16 +103,34 @@ app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 # Initialize NLP processor and database - use enhanced version if available
+db = Database()
+
 if ENHANCED_NLP_AVAILABLE:
     logger.info("Using Enhanced NLP Processor with improved accuracy")
     nlp_processor = EnhancedResumeMatcherNLP()
     validation_framework = ValidationFramework(nlp_processor)
+    score_materializer = None
 else:
     logger.info("Using Standard NLP Processor")
-    nlp_processor = ResumeMatcherNLP()
+    score_cache = create_score_cache(
+        backend=SCORE_CACHE_BACKEND,
+        # The shared cache lives next to the main database so all workers find it
+        path=os.path.join(os.path.dirname(os.path.abspath(db.db_path)), 'score_cache.db'),
+        max_entries=SCORE_CACHE_MAX_ENTRIES,
+        max_bytes=SCORE_CACHE_MAX_BYTES,
+        shared_max_entries=SCORE_CACHE_SHARED_MAX_ENTRIES,
+        shared_max_bytes=SCORE_CACHE_SHARED_MAX_BYTES
+    )
+    nlp_processor = ResumeMatcherNLP(score_cache=score_cache)
     validation_framework = None
+    # Keeps the match_scores table current so reads don't need on-demand scoring
+    score_materializer = ScoreMaterializer(db, nlp_processor, sweep_interval=SCORE_SWEEP_INTERVAL)
 
-db = Database()
+def index_skills(doc_type, documents):
+    """Persist the skills of (doc_id, text) documents in the skill index used by /api/search/skills"""
+    if documents and hasattr(nlp_processor, 'get_document_skills'):
+        db.index_document_skills([(doc_type, doc_id, nlp_processor.get_document_skills(text))
+                                  for doc_id, text in documents])
 
 def initialize_nlp_with_existing_data():
     """Load existing job descriptions and resumes into NLP processor"""
@@ -75,6 +158,14 @@ def initialize_nlp_with_existing_data():
             nlp_processor.fit_corpus_vectorizers()
             logger.info(f"Fitted corpus vectorizers with {len(nlp_processor.all_texts)} documents")
         
+        # Index the skills of documents stored before the skill index existed or without a server running
+        indexed_jobs = db.get_skill_indexed_ids('job')
+        index_skills('job', [(job['id'], f"{job['description']} {job['requirements'] or ''}")
+                             for job in jobs if job['id'] not in indexed_jobs])
+        indexed_resumes = db.get_skill_indexed_ids('resume')
+        index_skills('resume', [(resume['id'], resume['content'])
+                                for resume in resumes if resume['id'] not in indexed_resumes])
+        
         logger.info("NLP processor initialization completed")
         
     except Exception as e:
@@ -82,41 +173,448 @@ def initialize_nlp_with_existing_data():
 
 # Initialize with existing data on startup
 initialize_nlp_with_existing_data()
+if score_materializer:
+    score_materializer.start()
+
+def fresh_match_scores(stored_scores, key):
+    """Index materialized scores from the current model version by `key` and seed the score cache"""
+    fresh_scores = {}
+    for score in stored_scores:
+        if score['model_version'] == nlp_processor.model_version:
+            fresh_scores[score[key]] = score
+            nlp_processor.prime_cached_score(score['job_id'], score['resume_id'], score['similarity_score'])
+    return fresh_scores
 
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def extract_text_from_file(file_path):
-    """Extract text content from uploaded files"""
+extraction_sandbox = ExtractionSandbox(
+    workers=EXTRACTION_SANDBOX_WORKERS,
+    timeout=EXTRACTION_TIMEOUT,
+    memory_limit=EXTRACTION_MEMORY_LIMIT,
+    max_pages=PDF_MAX_PAGES,
+    max_chars=PDF_MAX_CHARS,
+    include_tables=DOCX_INCLUDE_TABLES
+) if EXTRACTION_SANDBOX_WORKERS > 0 else None
+
+def spool_upload(stream, chunk_size=64 * 1024):
+    """Copy an upload stream into a spooled buffer, hashing it on the way"""
+    digest = hashlib.sha256()
+    buffer = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_BYTES)
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        digest.update(chunk)
+        buffer.write(chunk)
+    buffer.seek(0)
+    return buffer, digest.hexdigest()
+
+def extract_text_from_file(source, filename=None):
+    """
+    Extract text content from an uploaded file path or binary buffer named `filename`.
+    
+    Raises ExtractionError with the reason when the sandbox gives up on a file.
+    """
+    if extraction_sandbox:
+        return extraction_sandbox.extract(source, filename)
+    
     try:
-        file_extension = file_path.lower().split('.')[-1]
-        
-        if file_extension == 'pdf':
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                return text
+        return extract_text(
+            source,
+            filename,
+            max_pages=PDF_MAX_PAGES,
+            max_chars=PDF_MAX_CHARS,
+            executor=get_extraction_pool(PDF_EXTRACTION_WORKERS),
+            include_tables=DOCX_INCLUDE_TABLES
+        )
+    except Exception as e:
+        logger.error(f"Error extracting text from {filename or source}: {str(e)}")
+        return ""
+
+def ingest_resume(job):
+    """Extract, store and index a queued resume upload"""
+    resume_id = job['id']
+    payload = job['payload']
+    content_hash = job['content_hash']
+    
+    # Re-uploads of the same file reuse its extracted text and NLP features
+    cached = db.get_cached_document(content_hash, DOCUMENT_CACHE_VERSION) if content_hash else None
+    
+    try:
+        if cached:
+            resume_text = cached['text']
+        elif payload is not None:
+            payload.seek(0)  # Rewind for retries
+            resume_text = extract_text_from_file(payload, job['filename'])
+        elif job['file_path'] and os.path.exists(job['file_path']):
+            resume_text = extract_text_from_file(job['file_path'])
+        else:
+            # The buffered upload died with the process that received it
+            raise IngestionError('The upload was interrupted, please upload the resume again')
+    except ExtractionError as e:
+        logger.warning(f"Extraction failed for resume {resume_id}: {str(e)}")
+        raise IngestionError(str(e))
+    
+    if not resume_text.strip():
+        raise IngestionError('Could not extract text from the resume')
+    
+    # Only uploads that produced text are written to disk
+    file_path = job['file_path'] if PERSIST_UPLOADS else None
+    if payload is not None and file_path and not os.path.exists(file_path):
+        payload.seek(0)
+        partial_path = f"{file_path}.{resume_id}.part"
+        with open(partial_path, 'wb') as file:
+            for chunk in iter(lambda: payload.read(64 * 1024), b''):
+                file.write(chunk)
+        os.replace(partial_path, file_path)  # Atomic, so concurrent identical uploads never see a partial file
+    
+    # A retried job may already have stored the resume before its worker died
+    if not db.get_resume(resume_id):
+        db.create_resume(
+            filename=job['filename'],
+            candidate_name=job['candidate_name'],
+            candidate_email=job['candidate_email'],
+            content=resume_text,
+            file_path=file_path,
+            resume_id=resume_id
+        )
+    
+    # Process the resume with NLP; the corpus is refitted once the queue drains
+    if not hasattr(nlp_processor, 'document_features'):
+        nlp_processor.process_resume(resume_id, resume_text)
+        return
+    features = cached['features'] if cached else None
+    if features is None:
+        features = nlp_processor.document_features(resume_text)
+        if content_hash:
+            db.cache_document(content_hash, DOCUMENT_CACHE_VERSION, resume_text, features)
+    nlp_processor.process_resume(resume_id, resume_text, features=features)
+    db.index_document_skills([('resume', resume_id, features['skills'])])
+    
+    if score_materializer:
+        score_materializer.score_resume(resume_id)
+
+def refit_after_ingestion():
+    """Refit corpus vectorizers once per burst of ingested resumes"""
+    # Duplicates of documents already in the corpus leave it fitted
+    if not nlp_processor.corpus_fitted and len(nlp_processor.all_texts) >= 2:
+        nlp_processor.fit_corpus_vectorizers()
+        logger.info("Refitted corpus vectorizers after ingesting resumes")
+    
+    # The sweep scores the new resumes against all jobs
+    if score_materializer:
+        score_materializer.notify_model_changed()
+
+ingestion_queue = IngestionQueue(
+    db,
+    handler=ingest_resume,
+    workers=INGESTION_WORKERS,
+    lease_seconds=INGESTION_LEASE_SECONDS,
+    on_drain=refit_after_ingestion
+)
+
+# Process uploads queued before a restart or by other workers
+db.prune_document_cache(DOCUMENT_CACHE_VERSION)
+ingestion_queue.start()
+
+bulk_ingester = BulkIngester(
+    db,
+    extract=extract_text_from_file,
+    nlp_processor=nlp_processor,
+    workers=BULK_INGEST_WORKERS,
+    batch_size=BULK_INGEST_BATCH_SIZE
+)
+bulk_ingest_threads = {}
+
+def run_bulk_ingest(path, run_id):
+    """Ingest a bulk upload, then score the new documents once"""
+    try:
+        # Background scoring between batches would refit and rescore the corpus after every batch
+        with score_materializer.paused() if score_materializer else nullcontext():
+            bulk_ingester.ingest(path, run_id)
+        os.remove(path)
+    except Exception as e:
+        logger.error(f"Error in bulk ingestion {run_id}: {str(e)}")
+    finally:
+        bulk_ingest_threads.pop(run_id, None)
+        if score_materializer:
+            score_materializer.notify_model_changed()
+
+def start_bulk_ingest(path, run_id):
+    thread = threading.Thread(target=run_bulk_ingest, args=(path, run_id),
+                              name=f'bulk-ingest-{run_id}', daemon=True)
+    bulk_ingest_threads[run_id] = thread
+    thread.start()
+
+def page_args():
+    """Read the ``after`` cursor and ``limit`` of a list request; raises ValueError if they are invalid"""
+    after = request.args.get('after') or None
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    if after:
+        decode_cursor(after)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+    return after, limit
+
+def parse_fields(value, sections):
+    """
+    The optional sections named in a ``fields`` parameter, or None for all of them.
+    
+    ``value`` is a comma-separated string (query string) or a list of names (JSON
+    body); ``summary`` names none. Raises ValueError for unknown names.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.split(',')
+    elif not isinstance(value, (list, tuple)):
+        raise ValueError('fields must be a comma-separated string or a list of names')
+    names = {str(name).strip() for name in value if str(name).strip()} - {'summary'}
+    unknown = names - set(sections)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))} (choose from summary, {', '.join(sections)})")
+    return names
+
+def match_detail_sections(fields):
+    """The NLP match detail sections needed for the requested response fields"""
+    return None if fields is None else [section for section in MATCH_DETAIL_SECTIONS if section in fields]
+
+def full_text_terms(text):
+    """The most frequent terms of a document, without stop words, to search the full-text index with"""
+    return [term for term, _ in Counter(SECTION_ANALYZER(text)).most_common(FTS_QUERY_TERMS)]
+
+def match_candidates(job_desc):
+    """
+    The resumes to score for a job.
+    
+    In a corpus larger than MATCH_CANDIDATE_LIMIT, only the best resumes by
+    bm25 against the job's terms are loaded from the database and scored.
+    """
+    if MATCH_CANDIDATE_LIMIT and db.count_resumes() > MATCH_CANDIDATE_LIMIT:
+        terms = full_text_terms(f"{job_desc['description']} {job_desc['requirements'] or ''}")
+        resume_ids = db.search_resumes(terms, MATCH_CANDIDATE_LIMIT)
+        logger.info(f"Prefiltered {len(resume_ids)} candidate resumes for job {job_desc['id']} by full-text rank")
+        return db.get_resumes_by_ids(resume_ids)
+    return db.get_resumes()
+
+def match_candidate_ids(job_desc):
+    """The ids of the resumes to score for a job, prefiltered like ``match_candidates``"""
+    if MATCH_CANDIDATE_LIMIT and db.count_resumes() > MATCH_CANDIDATE_LIMIT:
+        terms = full_text_terms(f"{job_desc['description']} {job_desc['requirements'] or ''}")
+        return db.search_resumes(terms, MATCH_CANDIDATE_LIMIT)
+    return db.get_resume_ids()
+
+def prepare_job_for_matching(job_id, job_desc):
+    """Ensure the job is processed and the corpus vectorizers are fitted"""
+    if ENHANCED_NLP_AVAILABLE:
+        # Enhanced processor uses job_data
+        if job_id not in nlp_processor.job_data:
+            nlp_processor.add_job_description(job_id, job_desc)
+    else:
+        # Standard processor uses job_texts
+        if job_id not in nlp_processor.job_texts:
+            content = f"{job_desc['description']} {job_desc['requirements']}"
+            nlp_processor.process_job_description(job_id, content)
+    
+    if len(nlp_processor.all_texts) >= 2 and not nlp_processor.corpus_fitted:
+        logger.info("Fitting corpus vectorizers for matching...")
+        nlp_processor.fit_corpus_vectorizers()
+
+def stored_match_details(job_id, resume_id, fields, stored_score):
+    """
+    The match details for the requested fields of a pair.
+    
+    With a materialized score for the pair, the component scores are read from
+    it and only the remaining sections are computed.
+    """
+    sections = match_detail_sections(fields)
+    if stored_score is None:
+        return nlp_processor.get_match_details(job_id, resume_id, sections=sections)
+    
+    sections = list(MATCH_DETAIL_SECTIONS) if sections is None else sections
+    match_details = nlp_processor.get_match_details(
+        job_id, resume_id, sections=[section for section in sections if section != 'component_scores']
+    )
+    if match_details and 'component_scores' in sections:
+        match_details['component_scores'] = dict(stored_score['component_scores'])
+    return match_details
+
+def score_resume_match(job_id, resume_data, stored_scores, fields=None):
+    """
+    Score one resume against a job; returns the API result and the row to store.
+    
+    With ``fields``, only those optional sections are computed and returned, and
+    there is no row to store (None), so stored full analyses are not replaced.
+    """
+    resume_id = resume_data['id']
+    
+    # Ensure resume is processed in the NLP processor
+    if ENHANCED_NLP_AVAILABLE:
+        # Enhanced processor uses resume_data
+        if resume_id not in nlp_processor.resume_data:
+            nlp_processor.add_resume(resume_id, resume_data)
+    else:
+        # Standard processor uses resume_texts
+        if resume_id not in nlp_processor.resume_texts:
+            nlp_processor.process_resume(resume_id, resume_data['content'])
+    
+    # Debug logging
+    logger.info(f"Calculating similarity for job {job_id} vs resume {resume_id}")
+    
+    # Calculate enhanced similarity with detailed analysis
+    if ENHANCED_NLP_AVAILABLE:
+        similarity_score, confidence_score = nlp_processor.calculate_similarity(job_id, resume_id)
+    elif resume_id in stored_scores:
+        similarity_score = stored_scores[resume_id]['similarity_score']
+        confidence_score = 0.5  # Default confidence for original processor
+    else:
+        similarity_score = nlp_processor.calculate_similarity(job_id, resume_id)
+        confidence_score = 0.5  # Default confidence for original processor
         
-        elif file_extension == 'docx':
-            doc = docx.Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+    if ENHANCED_NLP_AVAILABLE:
+        match_details = nlp_processor.get_match_details(job_id, resume_id)
+    else:
+        match_details = stored_match_details(job_id, resume_id, fields, stored_scores.get(resume_id))
+    
+    logger.info(f"Similarity: {similarity_score:.3f}, Confidence: {confidence_score:.3f}, "
+               f"Match strength: {match_details.get('match_strength', 'unknown')}")
+    
+    # Determine match category
+    match_category = match_details.get('match_strength', 'unknown')
+    
+    match_result = {
+        'resume_id': resume_id,
+        'candidate_name': resume_data['candidate_name'],
+        'candidate_email': resume_data['candidate_email'],
+        'filename': resume_data['filename'],
+        'similarity_score': similarity_score,
+        'confidence_score': confidence_score,
+        'match_percentage': round(similarity_score * 100, 2),
+        'confidence_percentage': round(confidence_score * 100, 2),
+        'match_category': match_category,
+        'uploaded_at': resume_data['uploaded_at']
+    }
+    for section in MATCH_RESULT_FIELDS:
+        if fields is None or section in fields:
+            match_result[section] = match_details.get(section, [] if section == 'recommendations' else {})
+    if fields is not None:
+        return match_result, None
+    
+    # The enhanced match for storage
+    skills_analysis = match_details.get('skills_analysis', {})
+    match_row = {
+        'job_id': job_id,
+        'resume_id': resume_id,
+        'model_version': getattr(nlp_processor, 'model_version', None),
+        'similarity_score': similarity_score,
+        'common_skills': skills_analysis.get('matched_skills', []),
+        'missing_skills': skills_analysis.get('missing_skills', []),
+        'match_details': match_result,
+        'component_scores': match_result['component_scores'],
+        'match_category': match_category
+    }
+    return match_result, match_row
+
+def score_resume_matches(job_id, resumes, stored_scores, fields=None):
+    """Score resumes against a job; returns the results, best first, and the rows to store"""
+    matches_result, match_rows = [], []
+    for resume_data in resumes:
+        match_result, match_row = score_resume_match(job_id, resume_data, stored_scores, fields)
+        matches_result.append(match_result)
+        if match_row:
+            match_rows.append(match_row)
+    
+    # Sort by similarity score (descending)
+    matches_result.sort(key=lambda x: x['similarity_score'], reverse=True)
+    return matches_result, match_rows
+
+def job_candidates(resume_data):
+    """The jobs to score for a resume; in a corpus larger than MATCH_CANDIDATE_LIMIT, the best by bm25"""
+    jobs = db.get_job_descriptions()
+    if MATCH_CANDIDATE_LIMIT and len(jobs) > MATCH_CANDIDATE_LIMIT:
+        job_ids = set(db.search_job_descriptions(full_text_terms(resume_data['content']), MATCH_CANDIDATE_LIMIT))
+        jobs = [job for job in jobs if job['id'] in job_ids]
+    return jobs
+
+def score_job_matches(resume_id, jobs, stored_scores, fields=None):
+    """Score a resume against jobs for the candidate view; returns the job matches, best first"""
+    # Ensure corpus vectorizers are fitted before matching
+    if len(nlp_processor.all_texts) >= 2 and not nlp_processor.corpus_fitted:
+        logger.info("Fitting corpus vectorizers for candidate matching...")
+        nlp_processor.fit_corpus_vectorizers()
+    
+    job_matches = []
+    for job in jobs:
+        job_id = job['id']
         
-        elif file_extension == 'txt':
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
+        # Debug logging
+        logger.info(f"Calculating similarity for resume {resume_id} vs job {job_id}")
         
+        # Calculate similarity (resume vs job, reversed from recruiter view)
+        if job_id in stored_scores:
+            similarity_score = stored_scores[job_id]['similarity_score']
         else:
-            return ""
+            similarity_score = nlp_processor.calculate_similarity(job_id, resume_id)
+        match_details = stored_match_details(job_id, resume_id, fields, stored_scores.get(job_id))
+        
+        logger.info(f"Similarity score: {similarity_score}, Match strength: {match_details.get('match_strength', 'unknown')}")
+        
+        # Determine match category
+        match_category = match_details.get('match_strength', 'unknown')
+        
+        job_match = {
+            'job_id': job_id,
+            'title': job['title'],
+            'company': job['company'],
+            'description_preview': job['description'][:200] + '...' if len(job['description']) > 200 else job['description'],
+            'created_at': job['created_at'],
+            'similarity_score': similarity_score,
+            'match_percentage': round(similarity_score * 100, 2),
+            'match_category': match_category
+        }
+        for section in JOB_MATCH_FIELDS:
+            if fields is None or section in fields:
+                job_match[section] = match_details.get(section, [] if section == 'recommendations' else {})
+        
+        job_matches.append(job_match)
+    
+    # Sort by similarity score (descending) - best matches first
+    job_matches.sort(key=lambda x: x['similarity_score'], reverse=True)
+    return job_matches
+
+def stream_matches(job_id, job_desc, stored_scores, fields=None):
+    """
+    Score a job's candidates chunk by chunk, yielding one NDJSON line per match.
     
+    Only ``MATCH_STREAM_CHUNK_SIZE`` resumes are loaded at a time and each
+    chunk's matches are stored before the next is read. Results come in scoring
+    order, not by score; the last line is a summary record.
+    """
+    resume_ids = match_candidate_ids(job_desc)
+    logger.info(f"Streaming matches for job {job_id} against {len(resume_ids)} resumes")
+    total, best = 0, None
+    try:
+        for start in range(0, len(resume_ids), MATCH_STREAM_CHUNK_SIZE):
+            match_rows = []
+            for resume_data in db.get_resumes_by_ids(resume_ids[start:start + MATCH_STREAM_CHUNK_SIZE]):
+                match_result, match_row = score_resume_match(job_id, resume_data, stored_scores, fields)
+                if match_row:
+                    match_rows.append(match_row)
+                total += 1
+                if best is None or match_result['similarity_score'] > best['similarity_score']:
+                    best = {'resume_id': match_result['resume_id'],
+                            'similarity_score': match_result['similarity_score']}
+                yield dumps_json({'type': 'match', **match_result}) + b'\n'
+            if match_rows:
+                db.create_matches(match_rows)
+        if fields is None:
+            db.compact_matches(getattr(nlp_processor, 'model_version', None) or '', job_id=job_id)
+        yield dumps_json({'type': 'summary', 'success': True, 'job_id': job_id,
+                          'total_candidates': total, 'best_match': best}) + b'\n'
     except Exception as e:
-        logger.error(f"Error extracting text from {file_path}: {str(e)}")
-        return ""
+        # The status line is already sent; report the failure in-band
+        logger.error(f"Error streaming matches: {str(e)}")
+        yield dumps_json({'type': 'error', 'error': 'Internal server error',
+                          'total_candidates': total}) + b'\n'
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -142,12 +640,16 @@ def create_job_description():
         
         # Process the job description with NLP
         nlp_processor.process_job_description(job_id, data['description'])
+        index_skills('job', [(job_id, f"{data['description']} {data.get('requirements', '')}")])
         
         # Refit corpus vectorizers if we have enough documents
         if len(nlp_processor.all_texts) >= 2:
             nlp_processor.fit_corpus_vectorizers()
             logger.info("Refitted corpus vectorizers after adding job description")
         
+        if score_materializer:
+            score_materializer.score_job(job_id)
+        
         return jsonify({
             'success': True,
             'job_id': job_id,
@@ -159,12 +661,19 @@ def create_job_description():
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/job-descriptions', methods=['GET'])
+@versioned(lambda: db.get_data_version(('job_descriptions',)))
 def get_job_descriptions():
-    """Get all job descriptions"""
+    """Get a page of job descriptions, newest first"""
     try:
-        job_descriptions = db.get_job_descriptions()
+        after, limit = page_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        job_descriptions, next_cursor = db.list_job_descriptions(after, limit)
         return jsonify({
-            'job_descriptions': job_descriptions
+            'job_descriptions': job_descriptions,
+            'next_cursor': next_cursor
         })
     except Exception as e:
         logger.error(f"Error fetching job descriptions: {str(e)}")
@@ -172,7 +681,7 @@ def get_job_descriptions():
 
 @app.route('/api/resume', methods=['POST'])
 def upload_resume():
-    """Upload and process a resume"""
+    """Upload a resume and queue it for processing"""
     try:
         # Check if file is present
         if 'resume' not in request.files:
@@ -190,49 +699,157 @@ def upload_resume():
         candidate_name = request.form.get('candidate_name', 'Anonymous Candidate')
         candidate_email = request.form.get('candidate_email', '')
         
-        # Save the file
+        # Buffer the upload in memory; it is only written to disk once text was extracted
         resume_id = str(uuid.uuid4())
-        filename = secure_filename(f"{resume_id}_{file.filename}")
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
-        
-        # Extract text from the file
-        resume_text = extract_text_from_file(file_path)
-        
-        if not resume_text.strip():
-            os.remove(file_path)  # Clean up the file
-            return jsonify({'error': 'Could not extract text from the resume'}), 400
-        
-        # Store resume data in database
-        resume_id = db.create_resume(
+        buffer, content_hash = spool_upload(file.stream)
+        extension = file.filename.rsplit('.', 1)[1].lower()
+        # Named by content so identical uploads share one file
+        file_path = os.path.join(app.config['UPLOAD_FOLDER'], secure_filename(f"{content_hash}.{extension}"))
+        
+        # Queue the buffer; extraction and NLP processing happen on the ingestion workers
+        ingestion_queue.enqueue(
+            resume_id=resume_id,
             filename=file.filename,
             candidate_name=candidate_name,
             candidate_email=candidate_email,
-            content=resume_text,
-            file_path=file_path
+            file_path=file_path,
+            payload=buffer,
+            content_hash=content_hash
         )
         
-        # Process the resume with NLP
-        nlp_processor.process_resume(resume_id, resume_text)
+        return api_response({
+            'success': True,
+            'resume_id': resume_id,
+            'status': 'queued',
+            'status_url': f'/api/resume/{resume_id}/status',
+            'message': 'Resume uploaded and queued for processing'
+        }), 202
+    
+    except Exception as e:
+        logger.error(f"Error uploading resume: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/resume/<resume_id>/status', methods=['GET'])
+def get_resume_status(resume_id):
+    """Get the processing status of an uploaded resume"""
+    try:
+        job = ingestion_queue.status(resume_id)
+        if job:
+            return jsonify({
+                'resume_id': resume_id,
+                'status': job['status'],
+                'error': job['error'],
+                'attempts': job['attempts'],
+                'created_at': job['created_at'],
+                'updated_at': job['updated_at']
+            })
         
-        # Refit corpus vectorizers if we have enough documents
-        if len(nlp_processor.all_texts) >= 2:
-            nlp_processor.fit_corpus_vectorizers()
-            logger.info("Refitted corpus vectorizers after adding resume")
+        # Resumes stored before the ingestion queue existed
+        if db.get_resume(resume_id):
+            return jsonify({'resume_id': resume_id, 'status': 'completed', 'error': None})
+        
+        return jsonify({'error': 'Resume not found'}), 404
+    
+    except Exception as e:
+        logger.error(f"Error fetching resume status: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+def bulk_upload_too_large():
+    return jsonify({'error': f'Archive exceeds the {BULK_INGEST_MAX_BYTES} byte bulk upload limit'}), 413
+
+@app.route('/api/bulk-ingest', methods=['POST'])
+def bulk_ingest():
+    """Upload a zip of resumes or a JSONL file of resumes and jobs for bulk ingestion"""
+    if request.content_length is not None and request.content_length > BULK_INGEST_MAX_BYTES:
+        return bulk_upload_too_large()
+    
+    try:
+        # The form parser streams file parts to a temporary file rather than memory
+        if 'archive' not in request.files:
+            return jsonify({'error': 'No archive provided'}), 400
+        
+        file = request.files['archive']
+        extension = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else ''
+        if extension not in BULK_INGEST_EXTENSIONS:
+            return jsonify({'error': 'Invalid file type. Please upload a ZIP or JSONL file'}), 400
+        
+        # The archive is kept until the run completes so an interrupted run can be resumed
+        run_id = str(uuid.uuid4())
+        bulk_folder = os.path.join(app.config['UPLOAD_FOLDER'], 'bulk')
+        os.makedirs(bulk_folder, exist_ok=True)
+        path = os.path.join(bulk_folder, secure_filename(f"{run_id}.{extension}"))
+        file.save(path)
+        
+        db.start_bulk_ingest_run(run_id, os.path.abspath(path))
+        start_bulk_ingest(path, run_id)
         
         return jsonify({
             'success': True,
-            'resume_id': resume_id,
-            'message': 'Resume uploaded and processed successfully'
-        }), 201
+            'run_id': run_id,
+            'status': 'running',
+            'status_url': f'/api/bulk-ingest/{run_id}',
+            'message': 'Bulk ingestion started'
+        }), 202
     
+    except RequestEntityTooLarge:
+        # Chunked uploads without a Content-Length are cut off at the limit while parsing
+        return bulk_upload_too_large()
     except Exception as e:
-        logger.error(f"Error uploading resume: {str(e)}")
+        logger.error(f"Error starting bulk ingestion: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/bulk-ingest/<run_id>', methods=['GET'])
+def get_bulk_ingest_status(run_id):
+    """Get the progress of a bulk ingestion run and its first failures"""
+    try:
+        run = db.get_bulk_ingest_run(run_id)
+        if not run:
+            return jsonify({'error': 'Bulk ingestion run not found'}), 404
+        
+        run['active'] = run_id in bulk_ingest_threads
+        run['failures'] = db.get_bulk_ingest_failures(run_id)
+        return jsonify(run)
+    
+    except Exception as e:
+        logger.error(f"Error fetching bulk ingestion status: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/bulk-ingest/<run_id>/resume', methods=['POST'])
+def resume_bulk_ingest(run_id):
+    """Resume an interrupted bulk ingestion run, skipping the items it already processed"""
+    try:
+        run = db.get_bulk_ingest_run(run_id)
+        if not run:
+            return jsonify({'error': 'Bulk ingestion run not found'}), 404
+        if run['status'] == 'completed':
+            return jsonify({'error': 'Bulk ingestion run is already completed'}), 409
+        if run_id in bulk_ingest_threads:
+            return jsonify({'error': 'Bulk ingestion run is already running'}), 409
+        if not os.path.exists(run['source']):
+            return jsonify({'error': 'The uploaded archive is no longer available'}), 410
+        
+        start_bulk_ingest(run['source'], run_id)
+        return jsonify({
+            'success': True,
+            'run_id': run_id,
+            'status': 'running',
+            'status_url': f'/api/bulk-ingest/{run_id}'
+        }), 202
+    
+    except Exception as e:
+        logger.error(f"Error resuming bulk ingestion: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/match', methods=['POST'])
 def match_resumes():
-    """Match resumes against a job description"""
+    """
+    Match resumes against a job description.
+    
+    With ``stream=true`` (query string or JSON body) the matches are sent as
+    newline-delimited JSON while they are scored, ending with a summary record.
+    ``fields`` selects the optional sections of each match (MATCH_RESULT_FIELDS);
+    the others are not computed, and such partial matches are not stored.
+    """
     try:
         data = request.get_json()
         
@@ -240,101 +857,42 @@ def match_resumes():
             return jsonify({'error': 'Job ID is required'}), 400
         
         job_id = data['job_id']
+        stream = str(request.args.get('stream', data.get('stream', 'false'))).lower() == 'true'
+        try:
+            fields = parse_fields(request.args.get('fields', data.get('fields')), MATCH_RESULT_FIELDS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Check if job exists
         job_desc = db.get_job_description(job_id)
         if not job_desc:
             return jsonify({'error': 'Job description not found'}), 404
         
-        # Get all resumes and calculate enhanced matches
-        matches_result = []
-        resumes = db.get_resumes()
+        # Ensure the job description is processed and the corpus vectorizers are fitted
+        prepare_job_for_matching(job_id, job_desc)
+        
+        # Use materialized scores where they are current
+        stored_scores = {}
+        if score_materializer:
+            stored_scores = fresh_match_scores(db.get_match_scores_for_job(job_id), 'resume_id')
+        
+        if stream:
+            return Response(stream_with_context(stream_matches(job_id, job_desc, stored_scores, fields)),
+                            mimetype='application/x-ndjson')
+        
+        # Get the candidate resumes and calculate enhanced matches
+        resumes = match_candidates(job_desc)
         
         logger.info(f"Processing matches for job {job_id} against {len(resumes)} resumes")
         
-        # Ensure the job description is processed in the NLP processor
-        if ENHANCED_NLP_AVAILABLE:
-            # Enhanced processor uses job_data
-            if job_id not in nlp_processor.job_data:
-                content = f"{job_desc['description']} {job_desc['requirements']}"
-                nlp_processor.add_job_description(job_id, job_desc)
-        else:
-            # Standard processor uses job_texts
-            if job_id not in nlp_processor.job_texts:
-                content = f"{job_desc['description']} {job_desc['requirements']}"
-                nlp_processor.process_job_description(job_id, content)
-        
-        # Ensure corpus vectorizers are fitted before matching
-        if len(nlp_processor.all_texts) >= 2 and not nlp_processor.corpus_fitted:
-            logger.info("Fitting corpus vectorizers for matching...")
-            nlp_processor.fit_corpus_vectorizers()
+        matches_result, match_rows = score_resume_matches(job_id, resumes, stored_scores, fields)
         
-        for resume_data in resumes:
-            resume_id = resume_data['id']
-            
-            # Ensure resume is processed in the NLP processor
-            if ENHANCED_NLP_AVAILABLE:
-                # Enhanced processor uses resume_data
-                if resume_id not in nlp_processor.resume_data:
-                    nlp_processor.add_resume(resume_id, resume_data)
-            else:
-                # Standard processor uses resume_texts
-                if resume_id not in nlp_processor.resume_texts:
-                    nlp_processor.process_resume(resume_id, resume_data['content'])
-            
-            # Debug logging
-            logger.info(f"Calculating similarity for job {job_id} vs resume {resume_id}")
-            
-            # Calculate enhanced similarity with detailed analysis
-            if ENHANCED_NLP_AVAILABLE:
-                similarity_score, confidence_score = nlp_processor.calculate_similarity(job_id, resume_id)
-            else:
-                similarity_score = nlp_processor.calculate_similarity(job_id, resume_id)
-                confidence_score = 0.5  # Default confidence for original processor
-                
-            match_details = nlp_processor.get_match_details(job_id, resume_id)
-            
-            logger.info(f"Similarity: {similarity_score:.3f}, Confidence: {confidence_score:.3f}, "
-                       f"Match strength: {match_details.get('match_strength', 'unknown')}")
-            
-            # Determine match category
-            match_category = match_details.get('match_strength', 'unknown')
-            
-            match_result = {
-                'resume_id': resume_id,
-                'candidate_name': resume_data['candidate_name'],
-                'candidate_email': resume_data['candidate_email'],
-                'filename': resume_data['filename'],
-                'similarity_score': similarity_score,
-                'confidence_score': confidence_score,
-                'match_percentage': round(similarity_score * 100, 2),
-                'confidence_percentage': round(confidence_score * 100, 2),
-                'match_category': match_category,
-                'uploaded_at': resume_data['uploaded_at'],
-                'skills_analysis': match_details.get('skills_analysis', {}),
-                'component_scores': match_details.get('component_scores', {}),
-                'experience_analysis': match_details.get('experience_analysis', {}),
-                'recommendations': match_details.get('recommendations', []),
-                'metadata': match_details.get('metadata', {})
-            }
-            
-            matches_result.append(match_result)
-            
-            # Store enhanced match in database
-            skills_analysis = match_details.get('skills_analysis', {})
-            db.create_match(
-                job_id=job_id,
-                resume_id=resume_id,
-                similarity_score=similarity_score,
-                common_skills=skills_analysis.get('matched_skills', []),
-                missing_skills=skills_analysis.get('missing_skills', []),
-                match_details=match_result
-            )
-        
-        # Sort by similarity score (descending)
-        matches_result.sort(key=lambda x: x['similarity_score'], reverse=True)
+        # Store all matches in one transaction, replacing this job's results from earlier calls
+        if fields is None:
+            db.create_matches(match_rows)
+            db.compact_matches(getattr(nlp_processor, 'model_version', None) or '', job_id=job_id)
         
-        return jsonify({
+        return api_response({
             'success': True,
             'matches': matches_result,
             'total_candidates': len(matches_result)
@@ -345,35 +903,115 @@ def match_resumes():
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/resumes', methods=['GET'])
+@versioned(lambda: db.get_data_version(('resumes',)))
 def get_resumes():
-    """Get all uploaded resumes"""
+    """Get a page of uploaded resumes, newest first, without their content"""
     try:
-        resumes = db.get_resumes()
-        resume_list = []
-        for resume_data in resumes:
-            resume_list.append({
-                'id': resume_data['id'],
-                'candidate_name': resume_data['candidate_name'],
-                'candidate_email': resume_data['candidate_email'],
-                'filename': resume_data['filename'],
-                'uploaded_at': resume_data['uploaded_at']
-            })
-        
-        return jsonify({'resumes': resume_list})
+        after, limit = page_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        resumes, next_cursor = db.list_resumes(after, limit)
+        return jsonify({'resumes': resumes, 'next_cursor': next_cursor})
     except Exception as e:
         logger.error(f"Error fetching resumes: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/matches', methods=['GET'])
+@versioned(lambda: db.get_data_version(('matches', 'job_descriptions', 'resumes')))
 def get_matches():
-    """Get all match results"""
+    """
+    Get a page of match results, newest first.
+    
+    ``include_details=true`` adds the match details. ``fields`` selects the
+    optional columns (LIST_MATCH_FIELDS) instead; the others are not read.
+    """
+    try:
+        after, limit = page_args()
+        fields = parse_fields(request.args.get('fields'), LIST_MATCH_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if fields is None:
+        fields = {'common_skills', 'missing_skills'}
+        if request.args.get('include_details', 'false').lower() == 'true':
+            fields.add('match_details')
+    
     try:
-        matches = db.get_all_matches()
-        return jsonify({'matches': matches})
+        matches, next_cursor = db.list_matches(after, limit, fields=fields)
+        return api_response({'matches': matches, 'next_cursor': next_cursor})
     except Exception as e:
         logger.error(f"Error fetching matches: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/api/matches/search', methods=['GET'])
+def search_matches():
+    """
+    Find stored matches by score, component scores and skills, best first.
+    
+    Query parameters: ``job_id``, ``min_score``, ``min_<component>`` for each
+    component score (e.g. ``min_skill_similarity``), and comma-separated
+    ``skills`` the candidate must have and ``missing_skills`` they must lack.
+    """
+    try:
+        limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+        min_score = request.args.get('min_score', type=float)
+        min_components = {}
+        for component in MATCH_COMPONENTS:
+            if f'min_{component}' in request.args:
+                min_components[component] = float(request.args[f'min_{component}'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    def skill_list(name):
+        return [skill.strip() for skill in request.args.get(name, '').split(',') if skill.strip()]
+    
+    try:
+        matches = db.find_matches(
+            job_id=request.args.get('job_id'),
+            min_score=min_score,
+            min_components=min_components,
+            matched_skills=skill_list('skills'),
+            missing_skills=skill_list('missing_skills'),
+            model_version=request.args.get('model_version'),
+            limit=limit
+        )
+        return api_response({'matches': matches, 'total': len(matches)})
+    except Exception as e:
+        logger.error(f"Error searching matches: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/search/skills', methods=['GET'])
+def search_skills():
+    """
+    Find resumes (or jobs with ``type=job``) by skill, answered from the skill index.
+    
+    ``all`` lists skills every result must have and ``any`` skills of which it
+    must have at least one, both comma-separated. Results are ranked by how many
+    of the requested skills they have.
+    """
+    def skill_list(name):
+        return [skill.strip() for skill in request.args.get(name, '').split(',') if skill.strip()]
+    
+    all_skills, any_skills = skill_list('all'), skill_list('any')
+    doc_type = request.args.get('type', 'resume')
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    if not all_skills and not any_skills:
+        return jsonify({'error': 'At least one skill is required in all or any'}), 400
+    if doc_type not in ('resume', 'job'):
+        return jsonify({'error': 'type must be resume or job'}), 400
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+    
+    try:
+        documents = db.search_documents_by_skills(all_skills, any_skills, doc_type=doc_type, limit=limit)
+        return jsonify({'results': documents, 'total': len(documents)})
+    except Exception as e:
+        logger.error(f"Error searching skills: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @app.route('/api/match/details/<job_id>/<resume_id>', methods=['GET'])
 def get_detailed_match_analysis(job_id, resume_id):
     """Get comprehensive match analysis between a job and resume"""
@@ -439,59 +1077,35 @@ def get_resume_details(resume_id):
 
 @app.route('/api/candidate/matches/<resume_id>', methods=['GET'])
 def find_matching_jobs_for_resume(resume_id):
-    """Find matching jobs for a specific resume (candidate view)"""
+    """
+    Find matching jobs for a specific resume (candidate view).
+    
+    ``fields`` selects the optional sections of each job match (JOB_MATCH_FIELDS);
+    the others are not computed.
+    """
+    try:
+        fields = parse_fields(request.args.get('fields'), JOB_MATCH_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     try:
         # Verify resume exists
         resume_data = db.get_resume(resume_id)
         if not resume_data:
             return jsonify({'error': 'Resume not found'}), 404
         
-        # Get all available job descriptions
-        jobs = db.get_job_descriptions()
-        job_matches = []
-        
+        # Get the available job descriptions; in a large corpus only the best by full-text rank
+        jobs = job_candidates(resume_data)
         logger.info(f"Finding job matches for resume {resume_id} against {len(jobs)} jobs")
         
-        # Ensure corpus vectorizers are fitted before matching
-        if len(nlp_processor.all_texts) >= 2 and not nlp_processor.corpus_fitted:
-            logger.info("Fitting corpus vectorizers for candidate matching...")
-            nlp_processor.fit_corpus_vectorizers()
+        # Use materialized scores where they are current
+        stored_scores = {}
+        if score_materializer:
+            stored_scores = fresh_match_scores(db.get_match_scores_for_resume(resume_id), 'job_id')
         
-        for job in jobs:
-            job_id = job['id']
-            
-            # Debug logging
-            logger.info(f"Calculating similarity for resume {resume_id} vs job {job_id}")
-            
-            # Calculate similarity (resume vs job, reversed from recruiter view)
-            similarity_score = nlp_processor.calculate_similarity(job_id, resume_id)
-            match_details = nlp_processor.get_match_details(job_id, resume_id)
-            
-            logger.info(f"Similarity score: {similarity_score}, Match strength: {match_details.get('match_strength', 'unknown')}")
-            
-            # Determine match category
-            match_category = match_details.get('match_strength', 'unknown')
-            
-            job_match = {
-                'job_id': job_id,
-                'title': job['title'],
-                'company': job['company'],
-                'description_preview': job['description'][:200] + '...' if len(job['description']) > 200 else job['description'],
-                'created_at': job['created_at'],
-                'similarity_score': similarity_score,
-                'match_percentage': round(similarity_score * 100, 2),
-                'match_category': match_category,
-                'skills_analysis': match_details.get('skills_analysis', {}),
-                'component_scores': match_details.get('component_scores', {}),
-                'recommendations': match_details.get('recommendations', [])
-            }
-            
-            job_matches.append(job_match)
-        
-        # Sort by similarity score (descending) - best matches first
-        job_matches.sort(key=lambda x: x['similarity_score'], reverse=True)
+        job_matches = score_job_matches(resume_id, jobs, stored_scores, fields)
         
-        return jsonify({
+        return api_response({
             'success': True,
             'resume_id': resume_id,
             'candidate_name': resume_data['candidate_name'],
@@ -504,43 +1118,54 @@ def find_matching_jobs_for_resume(resume_id):
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/candidate/resumes', methods=['GET'])
+# Unmaterialized best matches are scored on demand, so they also change with the model version
+@versioned(lambda: f"{db.get_data_version(('resumes', 'job_descriptions', 'match_scores'))}."
+                   f"{nlp_processor.model_version}")
 def get_candidate_resumes():
-    """Get resumes with their match summaries for candidate dashboard"""
+    """Get a page of resumes with their match summaries for candidate dashboard"""
     try:
-        resumes = db.get_resumes()
+        after, limit = page_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        resumes, next_cursor = db.list_resumes(after, limit)
         
-        # Add match summary for each resume
-        for resume in resumes:
-            resume_id = resume['id']
+        # Fetch the jobs once; best matches come from the materialized score table
+        jobs = db.get_job_descriptions()
+        if jobs and resumes and len(nlp_processor.all_texts) >= 2:
+            best_matches = db.get_best_match_scores([resume['id'] for resume in resumes],
+                                                    model_version=nlp_processor.model_version) \
+                if score_materializer else {}
             
-            # Get job count and best match info
-            jobs = db.get_job_descriptions()
-            if jobs and len(nlp_processor.all_texts) >= 2:
-                # Calculate best match for this resume
-                best_match_score = 0
-                best_job_title = None
-                
-                for job in jobs:
-                    job_id = job['id']
-                    try:
-                        similarity = nlp_processor.calculate_similarity(job_id, resume_id)
-                        if similarity > best_match_score:
-                            best_match_score = similarity
-                            best_job_title = job['title']
-                    except:
-                        continue
-                
-                resume['best_match_score'] = round(best_match_score * 100, 2)
-                resume['best_match_job'] = best_job_title
+            # Score resumes that are not materialized yet in one batch
+            unscored = [resume for resume in resumes if resume['id'] not in best_matches]
+            if unscored:
+                scores = nlp_processor.calculate_similarity_matrix(
+                    [job['id'] for job in jobs], [resume['id'] for resume in unscored]
+                )
+                best_job_rows = scores.argmax(axis=0)
+                for column, resume in enumerate(unscored):
+                    best_matches[resume['id']] = {
+                        'job_title': jobs[best_job_rows[column]]['title'],
+                        'similarity_score': float(scores[best_job_rows[column], column])
+                    }
+            
+            for resume in resumes:
+                best_match = best_matches[resume['id']]
+                resume['best_match_score'] = round(best_match['similarity_score'] * 100, 2)
+                resume['best_match_job'] = best_match['job_title'] if best_match['similarity_score'] > 0 else None
                 resume['total_jobs_available'] = len(jobs)
-            else:
+        else:
+            for resume in resumes:
                 resume['best_match_score'] = 0
                 resume['best_match_job'] = None
                 resume['total_jobs_available'] = 0
         
         return jsonify({
             'success': True,
-            'resumes': resumes
+            'resumes': resumes,
+            'next_cursor': next_cursor
         })
         
     except Exception as e:
@@ -655,6 +1280,16 @@ def get_system_status():
             }
         }
         
+        score_cache = getattr(nlp_processor, 'score_cache', None)
+        if score_cache is not None:
+            status['score_cache'] = score_cache.stats()
+        if score_materializer:
+            status['score_materializer'] = score_materializer.stats()
+        status['ingestion_queue'] = ingestion_queue.stats()
+        if extraction_sandbox:
+            status['extraction_sandbox'] = extraction_sandbox.stats()
+        status['bulk_ingest'] = {'active_runs': sorted(bulk_ingest_threads)}
+        
         if ENHANCED_NLP_AVAILABLE:
             # Get some basic stats
             try:
@@ -0,0 +1,211 @@
+"""
+ASGI entry point for the Resume Matcher API.
+
+Serve it from the backend directory with an ASGI server, for example:
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+
+The endpoints that score documents (/api/match and /api/candidate/matches/<id>)
+and /api/health are served by async handlers. Their NLP work runs on a bounded
+thread pool of NLP_EXECUTOR_WORKERS threads and their database calls go through
+AsyncDatabase, so the event loop never blocks on either. Every other endpoint
+is the Flask app from app.py on the WSGI adapter's threads, which NLP work never
+occupies, so health checks, listings and status polls stay responsive while
+large matches run.
+
+NLP work uses threads rather than processes because the fitted vectorizers,
+processed documents and score cache live in this process's memory.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Mount, Route
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError:
+    from starlette.middleware.wsgi import WSGIMiddleware
+
+from app import (app as flask_app, db, nlp_processor, score_materializer, fresh_match_scores, match_candidates,
+                 match_candidate_ids, job_candidates, parse_fields, prepare_job_for_matching, score_resume_matches,
+                 score_job_matches, JOB_MATCH_FIELDS, MATCH_RESULT_FIELDS, MATCH_STREAM_CHUNK_SIZE)
+from database import AsyncDatabase
+from responses import (accepted_encoding, compress_body, dumps_json, dumps_msgpack, wants_msgpack,
+                       MSGPACK_MIMETYPE, RESPONSE_COMPRESS_MIN_BYTES)
+
+logger = logging.getLogger(__name__)
+
+NLP_EXECUTOR_WORKERS = int(os.environ.get('NLP_EXECUTOR_WORKERS', 2))  # matches scored at the same time
+
+nlp_executor = ThreadPoolExecutor(max_workers=NLP_EXECUTOR_WORKERS, thread_name_prefix='nlp')
+async_db = AsyncDatabase(db)
+
+
+async def run_nlp(func, *args, **kwargs):
+    """Run CPU-bound NLP work on the bounded NLP threads"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(nlp_executor, functools.partial(func, *args, **kwargs))
+
+
+def render(request, payload, status=200):
+    """Encode a payload like ``responses.api_response`` and compress it like the Flask app does"""
+    if wants_msgpack(parse_accept_header(request.headers.get('accept'), MIMEAccept)):
+        body, media_type = dumps_msgpack(payload), MSGPACK_MIMETYPE
+    else:
+        body, media_type = dumps_json(payload), 'application/json'
+    headers = {'Vary': 'Accept, Accept-Encoding'}
+    encoding = accepted_encoding(parse_accept_header(request.headers.get('accept-encoding')))
+    if encoding and len(body) >= RESPONSE_COMPRESS_MIN_BYTES:
+        body = compress_body(body, encoding)
+        headers['Content-Encoding'] = encoding
+    return Response(body, status_code=status, media_type=media_type, headers=headers)
+
+
+async def health_check(request):
+    return render(request, {'status': 'healthy', 'timestamp': datetime.now().isoformat()})
+
+
+async def stream_matches(job_id, job_desc, stored_scores, fields):
+    """Like ``app.stream_matches``, sending each chunk's results once the chunk is scored"""
+    resume_ids = await async_db.run(match_candidate_ids, job_desc)
+    logger.info(f"Streaming matches for job {job_id} against {len(resume_ids)} resumes")
+    total, best = 0, None
+    try:
+        for start in range(0, len(resume_ids), MATCH_STREAM_CHUNK_SIZE):
+            resumes = await async_db.get_resumes_by_ids(resume_ids[start:start + MATCH_STREAM_CHUNK_SIZE])
+            matches_result, match_rows = await run_nlp(score_resume_matches, job_id, resumes, stored_scores, fields)
+            total += len(matches_result)
+            if matches_result and (best is None or matches_result[0]['similarity_score'] > best['similarity_score']):
+                best = {'resume_id': matches_result[0]['resume_id'],
+                        'similarity_score': matches_result[0]['similarity_score']}
+            yield b''.join(dumps_json({'type': 'match', **match_result}) + b'\n' for match_result in matches_result)
+            if match_rows:
+                await async_db.create_matches(match_rows)
+        if fields is None:
+            await async_db.compact_matches(getattr(nlp_processor, 'model_version', None) or '', job_id=job_id)
+        yield dumps_json({'type': 'summary', 'success': True, 'job_id': job_id,
+                          'total_candidates': total, 'best_match': best}) + b'\n'
+    except Exception as e:
+        # The status line is already sent; report the failure in-band
+        logger.error(f"Error streaming matches: {str(e)}")
+        yield dumps_json({'type': 'error', 'error': 'Internal server error',
+                          'total_candidates': total}) + b'\n'
+
+
+async def match_resumes(request):
+    """Match resumes against a job description; the same request and response as the Flask endpoint"""
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not data or 'job_id' not in data:
+        return render(request, {'error': 'Job ID is required'}, 400)
+
+    job_id = data['job_id']
+    stream = str(request.query_params.get('stream', data.get('stream', 'false'))).lower() == 'true'
+    try:
+        fields = parse_fields(request.query_params.get('fields', data.get('fields')), MATCH_RESULT_FIELDS)
+    except ValueError as e:
+        return render(request, {'error': str(e)}, 400)
+
+    try:
+        job_desc = await async_db.get_job_description(job_id)
+        if not job_desc:
+            return render(request, {'error': 'Job description not found'}, 404)
+
+        await run_nlp(prepare_job_for_matching, job_id, job_desc)
+
+        # Use materialized scores where they are current
+        stored_scores = {}
+        if score_materializer:
+            stored_scores = await run_nlp(fresh_match_scores, await async_db.get_match_scores_for_job(job_id),
+                                          'resume_id')
+
+        if stream:
+            return StreamingResponse(stream_matches(job_id, job_desc, stored_scores, fields),
+                                     media_type='application/x-ndjson')
+
+        resumes = await async_db.run(match_candidates, job_desc)
+        logger.info(f"Processing matches for job {job_id} against {len(resumes)} resumes")
+        matches_result, match_rows = await run_nlp(score_resume_matches, job_id, resumes, stored_scores, fields)
+
+        # Store all matches in one transaction, replacing this job's results from earlier calls
+        if fields is None:
+            await async_db.create_matches(match_rows)
+            await async_db.compact_matches(getattr(nlp_processor, 'model_version', None) or '', job_id=job_id)
+
+        return render(request, {
+            'success': True,
+            'matches': matches_result,
+            'total_candidates': len(matches_result)
+        })
+
+    except Exception as e:
+        logger.error(f"Error matching resumes: {str(e)}")
+        return render(request, {'error': 'Internal server error'}, 500)
+
+
+async def find_matching_jobs_for_resume(request):
+    """Find matching jobs for a specific resume (candidate view)"""
+    resume_id = request.path_params['resume_id']
+    try:
+        fields = parse_fields(request.query_params.get('fields'), JOB_MATCH_FIELDS)
+    except ValueError as e:
+        return render(request, {'error': str(e)}, 400)
+
+    try:
+        resume_data = await async_db.get_resume(resume_id)
+        if not resume_data:
+            return render(request, {'error': 'Resume not found'}, 404)
+
+        jobs = await async_db.run(job_candidates, resume_data)
+        logger.info(f"Finding job matches for resume {resume_id} against {len(jobs)} jobs")
+        stored_scores = {}
+        if score_materializer:
+            stored_scores = await run_nlp(fresh_match_scores, await async_db.get_match_scores_for_resume(resume_id),
+                                          'job_id')
+        job_matches = await run_nlp(score_job_matches, resume_id, jobs, stored_scores, fields)
+
+        return render(request, {
+            'success': True,
+            'resume_id': resume_id,
+            'candidate_name': resume_data['candidate_name'],
+            'matching_jobs': job_matches,
+            'total_jobs': len(job_matches)
+        })
+
+    except Exception as e:
+        logger.error(f"Error finding matching jobs for resume: {str(e)}")
+        return render(request, {'error': 'Internal server error'}, 500)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    nlp_executor.shutdown(wait=True)
+    async_db.close()
+
+
+app = Starlette(
+    routes=[
+        Route('/api/health', health_check, methods=['GET']),
+        Route('/api/match', match_resumes, methods=['POST']),
+        Route('/api/candidate/matches/{resume_id}', find_matching_jobs_for_resume, methods=['GET']),
+        # Everything else is served by the Flask app
+        Mount('', app=WSGIMiddleware(flask_app)),
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=lifespan
+)
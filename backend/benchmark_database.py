@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark request latency against the database under concurrent load.
+
+Replays a mix of the queries the API issues per request (status polls, list
+pages and /api/match with its match inserts) from several threads, once with
+the previous connection handling (a new rollback-journal connection per
+method call) and once with the pooled WAL connections.
+
+Usage: python benchmark_database.py [--threads 1 8] [--requests 2000]
+                                    [--resumes 200] [--matches-per-request 10]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from database import Database, register_sql_functions
+
+RESUME_TEXT = 'Senior Python developer with Django, Flask, PostgreSQL, Docker and AWS experience. ' * 25
+
+
+class LegacyDatabase(Database):
+    """The previous connection handling: a fresh rollback-journal connection per method call"""
+
+    @contextmanager
+    def connection(self):
+        conn = sqlite3.connect(self.db_path)
+        register_sql_functions(conn)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def seed(db, resumes, jobs=20):
+    job_ids = [db.create_job_description(f'Job {i}', 'Acme', RESUME_TEXT, '', 'Recruiter') for i in range(jobs)]
+    resume_ids = [db.create_resume(f'{i}.txt', f'Candidate {i}', '', RESUME_TEXT, None) for i in range(resumes)]
+    db.upsert_match_scores([
+        {'job_id': job_id, 'resume_id': resume_id, 'model_version': 'v1', 'similarity_score': random.random(),
+         'match_category': 'good', 'tfidf_similarity': 0.5, 'semantic_similarity': 0.5,
+         'skill_similarity': 0.5, 'keyword_similarity': 0.5, 'context_similarity': 0.5}
+        for job_id in job_ids for resume_id in resume_ids
+    ])
+    for resume_id in resume_ids[:50]:
+        db.create_ingestion_job(resume_id, 'resume.txt', 'Candidate', '', None)
+    return job_ids, resume_ids
+
+
+def status_request(db, job_ids, resume_ids, matches):
+    db.get_ingestion_job(random.choice(resume_ids))
+
+
+def list_request(db, job_ids, resume_ids, matches):
+    resumes, _ = db.list_resumes()
+    db.list_job_descriptions()
+    db.get_best_match_scores([resume['id'] for resume in resumes])
+
+
+def match_request(db, job_ids, resume_ids, matches):
+    job_id = random.choice(job_ids)
+    db.get_job_description(job_id)
+    db.get_resumes()
+    db.get_match_scores_for_job(job_id)
+    db.create_matches([
+        {'job_id': job_id, 'resume_id': resume_id, 'similarity_score': 0.5, 'common_skills': ['python'],
+         'missing_skills': ['go'], 'match_details': {'score': 0.5}}
+        for resume_id in random.sample(resume_ids, matches)
+    ])
+
+
+# Most traffic is status polling and list pages; a tenth are match requests
+REQUEST_MIX = [(status_request, 0.6), (list_request, 0.3), (match_request, 0.1)]
+
+
+def run_load(db, job_ids, resume_ids, threads, requests, matches):
+    """Run ``requests`` requests from ``threads`` threads; returns latencies per request kind and wall time"""
+    kinds, weights = zip(*REQUEST_MIX)
+    plan = random.Random(42).choices(kinds, weights, k=requests)
+    latencies = {kind.__name__: [] for kind in kinds}
+    lock = threading.Lock()
+    position = iter(range(requests))
+
+    def worker():
+        while True:
+            with lock:
+                index = next(position, None)
+            if index is None:
+                return
+            request = plan[index]
+            start = time.perf_counter()
+            request(db, job_ids, resume_ids, matches)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies[request.__name__].append(elapsed)
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return latencies, time.perf_counter() - started
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--resumes', type=int, default=200)
+    parser.add_argument('--matches-per-request', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'mode':>7} {'threads':>7} {'req/s':>8}  {'request':<15} {'p50':>8} {'p95':>8} {'p99':>8}")
+        for name, database_class in (('legacy', LegacyDatabase), ('pooled', Database)):
+            db = database_class(os.path.join(tmp, f'{name}.db'))
+            random.seed(0)
+            job_ids, resume_ids = seed(db, args.resumes)
+            for threads in args.threads:
+                latencies, wall = run_load(db, job_ids, resume_ids, threads, args.requests,
+                                           args.matches_per_request)
+                for kind, values in latencies.items():
+                    print(f"{name:>7} {threads:>7} {args.requests / wall:>8.0f}  {kind:<15} "
+                          f"{percentile(values, 0.5):>6.2f}ms {percentile(values, 0.95):>6.2f}ms "
+                          f"{percentile(values, 0.99):>6.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark document text extraction on generated multi-page documents.
+
+Compares the page-streaming PDF engine (sequential and page-parallel) with
+the previous implementation that concatenated page text with ``+=``, and the
+iterparse DOCX extractor with python-docx (time and peak memory growth).
+
+Usage: python benchmark_extraction.py [--pages 10 50 300] [--paragraphs 1000 20000]
+                                      [--repeat 3] [--workers 4]
+"""
+
+import argparse
+import functools
+import io
+import os
+import sys
+import tempfile
+import time
+import multiprocessing
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+import PyPDF2
+import docx
+from text_extraction import extract_docx_text, extract_pdf_text, get_extraction_pool
+
+LINE = 'Senior Python developer with Django, Flask, PostgreSQL, Docker and AWS experience.'
+
+
+def build_text_pdf(page_texts):
+    """Build a minimal PDF with one page of Helvetica text per entry in ``page_texts``"""
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,  # page tree, filled in once the page object numbers are known
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    page_refs = []
+    for text in page_texts:
+        lines = [line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+                 for line in text.split('\n')]
+        stream = 'BT /F1 10 Tf 12 TL 50 780 Td ' + ' '.join(f'({line}) Tj T*' for line in lines) + ' ET'
+        stream = stream.encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % content_ref)
+        page_refs.append(b'%d 0 R' % len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (b' '.join(page_refs), len(page_refs))
+
+    pdf = io.BytesIO()
+    pdf.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(pdf.tell())
+        pdf.write(b'%d 0 obj\n%s\nendobj\n' % (number, body))
+    xref = pdf.tell()
+    pdf.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    for offset in offsets:
+        pdf.write(b'%010d 00000 n \n' % offset)
+    pdf.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return pdf.getvalue()
+
+
+def legacy_extract_pdf(file_path):
+    """The previous extraction: every page, concatenated with +="""
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        text = ""
+        for page in pdf_reader.pages:
+            text += page.extract_text()
+        return text
+
+
+def build_docx(paragraphs):
+    """Build a DOCX with ``paragraphs`` body paragraphs and a skills table"""
+    document = docx.Document()
+    for i in range(paragraphs):
+        document.add_paragraph(f'{i}. {LINE}')
+    table = document.add_table(rows=10, cols=2)
+    for row in table.rows:
+        row.cells[0].text, row.cells[1].text = 'Python', 'Django'
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def legacy_extract_docx(file_path):
+    """The previous extraction: python-docx paragraphs concatenated with +="""
+    doc = docx.Document(file_path)
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    return text
+
+
+def _measure_rss(func, path, results):
+    import resource
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    func(path)
+    results.put(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before)
+
+
+def _peak_memory_mb(func, path):
+    """Peak RSS growth in MB while running ``func(path)`` in a fresh forked process (lxml memory included)"""
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return float('nan')
+    ctx = multiprocessing.get_context('fork')
+    results = ctx.Queue()
+    process = ctx.Process(target=_measure_rss, args=(func, path, results))
+    process.start()
+    growth = results.get()
+    process.join()
+    return growth / 1024  # ru_maxrss is in KB on Linux
+
+
+def _best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, nargs='+', default=[10, 50, 300])
+    parser.add_argument('--paragraphs', type=int, nargs='+', default=[1000, 20000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    pool = get_extraction_pool(args.workers)
+    if pool:
+        # Start the pool workers so process spawn time is not billed to the first run
+        list(pool.map(abs, range(args.workers)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'pages':>6} {'legacy':>10} {'stream':>10} {'parallel':>10} {'no budget':>10}  chars (legacy/budgeted)")
+        for pages in args.pages:
+            path = os.path.join(tmp, f'resume_{pages}.pdf')
+            with open(path, 'wb') as f:
+                f.write(build_text_pdf([f'Page {i + 1}\n' + '\n'.join([LINE] * 50) for i in range(pages)]))
+
+            legacy_time, legacy_text = _best_time(lambda: legacy_extract_pdf(path), args.repeat)
+            stream_time, stream_text = _best_time(lambda: extract_pdf_text(path), args.repeat)
+            parallel_time, _ = _best_time(lambda: extract_pdf_text(path, executor=pool), args.repeat)
+            full_time, full_text = _best_time(
+                lambda: extract_pdf_text(path, max_pages=None, max_chars=None, executor=pool), args.repeat)
+            assert full_text == legacy_text
+
+            print(f"{pages:>6} {legacy_time * 1000:>8.1f}ms {stream_time * 1000:>8.1f}ms "
+                  f"{parallel_time * 1000:>8.1f}ms {full_time * 1000:>8.1f}ms  "
+                  f"{len(legacy_text)}/{len(stream_text)}")
+
+        print()
+        print(f"{'paragraphs':>10} {'size':>8} {'python-docx':>12} {'iterparse':>10} "
+              f"{'peak (docx)':>12} {'peak (iter)':>12}")
+        for paragraphs in args.paragraphs:
+            path = os.path.join(tmp, f'resume_{paragraphs}.docx')
+            with open(path, 'wb') as f:
+                f.write(build_docx(paragraphs))
+
+            legacy_time, legacy_text = _best_time(lambda: legacy_extract_docx(path), args.repeat)
+            stream_time, stream_text = _best_time(lambda: extract_docx_text(path, max_chars=None), args.repeat)
+            assert stream_text == legacy_text
+
+            legacy_peak = _peak_memory_mb(legacy_extract_docx, path)
+            stream_peak = _peak_memory_mb(functools.partial(extract_docx_text, max_chars=None), path)
+            print(f"{paragraphs:>10} {os.path.getsize(path) / 1024:>6.0f}KB {legacy_time * 1000:>10.1f}ms "
+                  f"{stream_time * 1000:>8.1f}ms {legacy_peak:>10.1f}MB {stream_peak:>10.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark serialization time and bytes on the wire for a large match response.
+
+Builds a synthetic /api/match response (NumPy float scores, full skills
+analysis and recommendations per candidate) and encodes it with the standard
+library json module, orjson and msgpack, each uncompressed, gzipped and
+brotli-compressed. Encoders that are not installed are skipped.
+
+Usage: python benchmark_responses.py [--candidates 5000] [--repeat 5]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from responses import (brotli, dumps_json, dumps_msgpack, msgpack, orjson, to_builtin,
+                       RESPONSE_BROTLI_QUALITY, RESPONSE_GZIP_LEVEL)
+
+SKILLS = ['python', 'django', 'flask', 'postgresql', 'docker', 'kubernetes', 'aws', 'react',
+          'javascript', 'sql', 'machine learning', 'git', 'linux', 'redis', 'java', 'go']
+
+
+def match_payload(candidates):
+    """A /api/match response body with ``candidates`` results"""
+    matches = []
+    for i in range(candidates):
+        score = np.float64(random.random())
+        matched = random.sample(SKILLS, 6)
+        missing = [skill for skill in SKILLS if skill not in matched][:4]
+        matches.append({
+            'resume_id': f'{i:08d}-resume',
+            'candidate_name': f'Candidate {i}',
+            'candidate_email': f'candidate{i}@example.com',
+            'filename': f'candidate_{i}.pdf',
+            'similarity_score': score,
+            'confidence_score': 0.5,
+            'match_percentage': round(float(score) * 100, 2),
+            'confidence_percentage': 50.0,
+            'match_category': random.choice(['excellent', 'good', 'fair', 'weak']),
+            'uploaded_at': '2024-01-01 10:00:00',
+            'skills_analysis': {
+                'matched_skills': matched,
+                'missing_skills': missing,
+                'additional_skills': random.sample(SKILLS, 3),
+                'skill_match_ratio': np.float32(len(matched) / 10),
+                'critical_skills_missing': missing[:2],
+                'skill_categories': {'programming': matched[:3], 'cloud': matched[3:]}
+            },
+            'component_scores': {name: np.float64(random.random()) for name in (
+                'tfidf_similarity', 'semantic_similarity', 'skill_similarity',
+                'keyword_similarity', 'context_similarity')},
+            'experience_analysis': {'job_years_required': np.int64(5), 'resume_years': np.int64(i % 12)},
+            'recommendations': [f'Highlight experience with {skill}' for skill in missing[:3]],
+            'metadata': {'processor': 'ResumeMatcherNLP', 'model_version': 'v1'}
+        })
+    return {'success': True, 'matches': matches, 'total_candidates': candidates}
+
+
+def encoders():
+    yield 'json', lambda payload: json.dumps(payload, default=to_builtin).encode('utf-8')
+    if orjson is not None:
+        yield 'orjson', dumps_json
+    if msgpack is not None:
+        yield 'msgpack', dumps_msgpack
+
+
+def compressors():
+    yield 'identity', lambda body: body
+    yield 'gzip', lambda body: gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL, mtime=0)
+    if brotli is not None:
+        yield 'br', lambda body: brotli.compress(body, quality=RESPONSE_BROTLI_QUALITY)
+
+
+def best_of(repeat, func, *args):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - started)
+    return result, min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--candidates', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    payload = match_payload(args.candidates)
+    skipped = [name for name, module in (('orjson', orjson), ('msgpack', msgpack), ('brotli', brotli))
+               if module is None]
+    if skipped:
+        print(f"not installed, skipped: {', '.join(skipped)}")
+
+    print(f"{'encoder':>8} {'encoding':>9} {'encode':>9} {'compress':>9} {'total':>9} {'bytes':>11}")
+    for encoder_name, encode in encoders():
+        body, encode_ms = best_of(args.repeat, encode, payload)
+        for compressor_name, compress in compressors():
+            wire, compress_ms = best_of(args.repeat, compress, body)
+            print(f"{encoder_name:>8} {compressor_name:>9} {encode_ms:>7.1f}ms {compress_ms:>7.1f}ms "
+                  f"{encode_ms + compress_ms:>7.1f}ms {len(wire):>11,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Bulk ingestion of resumes and job descriptions for the Resume Matcher.
+
+Onboarding thousands of documents through ``POST /api/resume`` costs one
+request, one transaction and one corpus refit per resume. This module reads a
+directory, zip archive or JSONL file as a stream of items instead: files are
+extracted in parallel, documents are inserted in batched transactions with
+``executemany``, the NLP processor indexes them batch by batch and the corpus
+is refitted once at the end.
+
+The outcome of every item is stored in ``bulk_ingest_items`` in the same
+transaction as the documents it produced, so an interrupted run resumes where
+it stopped without storing anything twice.
+
+JSONL lines are objects with ``"type": "resume"`` (``content``,
+``candidate_name``, ``candidate_email``, ``filename``) or ``"type": "job"``
+(``description``, ``title``, ``company``, ``requirements``, ``recruiter_name``).
+Resume files (PDF, DOC, DOCX, TXT) are named after their file name.
+
+Command line, from the backend directory (rerunning the same path resumes it):
+
+    python -m bulk_ingest PATH [--db resume_matcher.db] [--workers 4] [--batch-size 200]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import uuid
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Optional
+import logging
+
+from text_extraction import ExtractionError
+
+logger = logging.getLogger(__name__)
+
+RESUME_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt'}
+
+# ``load()`` returns the raw bytes of a file or line; it is called on the reading thread
+BulkItem = namedtuple('BulkItem', ['key', 'kind', 'filename', 'load'])
+
+
+class BulkIngestError(Exception):
+    """An item that cannot be ingested; the message says why"""
+
+
+def _extension(name: str) -> str:
+    return name.rsplit('.', 1)[1].lower() if '.' in name else ''
+
+
+def _skipped(name: str) -> bool:
+    # Hidden files and the resource forks macOS adds to zip archives
+    return any(part.startswith('.') or part == '__MACOSX' for part in name.split('/'))
+
+
+def _iter_lines(key_prefix: str, lines) -> Iterator[BulkItem]:
+    for line_number, line in enumerate(lines, start=1):
+        if line.strip():
+            yield BulkItem(f'{key_prefix}:{line_number}', 'record', None, lambda line=line: line)
+
+
+def iter_items(path: str) -> Iterator[BulkItem]:
+    """Yield the items of a directory, zip archive or JSONL file in a stable order"""
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                key = os.path.relpath(file_path, path).replace(os.sep, '/')
+                if _skipped(key):
+                    continue
+                if _extension(name) == 'jsonl':
+                    with open(file_path, 'rb') as file:
+                        yield from _iter_lines(key, file)
+                elif _extension(name) in RESUME_EXTENSIONS:
+                    yield BulkItem(key, 'file', name, lambda file_path=file_path: _read_file(file_path))
+
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for name in sorted(archive.namelist()):
+                if name.endswith('/') or _skipped(name):
+                    continue
+                if _extension(name) == 'jsonl':
+                    with archive.open(name) as file:
+                        yield from _iter_lines(name, file)
+                elif _extension(name) in RESUME_EXTENSIONS:
+                    yield BulkItem(name, 'file', name.rsplit('/', 1)[-1],
+                                   lambda name=name: archive.read(name))
+
+    else:
+        with open(path, 'rb') as file:
+            yield from _iter_lines(os.path.basename(path), file)
+
+
+def _read_file(file_path: str) -> bytes:
+    with open(file_path, 'rb') as file:
+        return file.read()
+
+
+def default_run_id(path: str) -> str:
+    """Run id derived from the source path, so ingesting the same path again resumes it"""
+    return hashlib.sha256(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+
+
+class BulkIngester:
+    """
+    Ingests the items of a directory, zip archive or JSONL file into the database.
+
+    ``extract(data, filename)`` returns the text of a resume file and may raise
+    ExtractionError. If an ``nlp_processor`` is given, each batch is indexed
+    after it is stored and the corpus is refitted once the run finishes; other
+    processes pick the documents up from the database. ``progress(run)`` is
+    called with the run's progress after every batch.
+    """
+
+    def __init__(self, db, extract: Callable[[bytes, str], str], nlp_processor=None,
+                 workers: int = 4, batch_size: int = 200,
+                 progress: Optional[Callable[[dict], None]] = None):
+        self.db = db
+        self.extract = extract
+        self.nlp_processor = nlp_processor
+        self.workers = workers
+        self.batch_size = batch_size
+        self.progress = progress
+
+    def ingest(self, path: str, run_id: Optional[str] = None) -> dict:
+        """Ingest every item of ``path`` not yet processed by run ``run_id`` and return the run"""
+        run_id = run_id or default_run_id(path)
+        self.db.start_bulk_ingest_run(run_id, os.path.abspath(path))
+        try:
+            done = self.db.get_bulk_ingest_item_keys(run_id)
+            total = sum(1 for _ in iter_items(path))
+            self.db.update_bulk_ingest_run(run_id, 'running', total_items=total)
+            if done:
+                logger.info(f"Resuming bulk ingestion {run_id}: {len(done)} of {total} items already processed")
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                batch = []
+                for item in iter_items(path):
+                    if item.key in done:
+                        continue
+                    # Reading stays on this thread; zip members can only be read while the archive is open
+                    batch.append((item, executor.submit(self._build_document, item, item.load())))
+                    if len(batch) >= self.batch_size:
+                        self._store_batch(run_id, batch)
+                        batch = []
+                if batch:
+                    self._store_batch(run_id, batch)
+
+            if self.nlp_processor is not None and not self.nlp_processor.corpus_fitted \
+                    and len(self.nlp_processor.all_texts) >= 2:
+                self.nlp_processor.fit_corpus_vectorizers()
+                logger.info(f"Refitted corpus vectorizers after bulk ingestion {run_id}")
+
+            self.db.update_bulk_ingest_run(run_id, 'completed')
+        except BaseException as e:
+            # Includes Ctrl-C on the command line; the next run with this id picks up from here
+            logger.error(f"Bulk ingestion {run_id} stopped: {str(e) or type(e).__name__}")
+            self.db.update_bulk_ingest_run(run_id, 'interrupted', error=str(e) or type(e).__name__)
+            raise
+        return self.db.get_bulk_ingest_run(run_id)
+
+    def _build_document(self, item: BulkItem, data: bytes) -> dict:
+        """Turn an item into a resume or job description; runs on the worker threads"""
+        if item.kind == 'file':
+            try:
+                text = self.extract(data, item.filename)
+            except ExtractionError as e:
+                raise BulkIngestError(str(e))
+            name = os.path.splitext(item.filename)[0].replace('_', ' ').replace('-', ' ').strip()
+            return self._resume(text, item.filename, name or 'Anonymous Candidate', '')
+
+        try:
+            record = json.loads(data)
+        except ValueError as e:
+            raise BulkIngestError(f'Invalid JSON: {str(e)}')
+        if not isinstance(record, dict):
+            raise BulkIngestError('Each JSONL line must be an object')
+
+        if record.get('type') == 'job':
+            if not record.get('description'):
+                raise BulkIngestError('Job description is required')
+            return {
+                'kind': 'job',
+                'id': str(uuid.uuid4()),
+                'title': record.get('title', 'Untitled Position'),
+                'company': record.get('company', ''),
+                'description': record['description'],
+                'requirements': record.get('requirements', ''),
+                'recruiter_name': record.get('recruiter_name', 'Anonymous Recruiter')
+            }
+        if record.get('type', 'resume') == 'resume':
+            return self._resume(record.get('content') or '', record.get('filename', 'resume.txt'),
+                                record.get('candidate_name', 'Anonymous Candidate'),
+                                record.get('candidate_email', ''))
+        raise BulkIngestError(f"Unknown record type: {record['type']}")
+
+    def _resume(self, text: str, filename: str, candidate_name: str, candidate_email: str) -> dict:
+        if not isinstance(text, str) or not text.strip():
+            raise BulkIngestError('Could not extract text from the resume')
+        return {
+            'kind': 'resume',
+            'id': str(uuid.uuid4()),
+            'filename': filename,
+            'candidate_name': candidate_name,
+            'candidate_email': candidate_email,
+            'content': text
+        }
+
+    def _store_batch(self, run_id: str, batch: list):
+        """Write one batch in a single transaction, then index it"""
+        resumes, jobs, items = [], [], []
+        for item, future in batch:
+            try:
+                document = future.result()
+            except BulkIngestError as e:
+                items.append((item.key, 'resume' if item.kind == 'file' else 'record', 'failed', None, str(e)))
+                continue
+            except Exception as e:
+                logger.error(f"Error ingesting {item.key}: {str(e)}")
+                items.append((item.key, 'resume' if item.kind == 'file' else 'record', 'failed', None,
+                              'Item processing failed'))
+                continue
+
+            if document['kind'] == 'job':
+                jobs.append(document)
+            else:
+                resumes.append(document)
+            items.append((item.key, document['kind'], 'completed', document['id'], None))
+
+        self.db.save_bulk_ingest_batch(
+            run_id,
+            [(r['id'], r['filename'], r['candidate_name'], r['candidate_email'], r['content'], None)
+             for r in resumes],
+            [(j['id'], j['title'], j['company'], j['description'], j['requirements'], j['recruiter_name'])
+             for j in jobs],
+            items
+        )
+
+        # Processing invalidates the fitted corpus; it is refitted once at the end of the run
+        if self.nlp_processor is not None:
+            for job in jobs:
+                self.nlp_processor.process_job_description(job['id'], job['description'])
+            for resume in resumes:
+                self.nlp_processor.process_resume(resume['id'], resume['content'])
+            # Processors without a skill extractor leave the skills to the server's next start
+            if hasattr(self.nlp_processor, 'get_document_skills'):
+                self.db.index_document_skills(
+                    [('job', job['id'], self.nlp_processor.get_document_skills(
+                        f"{job['description']} {job['requirements']}")) for job in jobs]
+                    + [('resume', resume['id'], self.nlp_processor.get_document_skills(resume['content']))
+                       for resume in resumes]
+                )
+
+        if self.progress:
+            self.progress(self.db.get_bulk_ingest_run(run_id))
+
+
+def create_nlp_processor():
+    """
+    The NLP processor the server would use, to index skills as the command line stores documents.
+    
+    Its score cache stays in memory: a refit here sees only the imported
+    documents, and must not invalidate the scores servers share on disk.
+    """
+    try:
+        from enhanced_nlp_processor import EnhancedResumeMatcherNLP
+        return EnhancedResumeMatcherNLP()
+    except ImportError:
+        from nlp_processor import ResumeMatcherNLP
+        from score_cache import ScoreCache
+        return ResumeMatcherNLP(score_cache=ScoreCache())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', help='directory, zip archive or JSONL file to ingest')
+    parser.add_argument('--db', default='resume_matcher.db', help='SQLite database path')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='extraction worker processes')
+    parser.add_argument('--batch-size', type=int, default=200, help='documents per transaction')
+    parser.add_argument('--timeout', type=float, default=30.0, help='extraction timeout per file in seconds')
+    parser.add_argument('--run-id', help='run to create or resume (default: derived from the path)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    # Imported here so the sandbox workers, which import text_extraction only, stay light
+    from database import Database
+    from extraction_sandbox import ExtractionSandbox
+
+    started = time.time()
+
+    def report(run):
+        elapsed = time.time() - started
+        print(f"[{run['processed_items']}/{run['total_items']}] {run['resumes']} resumes, "
+              f"{run['jobs']} jobs, {run['failed_items']} failed ({elapsed:.0f}s)", flush=True)
+
+    db = Database(args.db)
+    sandbox = ExtractionSandbox(workers=args.workers, timeout=args.timeout)
+    ingester = BulkIngester(db, sandbox.extract, nlp_processor=create_nlp_processor(), workers=args.workers,
+                            batch_size=args.batch_size, progress=report)
+    try:
+        run = ingester.ingest(args.path, run_id=args.run_id)
+    except KeyboardInterrupt:
+        print('Interrupted; run the same command again to resume', file=sys.stderr)
+        return 1
+    finally:
+        sandbox.close()
+
+    for failure in db.get_bulk_ingest_failures(run['id']):
+        print(f"  failed: {failure['item']}: {failure['error']}", file=sys.stderr)
+    print(f"Run {run['id']} {run['status']}: {run['resumes']} resumes and {run['jobs']} jobs ingested, "
+          f"{run['failed_items']} items failed")
+    # Running servers load the new documents and refit on their next score sweep
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Compress the resume text and match details already stored in the database.
+
+New rows of ``resumes.content`` and ``matches.match_details`` are compressed as
+they are written. This rewrites the rows stored before compression existed,
+then rebuilds the database file so the freed pages are returned to the disk,
+and reports the size before and after.
+
+Command line, from the backend directory (safe to run while the server is up;
+the final VACUUM briefly blocks writers):
+
+    python -m compress_storage [--db resume_matcher.db] [--batch-size 500] [--decompress]
+
+``--decompress`` rewrites the rows as plain text again, for going back to a
+version of the application that cannot read compressed rows.
+"""
+
+import argparse
+import sys
+import time
+
+from database import Database
+
+
+def _megabytes(size):
+    return f'{size / (1024 * 1024):.1f} MB'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='resume_matcher.db', help='SQLite database path')
+    parser.add_argument('--batch-size', type=int, default=500, help='rows rewritten per transaction')
+    parser.add_argument('--decompress', action='store_true', help='store the rows as plain text again')
+    parser.add_argument('--no-vacuum', action='store_true', help='skip rebuilding the database file')
+    args = parser.parse_args()
+
+    db = Database(args.db)
+    size_before = db.get_storage_size()
+    started = time.time()
+
+    rewritten = db.compress_stored_columns(batch_size=args.batch_size, decompress=args.decompress)
+    for table, count in rewritten.items():
+        print(f"{table}: {count} rows {'decompressed' if args.decompress else 'compressed'}")
+
+    if not args.no_vacuum:
+        db.close()
+        db.vacuum()
+    size_after = db.get_storage_size()
+
+    change = (size_after - size_before) / size_before * 100 if size_before else 0.0
+    print(f"Database size: {_megabytes(size_before)} -> {_megabytes(size_after)} "
+          f"({change:+.1f}%) in {time.time() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
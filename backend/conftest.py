@@ -0,0 +1,24 @@
+"""
+pytest setup: run the tests from a scratch directory.
+
+The app keeps its database, uploads and score cache in the working directory,
+so tests that import it never touch the ones in the repository.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+
+@pytest.fixture(scope='session', autouse=True)
+def scratch_working_directory():
+    os.environ.setdefault('EXTRACTION_SANDBOX_WORKERS', '0')
+    os.environ.setdefault('SCORE_CACHE_BACKEND', 'memory')
+    with tempfile.TemporaryDirectory(prefix='resume-matcher-tests-') as directory:
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            yield directory
+        finally:
+            os.chdir(cwd)
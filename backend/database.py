@@ -1,273 +1,1759 @@
+import asyncio
 import sqlite3
 import json
+import base64
+import functools
+from contextlib import contextmanager
 from datetime import datetime
 import uuid
 import os
+import queue
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Connection pool and SQLite tuning
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))  # idle connections kept open for reuse
+DB_CACHE_SIZE_KB = int(os.environ.get('DB_CACHE_SIZE_KB', 16 * 1024))  # page cache per connection
+DB_MMAP_SIZE = int(os.environ.get('DB_MMAP_SIZE', 256 * 1024 * 1024))  # bytes of the file read through mmap
+DB_CACHED_STATEMENTS = 256  # prepared statements kept per connection
+DB_BUSY_TIMEOUT = 30.0  # seconds a writer waits for the write lock
+
+# Compression of the large text columns (resumes.content, matches.match_details)
+DB_COMPRESSION = os.environ.get('DB_COMPRESSION', 'true').lower() == 'true'
+DB_COMPRESSION_MIN_BYTES = int(os.environ.get('DB_COMPRESSION_MIN_BYTES', 256))  # shorter values stay plain text
+DB_COMPRESSION_LEVEL = int(os.environ.get('DB_COMPRESSION_LEVEL', 6))
+# Compressed values are BLOBs starting with this marker; plain TEXT values are read as they are,
+# so rows written before compression, or with it disabled, stay readable
+ZLIB_MARKER = b'z1:'
+
+
+def compress_text(text):
+    """Compress a large text value for storage; short or incompressible values are returned unchanged"""
+    if not DB_COMPRESSION or text is None:
+        return text
+    data = text.encode('utf-8')
+    if len(data) < DB_COMPRESSION_MIN_BYTES:
+        return text
+    compressed = ZLIB_MARKER + zlib.compress(data, DB_COMPRESSION_LEVEL)
+    return compressed if len(compressed) < len(data) else text
+
+
+def decompress_text(value):
+    """Read a value stored by ``compress_text``, compressed or not"""
+    if isinstance(value, bytes):
+        if value.startswith(ZLIB_MARKER):
+            return zlib.decompress(value[len(ZLIB_MARKER):]).decode('utf-8')
+        return value.decode('utf-8')
+    return value
+
+
+# The columns written through compress_text, by table
+COMPRESSED_COLUMNS = {
+    'resumes': 'content',
+    'matches': 'match_details',
+}
+
+def register_sql_functions(conn):
+    """Register the functions the schema's triggers call; every connection that writes needs them"""
+    conn.create_function('decompress_text', 1, decompress_text, deterministic=True)
+
+
+def fts_query(terms):
+    """An FTS5 query matching documents that contain any of ``terms``"""
+    # Quoted terms are matched literally, so no input is parsed as query syntax
+    return ' OR '.join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+# Similarity components stored as columns of matches and match_scores (tfidf_similarity is the raw
+# TF-IDF cosine in both)
+MATCH_COMPONENTS = ('tfidf_similarity', 'semantic_similarity', 'skill_similarity',
+                    'keyword_similarity', 'context_similarity')
+
+# Writes to these tables bump their data version (see Database.get_data_version)
+VERSIONED_TABLES = ('job_descriptions', 'resumes', 'matches', 'match_scores')
+
+
+# Schema migrations, applied in order after the base tables exist. PRAGMA user_version
+# records how many have run; append new migrations, never edit or reorder applied ones.
+def _add_listing_indexes(cursor):
+    """Indexes for the match, resume and job listing queries"""
+    # get_matches_for_job: WHERE job_id = ? ORDER BY similarity_score DESC
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_job_score ON matches (job_id, similarity_score DESC)')
+    # get_all_matches: ORDER BY created_at DESC
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_created_at ON matches (created_at)')
+    # get_resumes / get_resume_ids: ORDER BY uploaded_at DESC
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_resumes_uploaded_at ON resumes (uploaded_at)')
+    # get_job_descriptions / get_job_ids: ORDER BY created_at DESC
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_job_descriptions_created_at ON job_descriptions (created_at)')
+
+
+def _collapse_duplicate_matches(cursor, model_version=None, job_id=None, newest='created_at'):
+    """
+    Delete all but the newest stored match per (job, resume, model version).
+    
+    With ``model_version``, each pair keeps only its row for that version, or
+    its newest row if it has none. ``job_id`` limits the compaction to one job.
+    ``newest`` is the timestamp column that orders the rows.
+    """
+    scope, params = ('WHERE job_id = ?', (job_id,)) if job_id else ('', ())
+    partition = 'job_id, resume_id' if model_version is not None else 'job_id, resume_id, model_version'
+    # Rows of the given version sort first, then the newest
+    order = f'{newest} DESC, rowid DESC'
+    if model_version is not None:
+        order = f'model_version = ? DESC, {order}'
+    order_params = (model_version,) if model_version is not None else ()
+    cursor.execute(f'''
+        DELETE FROM matches WHERE rowid IN (
+            SELECT rowid FROM (
+                SELECT rowid, ROW_NUMBER() OVER (PARTITION BY {partition} ORDER BY {order}) AS position
+                FROM matches {scope}
+            )
+            WHERE position > 1
+        )
+    ''', order_params + params)
+    return cursor.rowcount
+
+
+def _add_match_model_version(cursor):
+    """One stored match per job, resume and model version instead of one per /api/match call"""
+    # Matches stored before this migration have an unknown ('') model version
+    cursor.execute("ALTER TABLE matches ADD COLUMN model_version TEXT NOT NULL DEFAULT ''")
+    _collapse_duplicate_matches(cursor)
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_matches_pair_version
+        ON matches (job_id, resume_id, model_version)
+    ''')
+
+
+def _add_keyset_indexes(cursor):
+    """Listing indexes that end with the id tie-breaker used by keyset pagination"""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_resumes_uploaded_at_id ON resumes (uploaded_at, id)')
+    cursor.execute('DROP INDEX IF EXISTS idx_resumes_uploaded_at')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_job_descriptions_created_at_id ON job_descriptions (created_at, id)')
+    cursor.execute('DROP INDEX IF EXISTS idx_job_descriptions_created_at')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_created_at_id ON matches (created_at, id)')
+    cursor.execute('DROP INDEX IF EXISTS idx_matches_created_at')
+
+
+def _replace_match_skills(cursor, match_skills):
+    """Replace the matched and missing skills of matches; ``match_skills`` are (match_id, matched, missing)"""
+    names = {name for _, matched, missing in match_skills for name in matched + missing}
+    cursor.executemany('INSERT OR IGNORE INTO skills (name) VALUES (?)', [(name,) for name in names])
+    cursor.executemany('DELETE FROM match_skills WHERE match_id = ?', [(match_id,) for match_id, _, _ in match_skills])
+    cursor.executemany('''
+        INSERT OR IGNORE INTO match_skills (match_id, skill_id, kind)
+        SELECT ?, id, ? FROM skills WHERE name = ?
+    ''', [(match_id, kind, name)
+          for match_id, matched, missing in match_skills
+          for kind, skills in (('matched', matched), ('missing', missing))
+          for name in skills])
+
+
+def _normalize_match_schema(cursor):
+    """Component scores as columns of matches, and matched and missing skills in an indexed join table"""
+    for component in MATCH_COMPONENTS:
+        cursor.execute(f'ALTER TABLE matches ADD COLUMN {component} REAL')
+    cursor.execute('ALTER TABLE matches ADD COLUMN match_category TEXT')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE COLLATE NOCASE
+        )
+    ''')
+    # kind is 'matched' (a job skill the resume has) or 'missing' (a job skill it lacks)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS match_skills (
+            match_id TEXT NOT NULL,
+            skill_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            PRIMARY KEY (match_id, skill_id, kind)
+        ) WITHOUT ROWID
+    ''')
+    # "Matches that have skill X" starts from the skill
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_match_skills_skill ON match_skills (skill_id, kind, match_id)')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS matches_delete_skills AFTER DELETE ON matches
+        BEGIN
+            DELETE FROM match_skills WHERE match_id = old.id;
+        END
+    ''')
+    
+    # Backfill from the JSON columns of the stored matches
+    rows = cursor.execute('SELECT id, common_skills, missing_skills, match_details FROM matches').fetchall()
+    updates, match_skills = [], []
+    for match_id, common_skills, missing_skills, match_details in rows:
+        details = json.loads(decompress_text(match_details)) if match_details else {}
+        components = details.get('component_scores') or {}
+        updates.append(tuple(components.get(component) for component in MATCH_COMPONENTS)
+                       + (details.get('match_category'), match_id))
+        match_skills.append((match_id, json.loads(common_skills) if common_skills else [],
+                             json.loads(missing_skills) if missing_skills else []))
+    cursor.executemany(f'''
+        UPDATE matches SET {', '.join(f'{component} = ?' for component in MATCH_COMPONENTS)}, match_category = ?
+        WHERE id = ?
+    ''', updates)
+    _replace_match_skills(cursor, match_skills)
+
+
+def _add_full_text_indexes(cursor):
+    """
+    FTS5 indexes of resume content and job description text, kept in sync by triggers.
+    
+    The indexes are contentless, so the text is not stored a second time, and
+    are keyed through an id table with an INTEGER PRIMARY KEY: VACUUM may
+    renumber the rowids of resumes and job_descriptions, whose keys are TEXT.
+    Resume content is indexed as decompressed text.
+    """
+    cursor.execute('CREATE TABLE resumes_fts_ids (rowid INTEGER PRIMARY KEY, resume_id TEXT NOT NULL UNIQUE)')
+    cursor.execute("CREATE VIRTUAL TABLE resumes_fts USING fts5(content, content='', tokenize='porter unicode61')")
+    cursor.execute('''
+        CREATE TRIGGER resumes_fts_insert AFTER INSERT ON resumes
+        BEGIN
+            INSERT INTO resumes_fts_ids (resume_id) VALUES (new.id);
+            INSERT INTO resumes_fts (rowid, content)
+            SELECT rowid, decompress_text(new.content) FROM resumes_fts_ids WHERE resume_id = new.id;
+        END
+    ''')
+    # Contentless indexes are updated by deleting the exact text that was indexed
+    cursor.execute('''
+        CREATE TRIGGER resumes_fts_delete AFTER DELETE ON resumes
+        BEGIN
+            INSERT INTO resumes_fts (resumes_fts, rowid, content)
+            SELECT 'delete', rowid, decompress_text(old.content) FROM resumes_fts_ids WHERE resume_id = old.id;
+            DELETE FROM resumes_fts_ids WHERE resume_id = old.id;
+        END
+    ''')
+    # Compressing a row in place does not change its text and is not reindexed
+    cursor.execute('''
+        CREATE TRIGGER resumes_fts_update AFTER UPDATE OF content ON resumes
+        WHEN decompress_text(old.content) IS NOT decompress_text(new.content)
+        BEGIN
+            INSERT INTO resumes_fts (resumes_fts, rowid, content)
+            SELECT 'delete', rowid, decompress_text(old.content) FROM resumes_fts_ids WHERE resume_id = old.id;
+            INSERT INTO resumes_fts (rowid, content)
+            SELECT rowid, decompress_text(new.content) FROM resumes_fts_ids WHERE resume_id = old.id;
+        END
+    ''')
+    
+    cursor.execute('CREATE TABLE job_descriptions_fts_ids (rowid INTEGER PRIMARY KEY, job_id TEXT NOT NULL UNIQUE)')
+    cursor.execute('''
+        CREATE VIRTUAL TABLE job_descriptions_fts
+        USING fts5(description, requirements, content='', tokenize='porter unicode61')
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER job_descriptions_fts_insert AFTER INSERT ON job_descriptions
+        BEGIN
+            INSERT INTO job_descriptions_fts_ids (job_id) VALUES (new.id);
+            INSERT INTO job_descriptions_fts (rowid, description, requirements)
+            SELECT rowid, new.description, new.requirements FROM job_descriptions_fts_ids WHERE job_id = new.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER job_descriptions_fts_delete AFTER DELETE ON job_descriptions
+        BEGIN
+            INSERT INTO job_descriptions_fts (job_descriptions_fts, rowid, description, requirements)
+            SELECT 'delete', rowid, old.description, old.requirements
+            FROM job_descriptions_fts_ids WHERE job_id = old.id;
+            DELETE FROM job_descriptions_fts_ids WHERE job_id = old.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER job_descriptions_fts_update AFTER UPDATE OF description, requirements ON job_descriptions
+        BEGIN
+            INSERT INTO job_descriptions_fts (job_descriptions_fts, rowid, description, requirements)
+            SELECT 'delete', rowid, old.description, old.requirements
+            FROM job_descriptions_fts_ids WHERE job_id = old.id;
+            INSERT INTO job_descriptions_fts (rowid, description, requirements)
+            SELECT rowid, new.description, new.requirements FROM job_descriptions_fts_ids WHERE job_id = old.id;
+        END
+    ''')
+    
+    # Index the documents stored so far
+    cursor.execute('INSERT INTO resumes_fts_ids (resume_id) SELECT id FROM resumes')
+    cursor.execute('''
+        INSERT INTO resumes_fts (rowid, content)
+        SELECT i.rowid, decompress_text(r.content) FROM resumes r JOIN resumes_fts_ids i ON i.resume_id = r.id
+    ''')
+    cursor.execute('INSERT INTO job_descriptions_fts_ids (job_id) SELECT id FROM job_descriptions')
+    cursor.execute('''
+        INSERT INTO job_descriptions_fts (rowid, description, requirements)
+        SELECT i.rowid, j.description, j.requirements
+        FROM job_descriptions j JOIN job_descriptions_fts_ids i ON i.job_id = j.id
+    ''')
+
+
+def _add_document_skills(cursor):
+    """Inverted index from skills to the resumes and job descriptions that mention them"""
+    # doc_type is 'resume' or 'job'
+    cursor.execute('''
+        CREATE TABLE document_skills (
+            skill_id INTEGER NOT NULL,
+            doc_type TEXT NOT NULL,
+            doc_id TEXT NOT NULL,
+            PRIMARY KEY (skill_id, doc_type, doc_id)
+        ) WITHOUT ROWID
+    ''')
+    # Replacing the skills of one document; doc_id leads so skill searches keep using the primary key
+    cursor.execute('CREATE INDEX idx_document_skills_doc ON document_skills (doc_id, doc_type)')
+    cursor.execute('''
+        CREATE TRIGGER resumes_delete_skills AFTER DELETE ON resumes
+        BEGIN
+            DELETE FROM document_skills WHERE doc_type = 'resume' AND doc_id = old.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER job_descriptions_delete_skills AFTER DELETE ON job_descriptions
+        BEGIN
+            DELETE FROM document_skills WHERE doc_type = 'job' AND doc_id = old.id;
+        END
+    ''')
+
+
+def _add_data_version(cursor):
+    """A counter bumped by every write to the tables the read endpoints serve"""
+    cursor.execute('''
+        CREATE TABLE data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('INSERT INTO data_version (id, version) VALUES (1, 1)')
+    for table in VERSIONED_TABLES:
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+                CREATE TRIGGER {table}_{event.lower()}_version AFTER {event} ON {table}
+                BEGIN
+                    UPDATE data_version SET version = version + 1 WHERE id = 1;
+                END
+            ''')
+
+
+def _add_match_updated_at(cursor):
+    """When a stored match was last written; created_at keeps its first store, the pagination key"""
+    cursor.execute('ALTER TABLE matches ADD COLUMN updated_at TIMESTAMP')
+    cursor.execute('UPDATE matches SET updated_at = created_at')
+
+
+def _store_raw_tfidf_in_matches(cursor):
+    """
+    matches.tfidf_similarity held the overall score; store the raw TF-IDF cosine like match_scores.
+    
+    Rows take it from the materialized score of the same pair and model
+    version; rows without one are cleared rather than left misleading.
+    """
+    cursor.execute('''
+        UPDATE matches SET tfidf_similarity = (
+            SELECT s.tfidf_similarity FROM match_scores s
+            WHERE s.job_id = matches.job_id AND s.resume_id = matches.resume_id
+              AND s.model_version = matches.model_version
+        )
+    ''')
+
+
+def _version_tables_separately(cursor):
+    """
+    One data version per table, so a read only changes version with the tables it reads.
+    
+    Every table continues from the shared version, so no version is handed out twice.
+    """
+    cursor.execute('''
+        CREATE TABLE table_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        )
+    ''')
+    for table in VERSIONED_TABLES:
+        cursor.execute('INSERT INTO table_versions (name, version) SELECT ?, version FROM data_version', (table,))
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS {table}_{event.lower()}_version')
+            cursor.execute(f'''
+                CREATE TRIGGER {table}_{event.lower()}_version AFTER {event} ON {table}
+                BEGIN
+                    UPDATE table_versions SET version = version + 1 WHERE name = '{table}';
+                END
+            ''')
+    cursor.execute('DROP TABLE data_version')
+
+
+MIGRATIONS = [
+    _add_listing_indexes,
+    _add_match_model_version,
+    _add_keyset_indexes,
+    _normalize_match_schema,
+    _add_full_text_indexes,
+    _add_document_skills,
+    _add_data_version,
+    _add_match_updated_at,
+    _store_raw_tfidf_in_matches,
+    _version_tables_separately,
+]
+
+DOCUMENT_TYPES = ('resume', 'job')
+
+
+def encode_cursor(sort_value, row_id):
+    """Encode the position after a listed row as an opaque pagination cursor"""
+    return base64.urlsafe_b64encode(json.dumps([sort_value, row_id]).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Decode a pagination cursor into (sort_value, row_id); raises ValueError if it is malformed"""
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError(f'Invalid cursor: {cursor}')
+    return sort_value, row_id
+
+
+def _keyset_page(cursor, select, sort_column, id_column, after, limit, params=()):
+    """
+    Run ``select`` for one page, newest first, starting after the ``after`` cursor.
+    
+    ``select`` must have a ``{where}`` placeholder and select the sort value and
+    id as its last two columns. Returns the rows (without those two columns when
+    they are only there for the cursor) and the cursor of the next page, or None.
+    """
+    where, where_params = '', ()
+    if after:
+        # Row values compare lexicographically, so ties on the sort column are broken by id
+        where, where_params = f'WHERE ({sort_column}, {id_column}) < (?, ?)', decode_cursor(after)
+    cursor.execute(f'''
+        {select.format(where=where)}
+        ORDER BY {sort_column} DESC, {id_column} DESC
+        LIMIT ?
+    ''', tuple(params) + tuple(where_params) + (limit + 1,))
+    rows = cursor.fetchall()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][-2], rows[-1][-1])
+    return rows, next_cursor
 
 class Database:
-    def __init__(self, db_path='resume_matcher.db'):
+    def __init__(self, db_path='resume_matcher.db', pool_size=DB_POOL_SIZE,
+                 cache_size_kb=DB_CACHE_SIZE_KB, mmap_size=DB_MMAP_SIZE):
         self.db_path = db_path
+        self.pool_size = pool_size
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self._pool = queue.LifoQueue()
+        self._pool_pid = os.getpid()
+        # Table versions as of a PRAGMA data_version of their own connection (see get_data_version)
+        self._versions_lock = threading.Lock()
+        self._versions_conn = None
+        self._versions_pid = None
+        self._versions = None
         self.init_database()
+        self.migrate()
     
     def init_database(self):
         """Initialize the database and create tables if they don't exist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            # Create job_descriptions table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS job_descriptions (
+                    id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    company TEXT,
+                    description TEXT NOT NULL,
+                    requirements TEXT,
+                    recruiter_name TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Create resumes table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS resumes (
+                    id TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    candidate_name TEXT,
+                    candidate_email TEXT,
+                    content TEXT NOT NULL,
+                    file_path TEXT,
+                    uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Create matches table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS matches (
+                    id TEXT PRIMARY KEY,
+                    job_id TEXT NOT NULL,
+                    resume_id TEXT NOT NULL,
+                    similarity_score REAL,
+                    common_skills TEXT,
+                    missing_skills TEXT,
+                    match_details TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (job_id) REFERENCES job_descriptions (id),
+                    FOREIGN KEY (resume_id) REFERENCES resumes (id)
+                )
+            ''')
+            
+            # Create materialized score table (one row per job/resume pair)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS match_scores (
+                    job_id TEXT NOT NULL,
+                    resume_id TEXT NOT NULL,
+                    model_version TEXT NOT NULL,
+                    similarity_score REAL NOT NULL,
+                    match_category TEXT,
+                    tfidf_similarity REAL,
+                    semantic_similarity REAL,
+                    skill_similarity REAL,
+                    keyword_similarity REAL,
+                    context_similarity REAL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (job_id, resume_id),
+                    FOREIGN KEY (job_id) REFERENCES job_descriptions (id),
+                    FOREIGN KEY (resume_id) REFERENCES resumes (id)
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_match_scores_job_score
+                ON match_scores (job_id, similarity_score DESC)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_match_scores_resume_score
+                ON match_scores (resume_id, similarity_score DESC)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_match_scores_version
+                ON match_scores (model_version)
+            ''')
+            
+            # Create resume ingestion queue (one job per uploaded resume, keyed by resume id)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS ingestion_jobs (
+                    id TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    candidate_name TEXT,
+                    candidate_email TEXT,
+                    file_path TEXT,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    claim_token TEXT,
+                    locked_until REAL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    content_hash TEXT,
+                    owner TEXT
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_status
+                ON ingestion_jobs (status, locked_until)
+            ''')
+            
+            # Create content-addressed cache of extracted text and NLP features per uploaded file
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS document_cache (
+                    content_hash TEXT NOT NULL,
+                    extractor_version TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    features TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (content_hash, extractor_version)
+                )
+            ''')
+            
+            # Create bulk ingestion runs and the outcome of every item, so interrupted runs can resume
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS bulk_ingest_runs (
+                    id TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'running',
+                    total_items INTEGER,
+                    error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS bulk_ingest_items (
+                    run_id TEXT NOT NULL,
+                    item_key TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    document_id TEXT,
+                    error TEXT,
+                    PRIMARY KEY (run_id, item_key),
+                    FOREIGN KEY (run_id) REFERENCES bulk_ingest_runs (id)
+                )
+            ''')
+    
+    def get_data_version(self, tables=VERSIONED_TABLES):
+        """
+        Get the data version of ``tables``, which increases with every committed write to any of them.
         
-        # Create job_descriptions table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS job_descriptions (
-                id TEXT PRIMARY KEY,
-                title TEXT NOT NULL,
-                company TEXT,
-                description TEXT NOT NULL,
-                requirements TEXT,
-                recruiter_name TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        Writes to other VERSIONED_TABLES leave it unchanged. The versions live in
+        the database, so every connection and worker process sees the same value
+        for the same state of the data.
         
-        # Create resumes table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS resumes (
-                id TEXT PRIMARY KEY,
-                filename TEXT NOT NULL,
-                candidate_name TEXT,
-                candidate_email TEXT,
-                content TEXT NOT NULL,
-                file_path TEXT,
-                uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        They are kept in memory and read again only after a commit anywhere: a
+        connection that never writes sees its ``PRAGMA data_version`` change when
+        any other connection or process commits. So an unchanged database costs
+        that one pragma, which reads no table.
+        """
+        with self._versions_lock:
+            if self._versions_pid != os.getpid():
+                # Like the pool, the connection must not be shared across a fork
+                self._versions_conn = self.get_connection()
+                self._versions_pid = os.getpid()
+                self._versions = None
+            # Read before the versions, so a commit in between only causes another read
+            changes = self._versions_conn.execute('PRAGMA data_version').fetchone()[0]
+            if self._versions is None or self._versions[0] != changes:
+                rows = self._versions_conn.execute('SELECT name, version FROM table_versions')
+                self._versions = (changes, dict(rows))
+            versions = self._versions[1]
+        return sum(versions[table] for table in tables)
+    
+    def get_schema_version(self):
+        """Get the number of schema migrations applied to the database"""
+        with self.connection() as conn:
+            return conn.execute('PRAGMA user_version').fetchone()[0]
+    
+    def migrate(self):
+        """
+        Apply pending schema migrations, each in its own transaction.
         
-        # Create matches table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS matches (
-                id TEXT PRIMARY KEY,
-                job_id TEXT NOT NULL,
-                resume_id TEXT NOT NULL,
-                similarity_score REAL,
-                common_skills TEXT,
-                missing_skills TEXT,
-                match_details TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (job_id) REFERENCES job_descriptions (id),
-                FOREIGN KEY (resume_id) REFERENCES resumes (id)
-            )
-        ''')
+        The write lock is taken before the version is checked, so processes
+        starting at the same time never run a migration twice. Index builds on
+        large tables run once, on the first start after an upgrade.
+        """
+        if self.get_schema_version() >= len(MIGRATIONS):
+            return
         
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            for version, migration in enumerate(MIGRATIONS, start=1):
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    if conn.execute('PRAGMA user_version').fetchone()[0] >= version:
+                        conn.rollback()
+                        continue
+                    migration(conn.cursor())
+                    conn.execute(f'PRAGMA user_version = {version}')
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
     
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """
+        Open a new database connection in WAL mode with the tuned pragmas.
+        
+        WAL lets readers run while a write is in progress, and with
+        synchronous=NORMAL a commit no longer waits for an fsync of the log.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=DB_BUSY_TIMEOUT, check_same_thread=False,
+                               cached_statements=DB_CACHED_STATEMENTS)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{int(self.cache_size_kb)}')
+        conn.execute(f'PRAGMA mmap_size={int(self.mmap_size)}')
+        register_sql_functions(conn)
+        return conn
+    
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a pooled connection for one transaction.
+        
+        The transaction is committed when the block completes and rolled back
+        if it raises, so connections always return to the pool idle. Reused
+        connections keep their page cache and prepared statements.
+        """
+        if self._pool_pid != os.getpid():
+            # Connections must not be shared across a fork (e.g. gunicorn --preload)
+            self._pool = queue.LifoQueue()
+            self._pool_pid = os.getpid()
+        
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self.get_connection()
+        
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            if self._pool.qsize() < self.pool_size:
+                self._pool.put(conn)
+            else:
+                conn.close()
+    
+    def close(self):
+        """Close the idle pooled connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._versions_lock:
+            if self._versions_conn is not None and self._versions_pid == os.getpid():
+                self._versions_conn.close()
+            self._versions_conn = self._versions_pid = self._versions = None
+    
+    def get_storage_size(self):
+        """Bytes the database occupies on disk, including its write-ahead log"""
+        return sum(os.path.getsize(path) for path in (self.db_path, self.db_path + '-wal')
+                   if os.path.exists(path))
+    
+    def compress_stored_columns(self, batch_size=500, decompress=False):
+        """
+        Rewrite the rows of the compressed columns stored as plain text.
+        
+        With ``decompress``, compressed rows are rewritten as plain text instead,
+        for going back to a version that cannot read them. Each batch is its own
+        transaction, so the server can keep running. Returns the number of rows
+        rewritten per table.
+        """
+        rewritten = {}
+        for table, column in COMPRESSED_COLUMNS.items():
+            rewritten[table] = 0
+            last_rowid = 0
+            while True:
+                with self.connection() as conn:
+                    rows = conn.execute(f'''
+                        SELECT rowid, {column} FROM {table}
+                        WHERE rowid > ? AND typeof({column}) = ?
+                        ORDER BY rowid LIMIT ?
+                    ''', (last_rowid, 'blob' if decompress else 'text', batch_size)).fetchall()
+                    if not rows:
+                        break
+                    last_rowid = rows[-1][0]
+                    
+                    updates = []
+                    for rowid, value in rows:
+                        stored = decompress_text(value) if decompress else compress_text(value)
+                        # Short and incompressible values stay as they are
+                        if stored is not value:
+                            updates.append((stored, rowid))
+                    conn.executemany(f'UPDATE {table} SET {column} = ? WHERE rowid = ?', updates)
+                    rewritten[table] += len(updates)
+        return rewritten
+    
+    def vacuum(self):
+        """Rebuild the database file so the space freed by deletes and rewrites is returned to the disk"""
+        # VACUUM cannot run inside a transaction or on a pooled connection with open statements
+        conn = self.get_connection()
+        try:
+            conn.execute('VACUUM')
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        finally:
+            conn.close()
     
     # Job Description methods
     def create_job_description(self, title, company, description, requirements, recruiter_name):
         """Create a new job description"""
         job_id = str(uuid.uuid4())
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO job_descriptions (id, title, company, description, requirements, recruiter_name)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (job_id, title, company, description, requirements, recruiter_name))
-        
-        conn.commit()
-        conn.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT INTO job_descriptions (id, title, company, description, requirements, recruiter_name)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (job_id, title, company, description, requirements, recruiter_name))
         return job_id
     
     def get_job_descriptions(self):
         """Get all job descriptions"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM job_descriptions ORDER BY created_at DESC')
-        rows = cursor.fetchall()
-        
-        job_descriptions = []
-        for row in rows:
-            job_descriptions.append({
-                'id': row[0],
-                'title': row[1],
-                'company': row[2],
-                'description': row[3],
-                'requirements': row[4],
-                'recruiter_name': row[5],
-                'created_at': row[6]
-            })
-        
-        conn.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT * FROM job_descriptions ORDER BY created_at DESC')
+            rows = cursor.fetchall()
+            
+            job_descriptions = []
+            for row in rows:
+                job_descriptions.append({
+                    'id': row[0],
+                    'title': row[1],
+                    'company': row[2],
+                    'description': row[3],
+                    'requirements': row[4],
+                    'recruiter_name': row[5],
+                    'created_at': row[6]
+                })
         return job_descriptions
     
     def get_job_description(self, job_id):
         """Get a specific job description"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM job_descriptions WHERE id = ?', (job_id,))
-        row = cursor.fetchone()
-        
-        if row:
-            job_desc = {
-                'id': row[0],
-                'title': row[1],
-                'company': row[2],
-                'description': row[3],
-                'requirements': row[4],
-                'recruiter_name': row[5],
-                'created_at': row[6]
-            }
-        else:
-            job_desc = None
-        
-        conn.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT * FROM job_descriptions WHERE id = ?', (job_id,))
+            row = cursor.fetchone()
+            
+            if row:
+                job_desc = {
+                    'id': row[0],
+                    'title': row[1],
+                    'company': row[2],
+                    'description': row[3],
+                    'requirements': row[4],
+                    'recruiter_name': row[5],
+                    'created_at': row[6]
+                }
+            else:
+                job_desc = None
         return job_desc
     
+    def list_job_descriptions(self, after=None, limit=100):
+        """Get a page of job descriptions, newest first, and the cursor of the next page"""
+        with self.connection() as conn:
+            rows, next_cursor = _keyset_page(conn.cursor(), '''
+                SELECT id, title, company, description, requirements, recruiter_name, created_at, created_at, id
+                FROM job_descriptions {where}
+            ''', 'created_at', 'id', after, limit)
+        
+        job_descriptions = [{
+            'id': row[0],
+            'title': row[1],
+            'company': row[2],
+            'description': row[3],
+            'requirements': row[4],
+            'recruiter_name': row[5],
+            'created_at': row[6]
+        } for row in rows]
+        return job_descriptions, next_cursor
+    
     # Resume methods
-    def create_resume(self, filename, candidate_name, candidate_email, content, file_path):
+    def create_resume(self, filename, candidate_name, candidate_email, content, file_path, resume_id=None):
         """Create a new resume record"""
-        resume_id = str(uuid.uuid4())
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO resumes (id, filename, candidate_name, candidate_email, content, file_path)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (resume_id, filename, candidate_name, candidate_email, content, file_path))
-        
-        conn.commit()
-        conn.close()
+        resume_id = resume_id or str(uuid.uuid4())
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT INTO resumes (id, filename, candidate_name, candidate_email, content, file_path)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (resume_id, filename, candidate_name, candidate_email, compress_text(content), file_path))
         return resume_id
     
     def get_resumes(self):
         """Get all resumes"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM resumes ORDER BY uploaded_at DESC')
-        rows = cursor.fetchall()
-        
-        resumes = []
-        for row in rows:
-            resumes.append({
-                'id': row[0],
-                'filename': row[1],
-                'candidate_name': row[2],
-                'candidate_email': row[3],
-                'content': row[4],
-                'file_path': row[5],
-                'uploaded_at': row[6]
-            })
-        
-        conn.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT * FROM resumes ORDER BY uploaded_at DESC')
+            rows = cursor.fetchall()
+            
+            resumes = []
+            for row in rows:
+                resumes.append({
+                    'id': row[0],
+                    'filename': row[1],
+                    'candidate_name': row[2],
+                    'candidate_email': row[3],
+                    'content': decompress_text(row[4]),
+                    'file_path': row[5],
+                    'uploaded_at': row[6]
+                })
         return resumes
     
     def get_resume(self, resume_id):
         """Get a specific resume"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM resumes WHERE id = ?', (resume_id,))
-        row = cursor.fetchone()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT * FROM resumes WHERE id = ?', (resume_id,))
+            row = cursor.fetchone()
+            
+            if row:
+                resume = {
+                    'id': row[0],
+                    'filename': row[1],
+                    'candidate_name': row[2],
+                    'candidate_email': row[3],
+                    'content': decompress_text(row[4]),
+                    'file_path': row[5],
+                    'uploaded_at': row[6]
+                }
+            else:
+                resume = None
+        return resume
+    
+    def list_resumes(self, after=None, limit=100):
+        """
+        Get a page of resumes, newest first, and the cursor of the next page.
         
-        if row:
-            resume = {
-                'id': row[0],
-                'filename': row[1],
-                'candidate_name': row[2],
-                'candidate_email': row[3],
-                'content': row[4],
-                'file_path': row[5],
-                'uploaded_at': row[6]
-            }
-        else:
-            resume = None
+        Only the listing columns are read; use ``get_resume`` for the content.
+        """
+        with self.connection() as conn:
+            rows, next_cursor = _keyset_page(conn.cursor(), '''
+                SELECT id, filename, candidate_name, candidate_email, uploaded_at, uploaded_at, id
+                FROM resumes {where}
+            ''', 'uploaded_at', 'id', after, limit)
         
-        conn.close()
-        return resume
+        resumes = [{
+            'id': row[0],
+            'filename': row[1],
+            'candidate_name': row[2],
+            'candidate_email': row[3],
+            'uploaded_at': row[4]
+        } for row in rows]
+        return resumes, next_cursor
     
     # Match methods
-    def create_match(self, job_id, resume_id, similarity_score, common_skills, missing_skills, match_details):
-        """Create a new match record"""
-        match_id = str(uuid.uuid4())
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def create_match(self, job_id, resume_id, similarity_score, common_skills, missing_skills, match_details,
+                     model_version='', component_scores=None, match_category=None):
+        """Store a match, replacing the one stored for the same pair and model version; returns its id"""
+        return self._upsert_matches([{
+            'job_id': job_id,
+            'resume_id': resume_id,
+            'model_version': model_version,
+            'similarity_score': similarity_score,
+            'common_skills': common_skills,
+            'missing_skills': missing_skills,
+            'match_details': match_details,
+            'component_scores': component_scores,
+            'match_category': match_category
+        }])[0]
+    
+    def create_matches(self, matches):
+        """
+        Store a batch of matches in a single transaction.
+        
+        Each match is a dict with the arguments of ``create_match``. A match for a
+        pair and model version that is already stored replaces it, keeping its id
+        and ``created_at``. Component scores and the category default to the ones
+        in ``match_details``. Returns the number of matches written.
+        """
+        return len(self._upsert_matches(matches))
+    
+    def _upsert_matches(self, matches):
+        """Store matches like ``create_matches`` and return their ids"""
+        # Serialize before taking the write lock so the transaction stays short
+        rows = []
+        for match in matches:
+            details = match['match_details'] if isinstance(match['match_details'], dict) else {}
+            components = match.get('component_scores') or details.get('component_scores') or {}
+            rows.append((str(uuid.uuid4()), match['job_id'], match['resume_id'], match.get('model_version') or '',
+                         match['similarity_score'], json.dumps(match['common_skills']),
+                         json.dumps(match['missing_skills']), compress_text(json.dumps(match['match_details'])),
+                         match.get('match_category') or details.get('match_category'))
+                        + tuple(components.get(component) for component in MATCH_COMPONENTS))
         
-        cursor.execute('''
-            INSERT INTO matches (id, job_id, resume_id, similarity_score, common_skills, missing_skills, match_details)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (match_id, job_id, resume_id, similarity_score, 
-              json.dumps(common_skills), json.dumps(missing_skills), json.dumps(match_details)))
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            # One statement per row, as executemany discards RETURNING rows; upserted rows keep their id
+            match_ids, match_skills = [], []
+            for row, match in zip(rows, matches):
+                match_id = cursor.execute(f'''
+                    INSERT INTO matches (id, job_id, resume_id, model_version, similarity_score,
+                                         common_skills, missing_skills, match_details, match_category,
+                                         {', '.join(MATCH_COMPONENTS)}, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, {', '.join('?' * len(MATCH_COMPONENTS))}, CURRENT_TIMESTAMP)
+                    ON CONFLICT (job_id, resume_id, model_version) DO UPDATE SET
+                        similarity_score = excluded.similarity_score,
+                        common_skills = excluded.common_skills,
+                        missing_skills = excluded.missing_skills,
+                        match_details = excluded.match_details,
+                        match_category = excluded.match_category,
+                        {', '.join(f'{component} = excluded.{component}' for component in MATCH_COMPONENTS)},
+                        updated_at = CURRENT_TIMESTAMP
+                    RETURNING id
+                ''', row).fetchone()[0]
+                match_ids.append(match_id)
+                match_skills.append((match_id, list(match['common_skills']), list(match['missing_skills'])))
+            _replace_match_skills(cursor, match_skills)
+        return match_ids
+    
+    def compact_matches(self, model_version=None, job_id=None):
+        """
+        Collapse stored matches to the newest row per pair and model version.
         
-        conn.commit()
-        conn.close()
-        return match_id
+        With ``model_version``, rows of superseded versions are dropped as well,
+        leaving one row per live pair. ``job_id`` limits the compaction to one
+        job. Returns the number of rows deleted.
+        """
+        with self.connection() as conn:
+            return _collapse_duplicate_matches(conn.cursor(), model_version, job_id, newest='updated_at')
     
     def get_matches_for_job(self, job_id):
         """Get all matches for a specific job"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT m.*, r.filename, r.candidate_name, r.candidate_email
-            FROM matches m
-            JOIN resumes r ON m.resume_id = r.id
-            WHERE m.job_id = ?
-            ORDER BY m.similarity_score DESC
-        ''', (job_id,))
-        
-        rows = cursor.fetchall()
-        matches = []
-        for row in rows:
-            matches.append({
-                'id': row[0],
-                'job_id': row[1],
-                'resume_id': row[2],
-                'similarity_score': row[3],
-                'common_skills': json.loads(row[4]) if row[4] else [],
-                'missing_skills': json.loads(row[5]) if row[5] else [],
-                'match_details': json.loads(row[6]) if row[6] else {},
-                'created_at': row[7],
-                'filename': row[8],
-                'candidate_name': row[9],
-                'candidate_email': row[10]
-            })
-        
-        conn.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT m.id, m.job_id, m.resume_id, m.similarity_score, m.common_skills, m.missing_skills,
+                       m.match_details, m.created_at, r.filename, r.candidate_name, r.candidate_email,
+                       m.model_version
+                FROM matches m
+                JOIN resumes r ON m.resume_id = r.id
+                WHERE m.job_id = ?
+                ORDER BY m.similarity_score DESC
+            ''', (job_id,))
+            
+            rows = cursor.fetchall()
+            matches = []
+            for row in rows:
+                matches.append({
+                    'id': row[0],
+                    'job_id': row[1],
+                    'resume_id': row[2],
+                    'similarity_score': row[3],
+                    'common_skills': json.loads(row[4]) if row[4] else [],
+                    'missing_skills': json.loads(row[5]) if row[5] else [],
+                    'match_details': json.loads(decompress_text(row[6])) if row[6] else {},
+                    'created_at': row[7],
+                    'filename': row[8],
+                    'candidate_name': row[9],
+                    'candidate_email': row[10],
+                    'model_version': row[11]
+                })
         return matches
     
     def get_all_matches(self):
         """Get all matches"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT m.id, m.job_id, m.resume_id, m.similarity_score, m.common_skills, m.missing_skills,
+                       m.match_details, m.created_at, j.title as job_title, r.filename, r.candidate_name,
+                       m.model_version
+                FROM matches m
+                JOIN job_descriptions j ON m.job_id = j.id
+                JOIN resumes r ON m.resume_id = r.id
+                ORDER BY m.created_at DESC
+            ''')
+            
+            rows = cursor.fetchall()
+            matches = []
+            for row in rows:
+                matches.append({
+                    'id': row[0],
+                    'job_id': row[1],
+                    'resume_id': row[2],
+                    'similarity_score': row[3],
+                    'common_skills': json.loads(row[4]) if row[4] else [],
+                    'missing_skills': json.loads(row[5]) if row[5] else [],
+                    'match_details': json.loads(decompress_text(row[6])) if row[6] else {},
+                    'created_at': row[7],
+                    'job_title': row[8],
+                    'filename': row[9],
+                    'candidate_name': row[10],
+                    'model_version': row[11]
+                })
+        return matches
+    
+    def list_matches(self, after=None, limit=100, include_details=False, fields=None):
+        """
+        Get a page of stored matches, newest first, and the cursor of the next page.
         
-        cursor.execute('''
-            SELECT m.*, j.title as job_title, r.filename, r.candidate_name
-            FROM matches m
-            JOIN job_descriptions j ON m.job_id = j.id
-            JOIN resumes r ON m.resume_id = r.id
-            ORDER BY m.created_at DESC
-        ''')
+        ``fields`` names the optional columns to read: ``common_skills``,
+        ``missing_skills`` and ``match_details``. By default the skill lists are
+        read, and the large ``match_details`` column only with ``include_details``.
+        """
+        if fields is None:
+            fields = {'common_skills', 'missing_skills'} | ({'match_details'} if include_details else set())
+        columns = [f'm.{column}' if column in fields else 'NULL'
+                   for column in ('common_skills', 'missing_skills', 'match_details')]
+        with self.connection() as conn:
+            rows, next_cursor = _keyset_page(conn.cursor(), f'''
+                SELECT m.id, m.job_id, m.resume_id, m.similarity_score, {', '.join(columns)},
+                       m.created_at, j.title, r.filename, r.candidate_name, m.model_version,
+                       m.created_at, m.id
+                FROM matches m
+                JOIN job_descriptions j ON m.job_id = j.id
+                JOIN resumes r ON m.resume_id = r.id
+                {{where}}
+            ''', 'm.created_at', 'm.id', after, limit)
         
-        rows = cursor.fetchall()
         matches = []
         for row in rows:
-            matches.append({
+            match = {
                 'id': row[0],
                 'job_id': row[1],
                 'resume_id': row[2],
                 'similarity_score': row[3],
-                'common_skills': json.loads(row[4]) if row[4] else [],
-                'missing_skills': json.loads(row[5]) if row[5] else [],
-                'match_details': json.loads(row[6]) if row[6] else {},
                 'created_at': row[7],
                 'job_title': row[8],
                 'filename': row[9],
-                'candidate_name': row[10]
-            })
+                'candidate_name': row[10],
+                'model_version': row[11]
+            }
+            if 'common_skills' in fields:
+                match['common_skills'] = json.loads(row[4]) if row[4] else []
+            if 'missing_skills' in fields:
+                match['missing_skills'] = json.loads(row[5]) if row[5] else []
+            if 'match_details' in fields:
+                match['match_details'] = json.loads(decompress_text(row[6])) if row[6] else {}
+            matches.append(match)
+        return matches, next_cursor
+    
+    def find_matches(self, job_id=None, min_score=None, min_components=None, matched_skills=None,
+                     missing_skills=None, model_version=None, limit=100):
+        """
+        Find stored matches by score, component scores and skills, best first.
         
-        conn.close()
-        return matches
+        ``min_components`` maps component names to minimum scores.
+        ``matched_skills`` are job skills the resume must have, and
+        ``missing_skills`` job skills it must lack. Skill names are case
+        insensitive. Every filter runs in SQLite on the indexed columns; match
+        details are not read.
+        """
+        conditions, params = [], []
+        if job_id is not None:
+            conditions.append('m.job_id = ?')
+            params.append(job_id)
+        if model_version is not None:
+            conditions.append('m.model_version = ?')
+            params.append(model_version)
+        if min_score is not None:
+            conditions.append('m.similarity_score >= ?')
+            params.append(min_score)
+        for component, minimum in (min_components or {}).items():
+            if component not in MATCH_COMPONENTS:
+                raise ValueError(f'Unknown component score: {component}')
+            conditions.append(f'm.{component} >= ?')
+            params.append(minimum)
+        for kind, skills in (('matched', matched_skills), ('missing', missing_skills)):
+            for skill in skills or []:
+                conditions.append('''EXISTS (
+                    SELECT 1 FROM match_skills ms JOIN skills s ON s.id = ms.skill_id
+                    WHERE ms.match_id = m.id AND ms.kind = ? AND s.name = ?
+                )''')
+                params.extend((kind, skill))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f'''
+                SELECT m.id, m.job_id, m.resume_id, m.similarity_score, m.common_skills, m.missing_skills,
+                       m.created_at, r.filename, r.candidate_name, r.candidate_email, m.model_version,
+                       m.match_category, {', '.join(f'm.{component}' for component in MATCH_COMPONENTS)}
+                FROM matches m
+                JOIN resumes r ON m.resume_id = r.id
+                {where}
+                ORDER BY m.similarity_score DESC
+                LIMIT ?
+            ''', params + [limit])
+            rows = cursor.fetchall()
+        
+        return [{
+            'id': row[0],
+            'job_id': row[1],
+            'resume_id': row[2],
+            'similarity_score': row[3],
+            'common_skills': json.loads(row[4]) if row[4] else [],
+            'missing_skills': json.loads(row[5]) if row[5] else [],
+            'created_at': row[6],
+            'filename': row[7],
+            'candidate_name': row[8],
+            'candidate_email': row[9],
+            'model_version': row[10],
+            'match_category': row[11],
+            'component_scores': dict(zip(MATCH_COMPONENTS, row[12:]))
+        } for row in rows]
+
+    def get_job_ids(self):
+        """Get the ids of all job descriptions"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT id FROM job_descriptions ORDER BY created_at DESC')
+            job_ids = [row[0] for row in cursor.fetchall()]
+        return job_ids
+    
+    def get_resume_ids(self):
+        """Get the ids of all resumes"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT id FROM resumes ORDER BY uploaded_at DESC')
+            resume_ids = [row[0] for row in cursor.fetchall()]
+        return resume_ids
+    
+    def count_resumes(self):
+        """Get the number of stored resumes"""
+        with self.connection() as conn:
+            return conn.execute('SELECT COUNT(*) FROM resumes').fetchone()[0]
+    
+    def get_resumes_by_ids(self, resume_ids):
+        """Get the resumes with the given ids, in that order; unknown ids are skipped"""
+        rows = {}
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            # Stay under the host parameter limit of older SQLite builds
+            for start in range(0, len(resume_ids), 500):
+                chunk = resume_ids[start:start + 500]
+                cursor.execute(f'''
+                    SELECT id, filename, candidate_name, candidate_email, content, file_path, uploaded_at
+                    FROM resumes WHERE id IN ({','.join('?' * len(chunk))})
+                ''', chunk)
+                rows.update((row[0], row) for row in cursor.fetchall())
+        
+        return [{
+            'id': row[0],
+            'filename': row[1],
+            'candidate_name': row[2],
+            'candidate_email': row[3],
+            'content': decompress_text(row[4]),
+            'file_path': row[5],
+            'uploaded_at': row[6]
+        } for row in (rows.get(resume_id) for resume_id in resume_ids) if row]
+    
+    # Full-text search methods
+    def search_resumes(self, terms, limit=100):
+        """Get the ids of the resumes that best match any of ``terms`` by bm25, best first"""
+        if not terms:
+            return []
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT i.resume_id
+                FROM resumes_fts f
+                JOIN resumes_fts_ids i ON i.rowid = f.rowid
+                WHERE resumes_fts MATCH ?
+                ORDER BY bm25(resumes_fts)
+                LIMIT ?
+            ''', (fts_query(terms), limit))
+            return [row[0] for row in cursor.fetchall()]
+    
+    def search_job_descriptions(self, terms, limit=100):
+        """Get the ids of the job descriptions that best match any of ``terms`` by bm25, best first"""
+        if not terms:
+            return []
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT i.job_id
+                FROM job_descriptions_fts f
+                JOIN job_descriptions_fts_ids i ON i.rowid = f.rowid
+                WHERE job_descriptions_fts MATCH ?
+                ORDER BY bm25(job_descriptions_fts)
+                LIMIT ?
+            ''', (fts_query(terms), limit))
+            return [row[0] for row in cursor.fetchall()]
+    
+    # Skill index methods
+    def index_document_skills(self, documents):
+        """Replace the indexed skills of documents; ``documents`` are (doc_type, doc_id, skills) tuples"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            names = {name for _, _, skills in documents for name in skills}
+            cursor.executemany('INSERT OR IGNORE INTO skills (name) VALUES (?)', [(name,) for name in names])
+            cursor.executemany('DELETE FROM document_skills WHERE doc_type = ? AND doc_id = ?',
+                               [(doc_type, doc_id) for doc_type, doc_id, _ in documents])
+            cursor.executemany('''
+                INSERT OR IGNORE INTO document_skills (skill_id, doc_type, doc_id)
+                SELECT id, ?, ? FROM skills WHERE name = ?
+            ''', [(doc_type, doc_id, name) for doc_type, doc_id, skills in documents for name in skills])
+    
+    def get_skill_indexed_ids(self, doc_type):
+        """Get the ids of the documents of a type that have indexed skills"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT DISTINCT doc_id FROM document_skills WHERE doc_type = ?', (doc_type,))
+            return {row[0] for row in cursor.fetchall()}
+    
+    def search_documents_by_skills(self, all_skills=(), any_skills=(), doc_type='resume', limit=100):
+        """
+        Find the documents that have every skill of ``all_skills`` and, if given, any of ``any_skills``.
+        
+        Documents are ranked by how many of the requested skills they have,
+        then newest first. Skill names are case insensitive.
+        """
+        if doc_type not in DOCUMENT_TYPES:
+            raise ValueError(f'Unknown document type: {doc_type}')
+        required = {skill.lower() for skill in all_skills}
+        optional = {skill.lower() for skill in any_skills} - required
+        if not required and not optional:
+            return []
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            requested = sorted(required | optional)
+            cursor.execute(f'''
+                SELECT id, lower(name) FROM skills WHERE name IN ({','.join('?' * len(requested))})
+            ''', requested)
+            skill_ids = {name: skill_id for skill_id, name in cursor.fetchall()}
+            # A required skill no document has ever mentioned matches nothing
+            if not required <= skill_ids.keys() or (optional and not optional & skill_ids.keys()):
+                return []
+            required_ids = [skill_ids[name] for name in required]
+            requested_ids = list(skill_ids.values())
+            required_matched = f"SUM(skill_id IN ({','.join('?' * len(required_ids))}))" if required_ids else '0'
+            
+            if doc_type == 'resume':
+                document = 'r.candidate_name, r.filename, r.uploaded_at FROM resumes r'
+                order = 'r.uploaded_at DESC'
+                key = 'r.id'
+            else:
+                document = 'j.title, j.company, j.created_at FROM job_descriptions j'
+                order = 'j.created_at DESC'
+                key = 'j.id'
+            # Relational division: a document qualifies when its rows cover every required skill
+            cursor.execute(f'''
+                SELECT hits.doc_id, hits.skill_ids, hits.matched, {document}
+                JOIN (
+                    SELECT doc_id, group_concat(skill_id) AS skill_ids, COUNT(*) AS matched,
+                           {required_matched} AS required_matched
+                    FROM document_skills
+                    WHERE doc_type = ? AND skill_id IN ({','.join('?' * len(requested_ids))})
+                    GROUP BY doc_id
+                    HAVING required_matched = ? AND matched > ?
+                ) hits ON hits.doc_id = {key}
+                ORDER BY hits.matched DESC, {order}
+                LIMIT ?
+            ''', required_ids + [doc_type] + requested_ids
+                 + [len(required_ids), len(required_ids) if optional else 0, limit])
+            rows = cursor.fetchall()
+        
+        names = {skill_id: name for name, skill_id in skill_ids.items()}
+        documents = []
+        for row in rows:
+            document = {
+                'doc_type': doc_type,
+                'id': row[0],
+                'matched_skills': sorted(names[int(skill_id)] for skill_id in row[1].split(',')),
+                'score': round(row[2] / len(required | optional), 4)
+            }
+            if doc_type == 'resume':
+                document.update({'candidate_name': row[3], 'filename': row[4], 'uploaded_at': row[5]})
+            else:
+                document.update({'title': row[3], 'company': row[4], 'created_at': row[5]})
+            documents.append(document)
+        return documents
+    
+    # Materialized match score methods
+    def upsert_match_scores(self, scores):
+        """Insert or replace materialized scores for a batch of job/resume pairs"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany('''
+                INSERT INTO match_scores (job_id, resume_id, model_version, similarity_score, match_category,
+                                          tfidf_similarity, semantic_similarity, skill_similarity,
+                                          keyword_similarity, context_similarity, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT (job_id, resume_id) DO UPDATE SET
+                    model_version = excluded.model_version,
+                    similarity_score = excluded.similarity_score,
+                    match_category = excluded.match_category,
+                    tfidf_similarity = excluded.tfidf_similarity,
+                    semantic_similarity = excluded.semantic_similarity,
+                    skill_similarity = excluded.skill_similarity,
+                    keyword_similarity = excluded.keyword_similarity,
+                    context_similarity = excluded.context_similarity,
+                    updated_at = excluded.updated_at
+            ''', [(score['job_id'], score['resume_id'], score['model_version'], score['similarity_score'],
+                   score['match_category'], score['tfidf_similarity'], score['semantic_similarity'],
+                   score['skill_similarity'], score['keyword_similarity'], score['context_similarity'])
+                  for score in scores])
+    
+    def _match_score_from_row(self, row):
+        return {
+            'job_id': row[0],
+            'resume_id': row[1],
+            'model_version': row[2],
+            'similarity_score': row[3],
+            'match_category': row[4],
+            'component_scores': {
+                'tfidf_similarity': row[5],
+                'semantic_similarity': row[6],
+                'skill_similarity': row[7],
+                'keyword_similarity': row[8],
+                'context_similarity': row[9]
+            },
+            'updated_at': row[10]
+        }
+    
+    def get_match_scores_for_job(self, job_id):
+        """Get materialized scores for a job, best matches first"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT * FROM match_scores
+                WHERE job_id = ?
+                ORDER BY similarity_score DESC
+            ''', (job_id,))
+            scores = [self._match_score_from_row(row) for row in cursor.fetchall()]
+        return scores
+    
+    def get_match_scores_for_resume(self, resume_id):
+        """Get materialized scores for a resume, best matches first"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT * FROM match_scores
+                WHERE resume_id = ?
+                ORDER BY similarity_score DESC
+            ''', (resume_id,))
+            scores = [self._match_score_from_row(row) for row in cursor.fetchall()]
+        return scores
+    
+    def get_best_match_scores(self, resume_ids=None, model_version=None):
+        """
+        Get the best materialized job match for every resume, or just ``resume_ids``, keyed by resume id.
+        
+        With ``model_version``, scores from other model versions are ignored.
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            conditions, params = [], []
+            if resume_ids is not None:
+                conditions.append(f"s.resume_id IN ({','.join('?' * len(resume_ids))})")
+                params.extend(resume_ids)
+            if model_version is not None:
+                conditions.append('s.model_version = ?')
+                params.append(model_version)
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+            # SQLite returns the other columns from the row holding the MAX()
+            cursor.execute(f'''
+                SELECT s.resume_id, s.job_id, j.title, MAX(s.similarity_score), s.model_version
+                FROM match_scores s
+                JOIN job_descriptions j ON s.job_id = j.id
+                {where}
+                GROUP BY s.resume_id
+            ''', params)
+            
+            best_matches = {}
+            for row in cursor.fetchall():
+                best_matches[row[0]] = {
+                    'job_id': row[1],
+                    'job_title': row[2],
+                    'similarity_score': row[3],
+                    'model_version': row[4]
+                }
+        return best_matches
+    
+    def get_unscored_resume_ids(self, job_id, model_version, after=None, limit=1000):
+        """
+        Get ids of resumes whose materialized score against a job is missing or from another model version.
+        
+        Ids are returned in order; pass the last one as ``after`` to continue
+        from there, so a sweep reads every pair once.
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT r.id
+                FROM resumes r
+                LEFT JOIN match_scores s ON s.job_id = ? AND s.resume_id = r.id
+                WHERE r.id > ? AND (s.resume_id IS NULL OR s.model_version != ?)
+                ORDER BY r.id
+                LIMIT ?
+            ''', (job_id, after or '', model_version, limit))
+            resume_ids = [row[0] for row in cursor.fetchall()]
+        return resume_ids
+    
+    def get_match_score_coverage(self, model_version):
+        """Count materialized scores for a model version against the number of job/resume pairs"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT COUNT(*) FROM match_scores WHERE model_version = ?', (model_version,))
+            fresh = cursor.fetchone()[0]
+            cursor.execute('SELECT (SELECT COUNT(*) FROM job_descriptions) * (SELECT COUNT(*) FROM resumes)')
+            expected = cursor.fetchone()[0]
+        return fresh, expected
+    
+    # Ingestion queue methods
+    def create_ingestion_job(self, resume_id, filename, candidate_name, candidate_email, file_path,
+                             content_hash=None, owner=None, reserved_until=None):
+        """Queue an uploaded resume for processing, optionally reserved for the worker owning its payload"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT INTO ingestion_jobs (id, filename, candidate_name, candidate_email, file_path,
+                                            content_hash, owner, locked_until)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (resume_id, filename, candidate_name, candidate_email, file_path,
+                  content_hash, owner, reserved_until))
+        return resume_id
+    
+    def claim_ingestion_job(self, lease_seconds, owner=None):
+        """
+        Atomically claim the oldest queued job, or one whose worker lease expired.
+        
+        Jobs reserved for another owner are only claimed once their reservation expires.
+        """
+        claim_token = str(uuid.uuid4())
+        now = time.time()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            # A single UPDATE is atomic, so concurrent workers in any process never claim the same job
+            cursor.execute('''
+                UPDATE ingestion_jobs
+                SET status = 'processing', claim_token = ?, locked_until = ?,
+                    attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE id = (
+                    SELECT id FROM ingestion_jobs
+                    WHERE (status = 'queued' AND (owner IS NULL OR owner = ? OR locked_until < ?))
+                       OR (status = 'processing' AND locked_until < ?)
+                    ORDER BY rowid
+                    LIMIT 1
+                )
+            ''', (claim_token, now + lease_seconds, owner, now, now))
+            conn.commit()
+            
+            cursor.execute('SELECT * FROM ingestion_jobs WHERE claim_token = ?', (claim_token,))
+            row = cursor.fetchone()
+        return self._ingestion_job_from_row(row) if row else None
+    
+    def update_ingestion_job_status(self, job_id, status, error=None, reserved_until=None):
+        """Record the outcome of processing an ingestion job"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                UPDATE ingestion_jobs
+                SET status = ?, error = ?, claim_token = NULL, locked_until = ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (status, error, reserved_until, job_id))
+    
+    def renew_ingestion_reservations(self, owner, job_ids, reserved_until):
+        """
+        Extend the reservation of an owner's queued jobs.
+        
+        Returns the current status of each job that exists, so the owner can tell
+        which of them were claimed or finished elsewhere.
+        """
+        if not job_ids:
+            return {}
+        placeholders = ','.join('?' * len(job_ids))
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f'''
+                UPDATE ingestion_jobs SET locked_until = ?
+                WHERE owner = ? AND status = 'queued' AND id IN ({placeholders})
+            ''', (reserved_until, owner, *job_ids))
+            conn.commit()
+            
+            cursor.execute(f'SELECT id, status FROM ingestion_jobs WHERE id IN ({placeholders})', tuple(job_ids))
+            statuses = dict(cursor.fetchall())
+        return statuses
+    
+    def _ingestion_job_from_row(self, row):
+        return {
+            'id': row[0],
+            'filename': row[1],
+            'candidate_name': row[2],
+            'candidate_email': row[3],
+            'file_path': row[4],
+            'status': row[5],
+            'error': row[6],
+            'attempts': row[7],
+            'created_at': row[10],
+            'updated_at': row[11],
+            'content_hash': row[12],
+            'owner': row[13]
+        }
+    
+    def get_ingestion_job(self, job_id):
+        """Get an ingestion job by resume id"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT * FROM ingestion_jobs WHERE id = ?', (job_id,))
+            row = cursor.fetchone()
+        return self._ingestion_job_from_row(row) if row else None
+    
+    def count_ingestion_jobs(self):
+        """Count ingestion jobs by status"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT status, COUNT(*) FROM ingestion_jobs GROUP BY status')
+            counts = dict(cursor.fetchall())
+        return counts
+    
+    # Document cache methods
+    def get_cached_document(self, content_hash, extractor_version):
+        """Get the extracted text and features cached for an uploaded file's content hash"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT text, features FROM document_cache
+                WHERE content_hash = ? AND extractor_version = ?
+            ''', (content_hash, extractor_version))
+            row = cursor.fetchone()
+        if row:
+            return {'text': row[0], 'features': json.loads(row[1]) if row[1] else None}
+        return None
+    
+    def cache_document(self, content_hash, extractor_version, text, features):
+        """Store the extracted text and features for an uploaded file's content hash"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT OR REPLACE INTO document_cache (content_hash, extractor_version, text, features)
+                VALUES (?, ?, ?, ?)
+            ''', (content_hash, extractor_version, text, json.dumps(features)))
+    
+    def prune_document_cache(self, extractor_version):
+        """Delete cached documents produced by other extractor versions"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('DELETE FROM document_cache WHERE extractor_version != ?', (extractor_version,))
+            deleted = cursor.rowcount
+        return deleted
+    
+    # Bulk ingestion methods
+    def start_bulk_ingest_run(self, run_id, source):
+        """Create a bulk ingestion run, or mark an interrupted one as running again"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT INTO bulk_ingest_runs (id, source) VALUES (?, ?)
+                ON CONFLICT (id) DO UPDATE SET status = 'running', error = NULL, updated_at = CURRENT_TIMESTAMP
+            ''', (run_id, source))
+        return run_id
+    
+    def update_bulk_ingest_run(self, run_id, status, error=None, total_items=None):
+        """Record the status of a bulk ingestion run and, once known, its item count"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                UPDATE bulk_ingest_runs
+                SET status = ?, error = ?, total_items = COALESCE(?, total_items), updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (status, error, total_items, run_id))
+    
+    def get_bulk_ingest_run(self, run_id):
+        """Get a bulk ingestion run with its progress counts"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT * FROM bulk_ingest_runs WHERE id = ?', (run_id,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            
+            cursor.execute('''
+                SELECT kind, status, COUNT(*) FROM bulk_ingest_items
+                WHERE run_id = ? GROUP BY kind, status
+            ''', (run_id,))
+            counts = cursor.fetchall()
+        return {
+            'id': row[0],
+            'source': row[1],
+            'status': row[2],
+            'total_items': row[3],
+            'error': row[4],
+            'created_at': row[5],
+            'updated_at': row[6],
+            'processed_items': sum(count for _, _, count in counts),
+            'failed_items': sum(count for _, status, count in counts if status == 'failed'),
+            'resumes': sum(count for kind, status, count in counts if kind == 'resume' and status == 'completed'),
+            'jobs': sum(count for kind, status, count in counts if kind == 'job' and status == 'completed')
+        }
+    
+    def get_bulk_ingest_item_keys(self, run_id):
+        """Get the keys of the items a bulk ingestion run already processed"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT item_key FROM bulk_ingest_items WHERE run_id = ?', (run_id,))
+            keys = {row[0] for row in cursor.fetchall()}
+        return keys
+    
+    def get_bulk_ingest_failures(self, run_id, limit=100):
+        """Get the items of a bulk ingestion run that failed, with the reason"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT item_key, error FROM bulk_ingest_items
+                WHERE run_id = ? AND status = 'failed'
+                ORDER BY rowid
+                LIMIT ?
+            ''', (run_id, limit))
+            failures = [{'item': row[0], 'error': row[1]} for row in cursor.fetchall()]
+        return failures
+    
+    def save_bulk_ingest_batch(self, run_id, resumes, jobs, items):
+        """
+        Insert a batch of resumes and job descriptions and record the items they came from.
+        
+        Everything is written in one transaction, so a resumed run never stores an item twice.
+        ``resumes`` and ``jobs`` are column tuples; ``items`` are
+        (item_key, kind, status, document_id, error) tuples.
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany('''
+                INSERT INTO resumes (id, filename, candidate_name, candidate_email, content, file_path)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [resume[:4] + (compress_text(resume[4]),) + resume[5:] for resume in resumes])
+            cursor.executemany('''
+                INSERT INTO job_descriptions (id, title, company, description, requirements, recruiter_name)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', jobs)
+            cursor.executemany('''
+                INSERT OR REPLACE INTO bulk_ingest_items (run_id, item_key, kind, status, document_id, error)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [(run_id, *item) for item in items])
+            cursor.execute('''
+                UPDATE bulk_ingest_runs SET updated_at = CURRENT_TIMESTAMP WHERE id = ?
+            ''', (run_id,))
+
+
+class AsyncDatabase:
+    """
+    Awaitable access to a ``Database`` for async callers.
+    
+    Every method of the wrapped database is available as a coroutine that runs
+    the call on a small thread pool, so SQLite I/O never blocks the event loop.
+    ``run`` does the same for any function that uses the database.
+    """
+    
+    def __init__(self, db, max_workers=DB_POOL_SIZE):
+        self.db = db
+        # At most one thread per pooled connection, so calls never open extra connections
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='db')
+    
+    async def run(self, func, *args, **kwargs):
+        """Run ``func(*args, **kwargs)`` on the database threads and return its result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+    
+    def __getattr__(self, name):
+        method = getattr(self.db, name)
+        if not callable(method):
+            return method
+        
+        async def call(*args, **kwargs):
+            return await self.run(method, *args, **kwargs)
+        return call
+    
+    def close(self):
+        """Wait for running calls and stop the database threads"""
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,199 @@
+"""
+Sandboxed document text extraction for the Resume Matcher.
+
+Malformed or adversarial PDFs and DOCX files can make the parsers spin or
+allocate without bound. Extraction therefore runs in a small pool of
+dedicated worker processes, each with a memory cap (``RLIMIT_AS`` where the
+platform supports it) and a wall-clock timeout per file. A worker that
+overruns is killed and replaced, and the caller gets the failure reason.
+
+Workers are started as ``python extraction_sandbox.py`` subprocesses that
+exchange pickled messages over stdin/stdout. Unlike multiprocessing's spawn
+start method this never re-imports the main module, which for ``python app.py``
+would load the NLP models in every worker.
+"""
+
+import os
+import pickle
+import queue
+import subprocess
+import sys
+import threading
+from typing import Callable, Optional, Union
+import io
+import logging
+
+from text_extraction import ExtractionError, extract_text, PDF_MAX_PAGES, PDF_MAX_CHARS
+
+try:
+    import resource
+except ImportError:  # Windows has no resource limits; timeouts still apply
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_main():
+    """Serve extraction requests from the parent until stdin closes"""
+    # Keep stdout for messages and send anything the parsers print to stderr
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    requests = sys.stdin.buffer
+
+    extractor, memory_limit, options = pickle.load(requests)
+    if resource is not None and memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    while True:
+        try:
+            source, filename = pickle.load(requests)
+        except EOFError:
+            return
+        try:
+            text = extractor(source, filename, **options)
+            response = ('ok', text)
+        except MemoryError:
+            response = ('memory', None)
+        except Exception as e:
+            response = ('error', f'Could not read the document: {str(e) or type(e).__name__}')
+        pickle.dump(response, channel)
+        channel.flush()
+        if response[0] == 'memory':
+            return  # The heap may be fragmented or half-built; let the parent replace us
+
+
+class _SandboxWorker:
+    def __init__(self, extractor, memory_limit, options):
+        self.process = subprocess.Popen([sys.executable, os.path.abspath(__file__)],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.responses = queue.Queue()
+        self.reader = threading.Thread(target=self._read, name='extraction-sandbox-reader', daemon=True)
+        self.reader.start()
+        self.jobs = 0
+        self.send((extractor, memory_limit, options))
+
+    def _read(self):
+        try:
+            while True:
+                self.responses.put(pickle.load(self.process.stdout))
+        except Exception:
+            # EOF: the process exited, was killed or wrote garbage
+            self.responses.put(('crash', None))
+
+    def send(self, message):
+        pickle.dump(message, self.process.stdin)
+        self.process.stdin.flush()
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def kill(self):
+        self.process.kill()
+        self.process.wait()
+        self.process.stdin.close()
+        self.process.stdout.close()
+
+
+class ExtractionSandbox:
+    """
+    Pool of extraction worker processes with per-file timeout and memory cap.
+
+    Workers are started on first use and replaced after a timeout, crash or
+    memory overrun, and after ``max_jobs_per_worker`` files to bound leaks.
+    ``extractor`` must be a module-level function so worker processes can import it.
+    """
+
+    def __init__(self, workers: int = 2, timeout: float = 30.0,
+                 memory_limit: Optional[int] = 512 * 1024 * 1024, max_jobs_per_worker: int = 200,
+                 max_pages: Optional[int] = PDF_MAX_PAGES, max_chars: Optional[int] = PDF_MAX_CHARS,
+                 include_tables: bool = False, extractor: Callable[..., str] = extract_text):
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.options = {'max_pages': max_pages, 'max_chars': max_chars, 'include_tables': include_tables}
+        self.extractor = extractor
+        self._idle = queue.Queue()
+        for _ in range(workers):
+            self._idle.put(None)  # Slot whose process is started on first use
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.timeouts = 0
+        self.memory_errors = 0
+        self.crashes = 0
+        self.recycled = 0
+
+    def extract(self, source: Union[str, bytes, io.IOBase], filename: Optional[str] = None) -> str:
+        """Extract text in a sandbox worker; raises ExtractionError with the reason on failure"""
+        if not isinstance(source, (str, bytes)):
+            source.seek(0)
+            source = source.read()
+
+        worker = self._idle.get()
+        try:
+            if worker is None or not worker.alive():
+                worker = _SandboxWorker(self.extractor, self.memory_limit, self.options)
+
+            try:
+                worker.send((source, filename))
+                status, value = worker.responses.get(timeout=self.timeout)
+            except queue.Empty:
+                self._count('timeouts')
+                worker = self._discard(worker)
+                raise ExtractionError(f'Text extraction timed out after {self.timeout:g} seconds')
+            except OSError:
+                status, value = 'crash', None
+
+            worker.jobs += 1
+            if status == 'crash':
+                # Killed by the kernel (e.g. out of memory) or crashed inside a C extension
+                self._count('crashes')
+                worker = self._discard(worker)
+                raise ExtractionError('Text extraction crashed while reading the document')
+            if status == 'memory':
+                self._count('memory_errors')
+                worker = self._discard(worker)
+                raise ExtractionError('Text extraction exceeded the memory limit')
+            if status == 'error':
+                raise ExtractionError(value)
+
+            self._count('completed')
+            if worker.jobs >= self.max_jobs_per_worker:
+                self._count('recycled')
+                worker = self._discard(worker)
+            return value
+        finally:
+            self._idle.put(worker)
+
+    def _discard(self, worker):
+        worker.kill()
+        return None
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def close(self):
+        """Stop all idle worker processes"""
+        for _ in range(self.workers):
+            worker = self._idle.get()
+            if worker is not None:
+                worker.kill()
+            self._idle.put(None)
+
+    def stats(self) -> dict:
+        """Return sandbox counters for monitoring"""
+        return {
+            'workers': self.workers,
+            'timeout': self.timeout,
+            'memory_limit': self.memory_limit if resource is not None else None,
+            'completed': self.completed,
+            'timeouts': self.timeouts,
+            'memory_errors': self.memory_errors,
+            'crashes': self.crashes,
+            'recycled': self.recycled
+        }
+
+
+if __name__ == "__main__":
+    _worker_main()
@@ -0,0 +1,209 @@
+"""
+Asynchronous resume ingestion for the Resume Matcher.
+
+Uploads are recorded in the durable ``ingestion_jobs`` table and processed by
+a pool of worker threads so the upload request returns at once. Jobs are
+claimed with a lease: if a worker process dies mid-job, the lease expires and
+any worker (in any process sharing the database) picks it up again.
+
+An upload can be handed over as an in-memory payload instead of a saved file.
+Its job is reserved for the queue holding the payload, which renews the
+reservation on a heartbeat while it waits; if that process dies, the
+reservation expires and the handler reports the upload as lost.
+"""
+
+import threading
+import time
+import uuid
+from typing import Any, Callable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionError(Exception):
+    """A permanent ingestion failure that should not be retried"""
+
+
+class IngestionQueue:
+    """
+    Worker pool draining the ``ingestion_jobs`` table.
+
+    ``handler(job)`` processes one job dict; ``job['payload']`` holds the
+    in-memory upload if this queue has it. ``on_drain()`` runs once the
+    queue is empty after jobs were processed, so expensive follow-up work
+    (refitting the corpus) is done once per burst instead of once per upload.
+    Reservations of buffered jobs are renewed every ``heartbeat_interval``
+    seconds (a third of the lease by default).
+    """
+
+    def __init__(self, db, handler: Callable[[dict], None], workers: int = 2,
+                 lease_seconds: float = 300.0, max_attempts: int = 3,
+                 poll_interval: float = 2.0, on_drain: Optional[Callable[[], None]] = None,
+                 heartbeat_interval: Optional[float] = None):
+        self.db = db
+        self.handler = handler
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.on_drain = on_drain
+        self.heartbeat_interval = heartbeat_interval or lease_seconds / 3
+        self._available = threading.Semaphore(0)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._heartbeat_thread = None
+        self._payloads = {}
+        self._claimed = set()  # Jobs this queue's workers are processing
+        self._active = 0
+        self._dirty = False
+        self.processed = 0
+        self.failed = 0
+        # Identifies this queue's process when reserving jobs whose payload it holds
+        self.owner = uuid.uuid4().hex
+
+    def enqueue(self, resume_id: str, filename: str, candidate_name: str,
+                candidate_email: str, file_path: Optional[str], payload: Any = None,
+                content_hash: Optional[str] = None) -> str:
+        """Record an upload for processing and wake a worker"""
+        if payload is None:
+            self.db.create_ingestion_job(resume_id, filename, candidate_name, candidate_email,
+                                         file_path, content_hash)
+        else:
+            self._payloads[resume_id] = payload
+            self.db.create_ingestion_job(resume_id, filename, candidate_name, candidate_email,
+                                         file_path, content_hash, owner=self.owner,
+                                         reserved_until=time.time() + self.lease_seconds)
+        self._available.release()
+        return resume_id
+
+    def status(self, resume_id: str) -> Optional[dict]:
+        """Return the ingestion job for a resume, or None if it was never queued"""
+        return self.db.get_ingestion_job(resume_id)
+
+    def process_next(self) -> bool:
+        """Claim and process one job; returns False if the queue was empty"""
+        # Claimed under the lock so renew_reservations never sees a claim it cannot attribute
+        with self._lock:
+            job = self.db.claim_ingestion_job(self.lease_seconds, self.owner)
+            if job is None:
+                return False
+            self._claimed.add(job['id'])
+            self._active += 1
+        job['payload'] = self._payloads.get(job['id'])
+
+        try:
+            self.handler(job)
+            self.db.update_ingestion_job_status(job['id'], 'completed')
+            self._release_payload(job['id'])
+            self.processed += 1
+            with self._lock:
+                self._dirty = True
+        except IngestionError as e:
+            self._fail(job, str(e))
+        except Exception as e:
+            logger.error(f"Error ingesting resume {job['id']} (attempt {job['attempts']}): {str(e)}")
+            if job['attempts'] >= self.max_attempts:
+                self._fail(job, 'Resume processing failed')
+            else:
+                # Keep the retry reserved for this queue while it holds the payload
+                self.db.update_ingestion_job_status(
+                    job['id'], 'queued', str(e),
+                    reserved_until=time.time() + self.lease_seconds if job['payload'] is not None else None
+                )
+        finally:
+            with self._lock:
+                self._claimed.discard(job['id'])
+                self._active -= 1
+        return True
+
+    def _fail(self, job: dict, error: str):
+        self.db.update_ingestion_job_status(job['id'], 'failed', error)
+        self._release_payload(job['id'])
+        self.failed += 1
+
+    def _release_payload(self, job_id: str):
+        payload = self._payloads.pop(job_id, None)
+        if payload is not None and hasattr(payload, 'close'):
+            payload.close()
+
+    def renew_reservations(self):
+        """
+        Extend the reservation of queued jobs whose payload this queue holds.
+        
+        Payloads of jobs claimed, completed or failed by another process are released.
+        """
+        with self._lock:
+            waiting = [job_id for job_id in self._payloads if job_id not in self._claimed]
+        if not waiting:
+            return
+        statuses = self.db.renew_ingestion_reservations(self.owner, waiting, time.time() + self.lease_seconds)
+        with self._lock:
+            for job_id in waiting:
+                # Jobs not recorded yet are still being enqueued
+                if statuses.get(job_id, 'queued') != 'queued' and job_id not in self._claimed:
+                    logger.warning(f"Ingestion job {job_id} was taken over by another process")
+                    self._release_payload(job_id)
+
+    def _heartbeat(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                self.renew_reservations()
+            except Exception as e:
+                logger.error(f"Error renewing ingestion reservations: {str(e)}")
+
+    def drain(self):
+        """Run ``on_drain`` if jobs completed since the last call and no worker is busy"""
+        with self._lock:
+            if not self._dirty or self._active:
+                return
+            self._dirty = False
+        if self.on_drain:
+            self.on_drain()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self.process_next():
+                    continue
+                self.drain()
+            except Exception as e:
+                logger.error(f"Error in ingestion worker: {str(e)}")
+            # Woken early by enqueue; the timeout picks up jobs queued by other processes
+            self._available.acquire(timeout=self.poll_interval)
+
+    def start(self):
+        """Start the worker threads and the reservation heartbeat"""
+        if any(thread.is_alive() for thread in self._threads):
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f'resume-ingestion-{i}', daemon=True)
+            for i in range(self.workers)
+        ]
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat, name='resume-ingestion-heartbeat',
+                                                  daemon=True)
+        for thread in self._threads + [self._heartbeat_thread]:
+            thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the worker threads after their current job"""
+        self._stop.set()
+        for _ in self._threads:
+            self._available.release()
+        for thread in self._threads:
+            thread.join(timeout)
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join(timeout)
+
+    def stats(self) -> dict:
+        """Return queue state for monitoring"""
+        return {
+            'workers': self.workers,
+            'running': sum(thread.is_alive() for thread in self._threads),
+            'jobs': self.db.count_ingestion_jobs(),
+            'buffered_payloads': len(self._payloads),
+            'processed': self.processed,
+            'failed': self.failed
+        }
@@ -1,6 +1,8 @@
 import sqlite3
 import json
 
+from database import decompress_text
+
 def inspect_database():
     """Inspect what's actually in the database"""
     
@@ -29,6 +31,7 @@ def inspect_database():
     resumes = cursor.fetchall()
     
     for i, (resume_id, name, filename, content) in enumerate(resumes, 1):
+        content = decompress_text(content)
         print(f"\n{i}. {name}")
         print(f"   ID: {resume_id}")
         print(f"   Filename: {filename}")
@@ -9,18 +9,45 @@ from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
 from collections import Counter
+import hashlib
+import threading
 import spacy
+from score_cache import ScoreCache, content_hash
 
 logger = logging.getLogger(__name__)
 
+# Bump when the scoring formula changes so cached scores are not reused
+SCORER_VERSION = '2'
+
+# Bump when preprocessing or skill extraction changes so cached document features are not reused
+FEATURES_VERSION = '1'
+
+# Individual similarity components combined into the final score
+COMPONENT_NAMES = ('tfidf_similarity', 'semantic_similarity', 'skill_similarity',
+                   'keyword_similarity', 'context_similarity')
+
+# Optional sections of the match details; ``get_match_details`` computes only those requested
+MATCH_DETAIL_SECTIONS = ('component_scores', 'skills_analysis', 'experience_analysis', 'recommendations')
+
+# Tokenizer and vocabulary cap used for section-level context similarity
+SECTION_MAX_FEATURES = 1000
+SECTION_ANALYZER = TfidfVectorizer(stop_words='english').build_analyzer()
+
 class ResumeMatcherNLP:
-    def __init__(self):
+    def __init__(self, score_cache=None):
         self.job_embeddings = {}
         self.resume_embeddings = {}
         self.job_texts = {}
         self.resume_texts = {}
         self.all_texts = []  # Store all texts for corpus-wide TF-IDF
+        self._corpus_texts = set()  # all_texts, for membership checks
         self.corpus_fitted = False
+        self.model_version = None  # Identifies the currently fitted vocabularies
+        self.score_cache = score_cache if score_cache is not None else ScoreCache()
+        self.document_skills = {}  # content hash -> extracted skills
+        # Held while the corpus or the fitted vectorizers change and while they are used,
+        # since ingestion, scoring and request threads share this processor
+        self.corpus_lock = threading.RLock()
         
         # Initialize models
         try:
@@ -214,26 +241,70 @@ class ResumeMatcherNLP:
             logger.error(f"Error extracting skills: {str(e)}")
             return []
 
+    def get_document_skills(self, text):
+        """Return the skills of a document, extracting them once per distinct text"""
+        text_hash = content_hash(text)
+        skills = self.document_skills.get(text_hash)
+        if skills is None:
+            skills = self.extract_skills(text)
+            self.document_skills[text_hash] = skills
+        return skills
+
     def fit_corpus_vectorizers(self):
         """Fit TF-IDF vectorizers on the entire corpus for better accuracy"""
-        try:
-            if len(self.all_texts) < 2:
-                logger.warning("Not enough texts to fit corpus vectorizers")
-                return
-            
-            logger.info(f"Fitting vectorizers on corpus of {len(self.all_texts)} documents")
-            
-            # Fit main TF-IDF vectorizer
-            self.tfidf_vectorizer.fit(self.all_texts)
-            
-            # Fit semantic vectorizer
-            self.semantic_vectorizer.fit(self.all_texts)
-            
-            self.corpus_fitted = True
-            logger.info("Corpus vectorizers fitted successfully")
-            
-        except Exception as e:
-            logger.error(f"Error fitting corpus vectorizers: {str(e)}")
+        with self.corpus_lock:
+            try:
+                if len(self.all_texts) < 2:
+                    logger.warning("Not enough texts to fit corpus vectorizers")
+                    return
+                
+                logger.info(f"Fitting vectorizers on corpus of {len(self.all_texts)} documents")
+                
+                # Fit main TF-IDF vectorizer
+                self.tfidf_vectorizer.fit(self.all_texts)
+                
+                # Fit semantic vectorizer
+                self.semantic_vectorizer.fit(self.all_texts)
+                
+                self.corpus_fitted = True
+                
+                # Scores depend on the fitted corpus, so a refit invalidates cached scores
+                self.model_version = self._compute_model_version()
+                self.score_cache.set_model_version(self.model_version)
+                logger.info("Corpus vectorizers fitted successfully")
+                
+            except Exception as e:
+                logger.error(f"Error fitting corpus vectorizers: {str(e)}")
+
+    def _compute_model_version(self):
+        """
+        Derive a version string from the fitted vocabularies and their IDF weights.
+        
+        Refitting the same corpus keeps the version, so stored and cached scores
+        stay current; any refit that changes a term or its weight changes it.
+        """
+        digest = hashlib.sha1(SCORER_VERSION.encode('utf-8'))
+        for vectorizer in (self.tfidf_vectorizer, self.semantic_vectorizer):
+            for term in sorted(vectorizer.vocabulary_):
+                digest.update(term.encode('utf-8') + b'\0')
+            digest.update(b'\1')
+            # Columns follow the sorted vocabulary, so idf_ lines up with the terms above
+            digest.update(np.asarray(vectorizer.idf_, dtype=np.float64).tobytes())
+        return digest.hexdigest()[:16]
+
+    def _score_cache_key(self, job_id, resume_id):
+        """Return the score cache key for a pair, or None if scores are not cacheable"""
+        if not self.corpus_fitted or self.model_version is None:
+            return None
+        return self.score_cache.make_key(
+            self.job_texts.get(job_id, ''), self.resume_texts.get(resume_id, ''), self.model_version
+        )
+
+    def prime_cached_score(self, job_id, resume_id, similarity_score):
+        """Seed the score cache with a score computed elsewhere for the current model version"""
+        cache_key = self._score_cache_key(job_id, resume_id)
+        if cache_key is not None:
+            self.score_cache.put(cache_key, 'score', similarity_score)
 
     def process_job_description(self, job_id, job_text):
         """Process and store job description"""
@@ -248,9 +319,11 @@ class ResumeMatcherNLP:
             self.job_embeddings[job_id] = processed_text
             
             # Add to corpus for vectorizer fitting
-            if processed_text not in self.all_texts:
-                self.all_texts.append(processed_text)
-                self.corpus_fitted = False  # Need to refit
+            with self.corpus_lock:
+                if processed_text not in self._corpus_texts:
+                    self._corpus_texts.add(processed_text)
+                    self.all_texts.append(processed_text)
+                    self.corpus_fitted = False  # Need to refit
             
             logger.info(f"Job description {job_id} processed successfully")
             
@@ -258,8 +331,15 @@ class ResumeMatcherNLP:
             logger.error(f"Error processing job description {job_id}: {str(e)}")
             raise
 
-    def process_resume(self, resume_id, resume_text):
-        """Process and store resume"""
+    def document_features(self, text):
+        """Derived per-document features that can be cached and passed back to process_resume"""
+        return {
+            'processed_text': self.preprocess_text(text),
+            'skills': self.get_document_skills(text)
+        }
+
+    def process_resume(self, resume_id, resume_text, features=None):
+        """Process and store resume, reusing precomputed `document_features` if given"""
         try:
             logger.info(f"Processing resume: {resume_id}")
             
@@ -267,13 +347,19 @@ class ResumeMatcherNLP:
             self.resume_texts[resume_id] = resume_text
             
             # Preprocess text
-            processed_text = self.preprocess_text(resume_text)
+            if features is not None:
+                processed_text = features['processed_text']
+                self.document_skills[content_hash(resume_text)] = features['skills']
+            else:
+                processed_text = self.preprocess_text(resume_text)
             self.resume_embeddings[resume_id] = processed_text
             
             # Add to corpus for vectorizer fitting
-            if processed_text not in self.all_texts:
-                self.all_texts.append(processed_text)
-                self.corpus_fitted = False  # Need to refit
+            with self.corpus_lock:
+                if processed_text not in self._corpus_texts:
+                    self._corpus_texts.add(processed_text)
+                    self.all_texts.append(processed_text)
+                    self.corpus_fitted = False  # Need to refit
             
             logger.info(f"Resume {resume_id} processed successfully")
             
@@ -292,62 +378,208 @@ class ResumeMatcherNLP:
             if not self.corpus_fitted and len(self.all_texts) >= 2:
                 self.fit_corpus_vectorizers()
             
-            # Get processed texts
-            job_text = self.job_embeddings[job_id]
-            resume_text = self.resume_embeddings[resume_id]
+            cache_key = self._score_cache_key(job_id, resume_id)
+            if cache_key is None:
+                return self._compute_similarity(job_id, resume_id)
+            return self.score_cache.get_or_compute(
+                cache_key, 'score', lambda: self._compute_similarity(job_id, resume_id)
+            )
             
-            # Calculate corpus-based TF-IDF similarity with fallback
+        except Exception as e:
+            logger.error(f"Error calculating similarity: {str(e)}")
+            return 0.0
+
+    def _compute_similarity(self, job_id, resume_id):
+        """Compute the weighted similarity for a pair, bypassing the score cache"""
+        tfidf_similarity = self.calculate_tfidf_similarity(job_id, resume_id)
+        
+        # Calculate additional similarity metrics
+        semantic_similarity = self.calculate_semantic_similarity(job_id, resume_id)
+        skill_similarity = self.calculate_skill_similarity(job_id, resume_id)
+        keyword_similarity = self.calculate_keyword_similarity(job_id, resume_id)
+        context_similarity = self.calculate_context_similarity(job_id, resume_id)
+        
+        return self._combine_similarity(tfidf_similarity, semantic_similarity, skill_similarity,
+                                        keyword_similarity, context_similarity)
+
+    def calculate_tfidf_similarity(self, job_id, resume_id):
+        """Calculate TF-IDF similarity of the preprocessed texts"""
+        # Get processed texts
+        job_text = self.job_embeddings[job_id]
+        resume_text = self.resume_embeddings[resume_id]
+        
+        # Calculate corpus-based TF-IDF similarity with fallback
+        with self.corpus_lock:
             if self.corpus_fitted:
                 try:
                     job_vector = self.tfidf_vectorizer.transform([job_text])
                     resume_vector = self.tfidf_vectorizer.transform([resume_text])
-                    tfidf_similarity = cosine_similarity(job_vector, resume_vector)[0][0]
+                    return cosine_similarity(job_vector, resume_vector)[0][0]
                 except Exception as e:
                     logger.warning(f"Corpus TF-IDF failed: {e}, using fallback")
-                    tfidf_similarity = self._fallback_text_similarity(job_text, resume_text)
+                    return self._fallback_text_similarity(job_text, resume_text)
             else:
                 # Fallback to pairwise TF-IDF
                 try:
                     texts = [job_text, resume_text]
                     tfidf_matrix = self.tfidf_vectorizer.fit_transform(texts)
-                    tfidf_similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+                    return cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
                 except Exception as e:
                     logger.warning(f"Pairwise TF-IDF failed: {e}, using fallback")
-                    tfidf_similarity = self._fallback_text_similarity(job_text, resume_text)
-            
-            # Calculate additional similarity metrics
-            semantic_similarity = self.calculate_semantic_similarity(job_id, resume_id)
-            skill_similarity = self.calculate_skill_similarity(job_id, resume_id)
-            keyword_similarity = self.calculate_keyword_similarity(job_id, resume_id)
-            context_similarity = self.calculate_context_similarity(job_id, resume_id)
-            
-            # Enhanced weighted combination with better balance
-            # If TF-IDF is very low, rely more on skills and keywords
-            if tfidf_similarity < 0.1:
-                final_similarity = (
-                    0.15 * tfidf_similarity +      # Reduced when TF-IDF fails
-                    0.40 * skill_similarity +      # Increased skill importance
-                    0.15 * semantic_similarity +   # Semantic understanding
-                    0.25 * keyword_similarity +    # Increased keyword importance
-                    0.05 * context_similarity      # Context and structure
+                    return self._fallback_text_similarity(job_text, resume_text)
+
+    def _combine_similarity(self, tfidf_similarity, semantic_similarity, skill_similarity,
+                            keyword_similarity, context_similarity):
+        """Weight the similarity components into the final match score"""
+        # Enhanced weighted combination with better balance
+        # If TF-IDF is very low, rely more on skills and keywords
+        if tfidf_similarity < 0.1:
+            final_similarity = (
+                0.15 * tfidf_similarity +      # Reduced when TF-IDF fails
+                0.40 * skill_similarity +      # Increased skill importance
+                0.15 * semantic_similarity +   # Semantic understanding
+                0.25 * keyword_similarity +    # Increased keyword importance
+                0.05 * context_similarity      # Context and structure
+            )
+        else:
+            final_similarity = (
+                0.30 * tfidf_similarity +      # Main content similarity
+                0.30 * skill_similarity +      # Skill matching (very important)
+                0.20 * semantic_similarity +   # Semantic understanding
+                0.15 * keyword_similarity +    # Important keyword matching
+                0.05 * context_similarity      # Context and structure
+            )
+        
+        # Apply non-linear transformation for better discrimination
+        final_similarity = self.apply_similarity_transformation(final_similarity)
+        return float(max(0.0, min(1.0, final_similarity)))
+
+    def calculate_similarity_matrix(self, job_ids, resume_ids, return_components=False):
+        """
+        Score every job against every resume in one batch.
+        
+        Returns a (len(job_ids), len(resume_ids)) array whose entries equal
+        calculate_similarity(job_id, resume_id). Vectors, skills, keywords and
+        sections are computed once per document instead of once per pair, and
+        cached scores are reused. With return_components=True a dict of
+        per-component arrays (see COMPONENT_NAMES) is returned as well.
+        """
+        scores = np.zeros((len(job_ids), len(resume_ids)))
+        components = {name: np.zeros_like(scores) for name in COMPONENT_NAMES}
+        result = (scores, components) if return_components else scores
+        if not job_ids or not resume_ids:
+            return result
+        
+        # Ensure vectorizers are fitted on corpus
+        if not self.corpus_fitted and len(self.all_texts) >= 2:
+            self.fit_corpus_vectorizers()
+        
+        # Collect pairs that are not cached yet
+        facet = 'components' if return_components else 'score'
+        pending = []
+        for j, job_id in enumerate(job_ids):
+            if job_id not in self.job_embeddings:
+                continue
+            for r, resume_id in enumerate(resume_ids):
+                if resume_id not in self.resume_embeddings:
+                    continue
+                cache_key = self._score_cache_key(job_id, resume_id)
+                cached = self.score_cache.get(cache_key, facet) if cache_key is not None else None
+                if cached is None:
+                    pending.append((j, r, cache_key))
+                elif return_components:
+                    scores[j, r] = cached['similarity_score']
+                    for name in COMPONENT_NAMES:
+                        components[name][j, r] = cached[name]
+                else:
+                    scores[j, r] = cached
+        
+        if not pending:
+            return result
+        
+        if not self.corpus_fitted:
+            # Without a fitted corpus every pair needs its own pairwise fit
+            for j, r, _ in pending:
+                self._fill_pair_components(scores, components, j, r, job_ids[j], resume_ids[r])
+            return result
+        
+        pending_jobs = sorted({j for j, _, _ in pending})
+        pending_resumes = sorted({r for _, r, _ in pending})
+        job_features = {j: self._document_features(self.job_texts.get(job_ids[j], ''), is_job=True)
+                        for j in pending_jobs}
+        resume_features = {r: self._document_features(self.resume_texts.get(resume_ids[r], ''))
+                           for r in pending_resumes}
+        
+        try:
+            # Both vectorizers are read from the same fit
+            with self.corpus_lock:
+                tfidf_matrix = cosine_similarity(
+                    self.tfidf_vectorizer.transform([self.job_embeddings[job_ids[j]] for j in pending_jobs]),
+                    self.tfidf_vectorizer.transform([self.resume_embeddings[resume_ids[r]] for r in pending_resumes])
                 )
+                semantic_matrix = np.clip(cosine_similarity(
+                    self.semantic_vectorizer.transform([self.job_texts.get(job_ids[j], '') for j in pending_jobs]),
+                    self.semantic_vectorizer.transform([self.resume_texts.get(resume_ids[r], '') for r in pending_resumes])
+                ), 0.0, 1.0)
+        except Exception as e:
+            logger.warning(f"Batch vectorization failed: {e}, scoring pairs individually")
+            for j, r, _ in pending:
+                self._fill_pair_components(scores, components, j, r, job_ids[j], resume_ids[r])
+            return result
+        
+        job_rows = {j: row for row, j in enumerate(pending_jobs)}
+        resume_columns = {r: column for column, r in enumerate(pending_resumes)}
+        
+        for j, r, cache_key in pending:
+            job = job_features[j]
+            resume = resume_features[r]
+            
+            pair = {'tfidf_similarity': float(tfidf_matrix[job_rows[j], resume_columns[r]])}
+            if not job['text'] or not resume['text']:
+                pair.update(semantic_similarity=0.0, skill_similarity=0.0,
+                            keyword_similarity=0.0, context_similarity=0.0)
             else:
-                final_similarity = (
-                    0.30 * tfidf_similarity +      # Main content similarity
-                    0.30 * skill_similarity +      # Skill matching (very important)
-                    0.20 * semantic_similarity +   # Semantic understanding
-                    0.15 * keyword_similarity +    # Important keyword matching
-                    0.05 * context_similarity      # Context and structure
-                )
-            
-            # Apply non-linear transformation for better discrimination
-            final_similarity = self.apply_similarity_transformation(final_similarity)
-            
-            return max(0.0, min(1.0, final_similarity))
+                pair['semantic_similarity'] = float(semantic_matrix[job_rows[j], resume_columns[r]])
+                pair['skill_similarity'] = self._skill_similarity_from_sets(
+                    job['skills'], resume['skills'], job['skill_weights'])
+                pair['keyword_similarity'] = self._keyword_similarity_from_sets(job['keywords'], resume['keywords'])
+                pair['context_similarity'] = float(self._context_similarity_from_sections(
+                    job['sections'], resume['sections']))
+            
+            pair['similarity_score'] = self._combine_similarity(
+                pair['tfidf_similarity'], pair['semantic_similarity'], pair['skill_similarity'],
+                pair['keyword_similarity'], pair['context_similarity']
+            )
+            scores[j, r] = pair['similarity_score']
+            for name in COMPONENT_NAMES:
+                components[name][j, r] = pair[name]
             
-        except Exception as e:
-            logger.error(f"Error calculating similarity: {str(e)}")
-            return 0.0
+            if cache_key is not None:
+                self.score_cache.put(cache_key, 'score', pair['similarity_score'])
+                self.score_cache.put(cache_key, 'components', pair)
+        
+        return result
+
+    def _fill_pair_components(self, scores, components, j, r, job_id, resume_id):
+        """Score a single pair into the batch result arrays"""
+        scores[j, r] = self.calculate_similarity(job_id, resume_id)
+        components['tfidf_similarity'][j, r] = self.calculate_tfidf_similarity(job_id, resume_id)
+        components['semantic_similarity'][j, r] = self.calculate_semantic_similarity(job_id, resume_id)
+        components['skill_similarity'][j, r] = self.calculate_skill_similarity(job_id, resume_id)
+        components['keyword_similarity'][j, r] = self.calculate_keyword_similarity(job_id, resume_id)
+        components['context_similarity'][j, r] = self.calculate_context_similarity(job_id, resume_id)
+
+    def _document_features(self, text, is_job=False):
+        """Per-document inputs to the pairwise similarity components"""
+        features = {'text': text, 'skills': set(), 'keywords': set(), 'sections': {}, 'skill_weights': {}}
+        if not text:
+            return features
+        features['skills'] = set(self.get_document_skills(text))
+        features['keywords'] = self.extract_important_keywords(text)
+        features['sections'] = self.section_terms(self.analyze_document_structure(text))
+        if is_job:
+            features['skill_weights'] = self.get_skill_weights(features['skills'])
+        return features
 
     def calculate_semantic_similarity(self, job_id, resume_id):
         """Calculate semantic similarity between texts using corpus-fitted vectorizer"""
@@ -360,9 +592,12 @@ class ResumeMatcherNLP:
             
             # Use corpus-fitted semantic vectorizer on raw texts
             try:
-                if self.corpus_fitted:
-                    job_vector = self.semantic_vectorizer.transform([job_text])
-                    resume_vector = self.semantic_vectorizer.transform([resume_text])
+                with self.corpus_lock:
+                    corpus_fitted = self.corpus_fitted
+                    if corpus_fitted:
+                        job_vector = self.semantic_vectorizer.transform([job_text])
+                        resume_vector = self.semantic_vectorizer.transform([resume_text])
+                if corpus_fitted:
                     similarity = cosine_similarity(job_vector, resume_vector)[0][0]
                 else:
                     # Always use fallback method for semantic similarity
@@ -395,41 +630,45 @@ class ResumeMatcherNLP:
     def calculate_keyword_similarity(self, job_id, resume_id):
         """Calculate similarity based on important keywords and phrases"""
         try:
-            job_text = self.job_texts.get(job_id, '').lower()
-            resume_text = self.resume_texts.get(resume_id, '').lower()
+            job_text = self.job_texts.get(job_id, '')
+            resume_text = self.resume_texts.get(resume_id, '')
             
             if not job_text or not resume_text:
                 return 0.0
             
-            # Important keywords for job matching
-            important_keywords = [
-                'experience', 'years', 'senior', 'junior', 'lead', 'manager',
-                'required', 'preferred', 'must', 'should', 'bachelor', 'master',
-                'degree', 'certification', 'remote', 'onsite', 'full-time', 'part-time'
-            ]
-            
-            job_keywords = set()
-            resume_keywords = set()
-            
-            for keyword in important_keywords:
-                if keyword in job_text:
-                    job_keywords.add(keyword)
-                if keyword in resume_text:
-                    resume_keywords.add(keyword)
-            
-            if not job_keywords:
-                return 0.5  # Neutral score if no important keywords found
-            
-            # Calculate Jaccard similarity for keywords
-            intersection = len(job_keywords.intersection(resume_keywords))
-            union = len(job_keywords.union(resume_keywords))
-            
-            return intersection / union if union > 0 else 0.0
+            return self._keyword_similarity_from_sets(
+                self.extract_important_keywords(job_text),
+                self.extract_important_keywords(resume_text)
+            )
             
         except Exception as e:
             logger.error(f"Error calculating keyword similarity: {str(e)}")
             return 0.0
 
+    def extract_important_keywords(self, text):
+        """Return the important job-matching keywords present in text"""
+        text = text.lower()
+        
+        # Important keywords for job matching
+        important_keywords = [
+            'experience', 'years', 'senior', 'junior', 'lead', 'manager',
+            'required', 'preferred', 'must', 'should', 'bachelor', 'master',
+            'degree', 'certification', 'remote', 'onsite', 'full-time', 'part-time'
+        ]
+        
+        return {keyword for keyword in important_keywords if keyword in text}
+
+    def _keyword_similarity_from_sets(self, job_keywords, resume_keywords):
+        """Jaccard similarity of two keyword sets"""
+        if not job_keywords:
+            return 0.5  # Neutral score if no important keywords found
+        
+        # Calculate Jaccard similarity for keywords
+        intersection = len(job_keywords.intersection(resume_keywords))
+        union = len(job_keywords.union(resume_keywords))
+        
+        return intersection / union if union > 0 else 0.0
+
     def calculate_context_similarity(self, job_id, resume_id):
         """Calculate similarity based on document structure and context"""
         try:
@@ -440,36 +679,70 @@ class ResumeMatcherNLP:
                 return 0.0
             
             # Analyze document structure
-            job_sections = self.analyze_document_structure(job_text)
-            resume_sections = self.analyze_document_structure(resume_text)
-            
-            # Compare section relevance
-            section_similarity = 0.0
-            total_sections = len(job_sections)
-            
-            if total_sections > 0:
-                for section, job_content in job_sections.items():
-                    if section in resume_sections:
-                        resume_content = resume_sections[section]
-                        if job_content and resume_content:
-                            # Quick TF-IDF on section content
-                            texts = [job_content, resume_content]
-                            vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
-                            try:
-                                vectors = vectorizer.fit_transform(texts)
-                                similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
-                                section_similarity += similarity
-                            except:
-                                pass
-                
-                section_similarity /= total_sections
+            job_sections = self.section_terms(self.analyze_document_structure(job_text))
+            resume_sections = self.section_terms(self.analyze_document_structure(resume_text))
             
-            return section_similarity
+            return self._context_similarity_from_sections(job_sections, resume_sections)
             
         except Exception as e:
             logger.error(f"Error calculating context similarity: {str(e)}")
             return 0.0
 
+    def section_terms(self, sections):
+        """Map each section to its content and term counts for context similarity"""
+        return {
+            section: (content, Counter(SECTION_ANALYZER(content)))
+            for section, content in sections.items()
+        }
+
+    def _context_similarity_from_sections(self, job_sections, resume_sections):
+        """Average TF-IDF similarity of matching document sections (see section_terms)"""
+        # Compare section relevance
+        section_similarity = 0.0
+        total_sections = len(job_sections)
+        
+        if total_sections > 0:
+            for section, (job_content, job_terms) in job_sections.items():
+                if section in resume_sections:
+                    resume_content, resume_terms = resume_sections[section]
+                    if job_content and resume_content:
+                        # Quick TF-IDF on section content
+                        section_similarity += self._pairwise_tfidf_similarity(
+                            job_content, job_terms, resume_content, resume_terms
+                        )
+            
+            section_similarity /= total_sections
+        
+        return section_similarity
+
+    def _pairwise_tfidf_similarity(self, text1, terms1, text2, terms2):
+        """
+        Cosine similarity of two texts under a TF-IDF model fitted on just those two.
+        
+        Equivalent to fitting TfidfVectorizer(stop_words='english', max_features=1000)
+        on [text1, text2], computed directly from term counts.
+        """
+        vocabulary = terms1.keys() | terms2.keys()
+        if not vocabulary:
+            return 0.0  # Empty vocabulary, nothing to compare
+        
+        if len(vocabulary) > SECTION_MAX_FEATURES:
+            # Feature selection applies, let scikit-learn pick the vocabulary
+            vectorizer = TfidfVectorizer(stop_words='english', max_features=SECTION_MAX_FEATURES)
+            vectors = vectorizer.fit_transform([text1, text2])
+            return cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
+        
+        # Smoothed IDF over two documents: shared terms get 1, unique terms 1 + ln(3/2)
+        unique_idf = 1.0 + np.log(1.5)
+        common = terms1.keys() & terms2.keys()
+        norm1 = np.sqrt(sum((count * (1.0 if term in common else unique_idf)) ** 2
+                            for term, count in terms1.items()))
+        norm2 = np.sqrt(sum((count * (1.0 if term in common else unique_idf)) ** 2
+                            for term, count in terms2.items()))
+        if norm1 == 0 or norm2 == 0:
+            return 0.0
+        return sum(terms1[term] * terms2[term] for term in common) / (norm1 * norm2)
+
     def analyze_document_structure(self, text):
         """Analyze document structure to identify sections"""
         sections = {}
@@ -545,39 +818,42 @@ class ResumeMatcherNLP:
             if not job_text or not resume_text:
                 return 0.0
             
-            job_skills = set(self.extract_skills(job_text))
-            resume_skills = set(self.extract_skills(resume_text))
-            
-            if not job_skills:
-                return 0.0
+            job_skills = set(self.get_document_skills(job_text))
+            resume_skills = set(self.get_document_skills(resume_text))
             
-            # Enhanced skill matching with priority weights
-            skill_weights = self.get_skill_weights(job_skills)
-            
-            # Calculate weighted skill similarity
-            matched_weight = 0.0
-            total_weight = sum(skill_weights.values())
-            
-            for skill in job_skills:
-                if skill in resume_skills:
-                    matched_weight += skill_weights.get(skill, 1.0)
-            
-            weighted_similarity = matched_weight / total_weight if total_weight > 0 else 0.0
-            
-            # Also calculate traditional Jaccard similarity
-            intersection = len(job_skills.intersection(resume_skills))
-            union = len(job_skills.union(resume_skills))
-            jaccard_similarity = intersection / union if union > 0 else 0.0
-            
-            # Combine weighted and Jaccard similarities
-            final_skill_similarity = 0.7 * weighted_similarity + 0.3 * jaccard_similarity
-            
-            return final_skill_similarity
+            return self._skill_similarity_from_sets(job_skills, resume_skills)
             
         except Exception as e:
             logger.error(f"Error calculating skill similarity: {str(e)}")
             return 0.0
 
+    def _skill_similarity_from_sets(self, job_skills, resume_skills, skill_weights=None):
+        """Weighted and Jaccard skill overlap of two skill sets"""
+        if not job_skills:
+            return 0.0
+        
+        # Enhanced skill matching with priority weights
+        if skill_weights is None:
+            skill_weights = self.get_skill_weights(job_skills)
+        
+        # Calculate weighted skill similarity
+        matched_weight = 0.0
+        total_weight = sum(skill_weights.values())
+        
+        for skill in job_skills:
+            if skill in resume_skills:
+                matched_weight += skill_weights.get(skill, 1.0)
+        
+        weighted_similarity = matched_weight / total_weight if total_weight > 0 else 0.0
+        
+        # Also calculate traditional Jaccard similarity
+        intersection = len(job_skills.intersection(resume_skills))
+        union = len(job_skills.union(resume_skills))
+        jaccard_similarity = intersection / union if union > 0 else 0.0
+        
+        # Combine weighted and Jaccard similarities
+        return 0.7 * weighted_similarity + 0.3 * jaccard_similarity
+
     def get_skill_weights(self, skills):
         """Assign weights to skills based on their importance and rarity"""
         weights = {}
@@ -606,8 +882,14 @@ class ResumeMatcherNLP:
         
         return weights
 
-    def get_match_details(self, job_id, resume_id):
-        """Get comprehensive match information with detailed analysis"""
+    def get_match_details(self, job_id, resume_id, sections=None):
+        """
+        Get comprehensive match information with detailed analysis.
+        
+        ``sections`` limits the optional parts (see MATCH_DETAIL_SECTIONS) that are
+        computed; the others are left out. Partial details are not cached, but are
+        taken from fully cached details when present.
+        """
         try:
             job_text = self.job_texts.get(job_id, '')
             resume_text = self.resume_texts.get(resume_id, '')
@@ -615,38 +897,65 @@ class ResumeMatcherNLP:
             if not job_text or not resume_text:
                 return {}
             
-            job_skills = self.extract_skills(job_text)
-            resume_skills = self.extract_skills(resume_text)
+            # Ensure the model version is current before looking up cached details
+            if not self.corpus_fitted and len(self.all_texts) >= 2:
+                self.fit_corpus_vectorizers()
+            
+            partial = sections is not None and not set(MATCH_DETAIL_SECTIONS) <= set(sections)
+            cache_key = self._score_cache_key(job_id, resume_id)
+            if partial:
+                cached = self.score_cache.get(cache_key, 'details') if cache_key is not None else None
+                if cached is None:
+                    return self._compute_match_details(job_id, resume_id, sections)
+                return {key: value for key, value in cached.items()
+                        if key not in MATCH_DETAIL_SECTIONS or key in sections}
+            if cache_key is None:
+                return self._compute_match_details(job_id, resume_id)
+            return self.score_cache.get_or_compute(
+                cache_key, 'details', lambda: self._compute_match_details(job_id, resume_id)
+            )
+            
+        except Exception as e:
+            logger.error(f"Error getting match details: {str(e)}")
+            return {}
+
+    def _compute_match_details(self, job_id, resume_id, sections=MATCH_DETAIL_SECTIONS):
+        """Build the detailed match analysis for a pair, bypassing the score cache"""
+        job_text = self.job_texts.get(job_id, '')
+        resume_text = self.resume_texts.get(resume_id, '')
+        
+        overall_similarity = self.calculate_similarity(job_id, resume_id)
+        details = {
+            'overall_similarity': overall_similarity,
+            'match_strength': self.categorize_match_strength(overall_similarity)
+        }
+        
+        if 'component_scores' in sections:
+            # Calculate individual similarity components
+            details['component_scores'] = {
+                # The raw TF-IDF cosine, as stored in match_scores, not the overall score
+                'tfidf_similarity': float(self.calculate_tfidf_similarity(job_id, resume_id)),
+                'semantic_similarity': self.calculate_semantic_similarity(job_id, resume_id),
+                'skill_similarity': self.calculate_skill_similarity(job_id, resume_id),
+                'keyword_similarity': self.calculate_keyword_similarity(job_id, resume_id),
+                'context_similarity': self.calculate_context_similarity(job_id, resume_id)
+            }
+        
+        if 'skills_analysis' in sections or 'recommendations' in sections:
+            job_skills = self.get_document_skills(job_text)
+            resume_skills = self.get_document_skills(resume_text)
             
             matched_skills = list(set(job_skills).intersection(set(resume_skills)))
             missing_skills = list(set(job_skills) - set(resume_skills))
             extra_skills = list(set(resume_skills) - set(job_skills))
             
-            # Calculate individual similarity components
-            tfidf_sim = self.calculate_similarity(job_id, resume_id)
-            semantic_sim = self.calculate_semantic_similarity(job_id, resume_id)
-            skill_sim = self.calculate_skill_similarity(job_id, resume_id)
-            keyword_sim = self.calculate_keyword_similarity(job_id, resume_id)
-            context_sim = self.calculate_context_similarity(job_id, resume_id)
-            
             # Analyze skill importance
             skill_weights = self.get_skill_weights(job_skills)
             high_priority_matched = [s for s in matched_skills if skill_weights.get(s, 1.0) >= 2.5]
             high_priority_missing = [s for s in missing_skills if skill_weights.get(s, 1.0) >= 2.5]
             
-            # Calculate experience level match (if extractable)
-            experience_match = self.calculate_experience_match(job_text, resume_text)
-            
-            return {
-                'overall_similarity': tfidf_sim,
-                'component_scores': {
-                    'tfidf_similarity': tfidf_sim,
-                    'semantic_similarity': semantic_sim,
-                    'skill_similarity': skill_sim,
-                    'keyword_similarity': keyword_sim,
-                    'context_similarity': context_sim
-                },
-                'skills_analysis': {
+            if 'skills_analysis' in sections:
+                details['skills_analysis'] = {
                     'job_skills': job_skills,
                     'resume_skills': resume_skills,
                     'matched_skills': matched_skills,
@@ -656,15 +965,16 @@ class ResumeMatcherNLP:
                     'high_priority_missing': high_priority_missing,
                     'skill_match_ratio': len(matched_skills) / len(job_skills) if job_skills else 0,
                     'skill_coverage': len(matched_skills) / len(set(job_skills + resume_skills)) if (job_skills or resume_skills) else 0
-                },
-                'experience_analysis': experience_match,
-                'match_strength': self.categorize_match_strength(tfidf_sim),
-                'recommendations': self.generate_recommendations(matched_skills, missing_skills, high_priority_missing)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting match details: {str(e)}")
-            return {}
+                }
+            if 'recommendations' in sections:
+                details['recommendations'] = self.generate_recommendations(matched_skills, missing_skills,
+                                                                           high_priority_missing)
+        
+        if 'experience_analysis' in sections:
+            # Calculate experience level match (if extractable)
+            details['experience_analysis'] = self.calculate_experience_match(job_text, resume_text)
+        
+        return details
 
     def calculate_experience_match(self, job_text, resume_text):
         """Extract and compare experience requirements"""
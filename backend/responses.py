@@ -0,0 +1,244 @@
+"""
+Response encoding for the Resume Matcher API.
+
+Match responses carry thousands of nested results. This module serializes
+them with orjson when it is installed (NumPy scalars and arrays included),
+lets clients ask for MessagePack with ``Accept: application/msgpack`` and
+compresses bodies above ``RESPONSE_COMPRESS_MIN_BYTES`` with brotli or gzip,
+whichever the client accepts. orjson, msgpack and brotli are optional; without
+them responses fall back to the standard library's json and gzip.
+
+Read endpoints wrapped with ``versioned`` get a strong ETag built from the data
+version and the negotiated representation, answer ``If-None-Match`` with 304
+before the view runs, and are served from a short-lived cache keyed by version.
+Only the version lookup runs for a 304; Database.get_data_version answers it
+from memory after one ``PRAGMA data_version`` unless something was written.
+"""
+
+import datetime
+import functools
+import gzip
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from flask import Response, make_response, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+RESPONSE_COMPRESS_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESS_MIN_BYTES', 1024))  # smaller bodies are sent as is
+RESPONSE_GZIP_LEVEL = int(os.environ.get('RESPONSE_GZIP_LEVEL', 6))
+RESPONSE_BROTLI_QUALITY = int(os.environ.get('RESPONSE_BROTLI_QUALITY', 5))  # 11 is far slower for little gain
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/msgpack', 'application/x-ndjson', 'text/plain',
+                          'text/html', 'text/csv'}
+
+RESPONSE_CACHE_TTL = float(os.environ.get('RESPONSE_CACHE_TTL', 5))  # seconds a rendered response is reused (0 disables)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 256))
+
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+
+def to_builtin(value: Any) -> Any:
+    """Convert values the encoders cannot serialize natively; raises TypeError for anything else"""
+    if np is not None:
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not serializable')
+
+
+def dumps_json(payload: Any) -> bytes:
+    """Serialize a payload to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=to_builtin,
+                           option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, default=to_builtin, separators=(',', ':')).encode('utf-8')
+
+
+def dumps_msgpack(payload: Any) -> bytes:
+    """Serialize a payload to MessagePack bytes"""
+    return msgpack.packb(payload, default=to_builtin, use_bin_type=True)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backing ``jsonify`` with ``dumps_json``"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps_json(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s) if orjson is not None else json.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        payload = self._prepare_response_obj(args, kwargs)
+        return Response(dumps_json(payload), mimetype=self.mimetype)
+
+
+def wants_msgpack(accept_mimetypes=None) -> bool:
+    """Whether MessagePack is installed and preferred by the accepted media types (default: the request's)"""
+    if accept_mimetypes is None:
+        accept_mimetypes = request.accept_mimetypes
+    return msgpack is not None and accept_mimetypes.best_match(
+        ['application/json', MSGPACK_MIMETYPE], default='application/json') == MSGPACK_MIMETYPE
+
+
+def api_response(payload: Any, status: int = 200) -> Response:
+    """Respond with JSON, or MessagePack if the client asks for it and msgpack is installed"""
+    if wants_msgpack():
+        response = Response(dumps_msgpack(payload), status=status, mimetype=MSGPACK_MIMETYPE)
+    else:
+        response = Response(dumps_json(payload), status=status, mimetype='application/json')
+    response.vary.add('Accept')
+    return response
+
+
+def accepted_encoding(accept_encodings=None) -> str:
+    """The content encoding to use for the accepted encodings (default: the request's), or None"""
+    if accept_encodings is None:
+        accept_encodings = request.accept_encodings
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """Compress a response body with 'br' or 'gzip'"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=RESPONSE_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL, mtime=0)
+
+
+def compress_response(response: Response) -> Response:
+    """Compress a buffered response body in the best encoding the client accepts"""
+    if response.direct_passthrough or response.is_streamed or response.status_code < 200 \
+            or response.status_code in (204, 206, 304) or 'Content-Encoding' in response.headers \
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add('Accept-Encoding')
+
+    body = response.get_data()
+    if len(body) < RESPONSE_COMPRESS_MIN_BYTES:
+        return response
+    encoding = accepted_encoding()
+    if encoding is None:
+        return response
+
+    response.set_data(compress_body(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app):
+    """Use the fast JSON provider for ``jsonify`` and compress the app's responses"""
+    app.json = FastJSONProvider(app)
+    app.after_request(compress_response)
+
+
+class ResponseCache:
+    """Rendered responses by key, each reused for ``ttl`` seconds, least recently used evicted first"""
+
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+RESPONSE_CACHE = ResponseCache()
+
+
+def versioned(get_version: Callable[[], Any], cache: ResponseCache = RESPONSE_CACHE):
+    """
+    Decorate a read view whose response only depends on the request and ``get_version()``.
+    
+    The ETag names the version and the representation (media type and content
+    encoding), so compressed and uncompressed bodies never share a tag. A request
+    whose ``If-None-Match`` has the current tag gets a 304 without running the
+    view; otherwise the rendered, compressed response is reused from ``cache``
+    while the version is unchanged. Only 200 responses are tagged and cached.
+    ``get_version()`` runs on every request, so it must be cheap and must change
+    with everything the response depends on.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            version = get_version()
+            encoding = accepted_encoding() or 'identity'
+            media = 'msgpack' if wants_msgpack() else 'json'
+            etag = f'{version}-{media}-{encoding}'
+
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+                response.set_etag(etag)
+                response.vary.update(('Accept', 'Accept-Encoding'))
+                return response
+
+            key = (request.full_path, media, encoding, version)
+            cached = cache.get(key)
+            if cached is not None:
+                body, headers = cached
+                return Response(body, status=200, headers=headers)
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            response = compress_response(response)
+            response.set_etag(etag)
+            response.vary.update(('Accept', 'Accept-Encoding'))
+            cache.set(key, (response.get_data(), list(response.headers.items())))
+            return response
+        return wrapper
+    return decorator
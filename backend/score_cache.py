@@ -0,0 +1,470 @@
+"""
+Score cache for the Resume Matcher.
+
+Caches (job, resume) scoring results keyed by the content hash of both
+documents and the version of the fitted model, so unchanged pairs are not
+re-scored on every dashboard load or match request.
+
+Results are kept in an in-process LRU and, optionally, in a shared backend
+(see ``SQLiteCacheBackend``) so that all worker processes on a host reuse
+each other's scores. Because keys are content-addressed and versioned, a
+cached value never goes stale and needs no cross-process invalidation.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text: str) -> str:
+    """Return a stable hash of a document's text"""
+    return hashlib.sha1((text or '').encode('utf-8')).hexdigest()
+
+
+def _json_default(value):
+    """Serialize NumPy scalars and arrays that end up in match results"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+def _serialize(value: Any) -> str:
+    return json.dumps(value, default=_json_default)
+
+
+def _estimate_size(value: Any) -> int:
+    """Rough size in bytes of a cached value"""
+    try:
+        return len(_serialize(value))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class MemoryCacheBackend:
+    """In-process LRU bounded by entry count and/or approximate bytes"""
+
+    def __init__(self, max_entries: Optional[int] = 10000, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key: str, value: Any, model_version: str):
+        size = _estimate_size(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._total_bytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until within the configured limits"""
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries) or
+            (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+        ):
+            key, _ = self._entries.popitem(last=False)
+            self._total_bytes -= self._sizes.pop(key, 0)
+            self.evictions += 1
+
+    def acquire_lease(self, key: str, ttl: float) -> bool:
+        # In-process callers are already coordinated by ScoreCache
+        return True
+
+    def release_lease(self, key: str):
+        pass
+
+    def invalidate(self, model_version: str):
+        # Every key embeds the model version, so nothing cached remains reachable
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions
+            }
+
+
+class SQLiteCacheBackend:
+    """
+    Cache shared by all processes on a host, stored in a SQLite file in WAL mode.
+
+    Eviction is approximately LRU: access times are refreshed at most once per
+    ``touch_interval`` seconds to avoid a write on every hit, and entries from
+    outdated model versions are evicted before current ones.
+    """
+
+    def __init__(self, db_path: str, max_entries: Optional[int] = 100000,
+                 max_bytes: Optional[int] = 256 * 1024 * 1024, touch_interval: float = 30.0,
+                 eviction_check_interval: int = 100):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.eviction_check_interval = eviction_check_interval
+        self.model_version = None
+        self.evictions = 0
+        self._writes_since_check = 0
+        self._local = threading.local()
+        self._init_database()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection to the cache file"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_database(self):
+        """Create the cache tables if they don't exist"""
+        conn = self._connection()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS score_cache (
+                cache_key TEXT PRIMARY KEY,
+                model_version TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_score_cache_last_access ON score_cache (last_access)')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS score_cache_leases (
+                cache_key TEXT PRIMARY KEY,
+                expires_at REAL NOT NULL
+            )
+        ''')
+
+    def get(self, key: str) -> Optional[Any]:
+        conn = self._connection()
+        row = conn.execute('SELECT value, last_access FROM score_cache WHERE cache_key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[1] > self.touch_interval:
+            conn.execute('UPDATE score_cache SET last_access = ? WHERE cache_key = ?', (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, model_version: str):
+        payload = _serialize(value)
+        conn = self._connection()
+        conn.execute('''
+            INSERT OR REPLACE INTO score_cache (cache_key, model_version, value, size, last_access)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (key, model_version, payload, len(payload), time.time()))
+
+        self._writes_since_check += 1
+        if self._writes_since_check >= self.eviction_check_interval:
+            self._writes_since_check = 0
+            self._evict()
+
+    def _evict(self):
+        """Trim the cache to 90% of its limits, oldest model versions first"""
+        conn = self._connection()
+        count, total_bytes = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM score_cache').fetchone()
+        over_entries = self.max_entries is not None and count > self.max_entries
+        over_bytes = self.max_bytes is not None and total_bytes > self.max_bytes
+        if not (over_entries or over_bytes):
+            return
+
+        target_entries = int(self.max_entries * 0.9) if self.max_entries is not None else count
+        target_bytes = int(self.max_bytes * 0.9) if self.max_bytes is not None else total_bytes
+        victims = []
+        remaining_entries, remaining_bytes = count, total_bytes
+        rows = conn.execute('''
+            SELECT cache_key, size FROM score_cache
+            ORDER BY (model_version = ?) ASC, last_access ASC
+        ''', (self.model_version or '',))
+        for cache_key, size in rows:
+            if remaining_entries <= target_entries and remaining_bytes <= target_bytes:
+                break
+            victims.append((cache_key,))
+            remaining_entries -= 1
+            remaining_bytes -= size
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany('DELETE FROM score_cache WHERE cache_key = ?', victims)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        self.evictions += len(victims)
+
+    def acquire_lease(self, key: str, ttl: float) -> bool:
+        """Try to become the only process computing ``key``"""
+        conn = self._connection()
+        now = time.time()
+        conn.execute('DELETE FROM score_cache_leases WHERE cache_key = ? AND expires_at < ?', (key, now))
+        cursor = conn.execute('INSERT OR IGNORE INTO score_cache_leases (cache_key, expires_at) VALUES (?, ?)',
+                              (key, now + ttl))
+        return cursor.rowcount == 1
+
+    def release_lease(self, key: str):
+        self._connection().execute('DELETE FROM score_cache_leases WHERE cache_key = ?', (key,))
+
+    def invalidate(self, model_version: str):
+        # Other workers may still be on the previous version, so old entries
+        # are left in place and simply evicted first
+        self.model_version = model_version
+
+    def clear(self):
+        conn = self._connection()
+        conn.execute('DELETE FROM score_cache')
+        conn.execute('DELETE FROM score_cache_leases')
+
+    def stats(self) -> Dict[str, Any]:
+        count, total_bytes = self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM score_cache'
+        ).fetchone()
+        return {
+            'backend': 'sqlite',
+            'path': self.db_path,
+            'entries': count,
+            'bytes': total_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'evictions': self.evictions
+        }
+
+
+class ScoreCache:
+    """
+    Thread-safe cache for match scores.
+
+    Keys are ``(job_hash, resume_hash, model_version)`` tuples; each key holds
+    independent facets of the result (e.g. ``score`` and ``details``). Lookups
+    go to an in-process LRU first and then to the optional shared ``backend``.
+    ``get_or_compute`` guards against stampedes: concurrent misses for the same
+    key, in this process or in other workers sharing the backend, wait for a
+    single computation instead of repeating it.
+    """
+
+    def __init__(self, max_entries: Optional[int] = 10000, max_bytes: Optional[int] = None,
+                 backend=None, lease_ttl: float = 30.0, lease_wait: float = 10.0):
+        self.local = MemoryCacheBackend(max_entries=max_entries, max_bytes=max_bytes)
+        self.backend = backend
+        self.lease_ttl = lease_ttl
+        self.lease_wait = lease_wait
+        self.model_version = None
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def evictions(self):
+        return self.local.evictions
+
+    def make_key(self, job_text: str, resume_text: str, model_version: str) -> Tuple[str, str, str]:
+        """Build a cache key from the two documents and the model version"""
+        return (content_hash(job_text), content_hash(resume_text), model_version)
+
+    @staticmethod
+    def _flat_key(key: Tuple[str, str, str], facet: str) -> str:
+        return ':'.join(key) + ':' + facet
+
+    def set_model_version(self, model_version: str):
+        """Record the current model version, invalidating the cache if it changed"""
+        with self._lock:
+            if model_version == self.model_version:
+                return
+            if len(self.local):
+                logger.info(f"Model version changed to {model_version}, "
+                            f"invalidating {len(self.local)} cached scores")
+                self.invalidations += 1
+            self.model_version = model_version
+        self.local.invalidate(model_version)
+        if self.backend is not None:
+            self.backend.invalidate(model_version)
+
+    def get(self, key: Tuple[str, str, str], facet: str) -> Optional[Any]:
+        """Return a cached facet for ``key``, or None on a miss"""
+        value = self._lookup(key, facet)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def _lookup(self, key: Tuple[str, str, str], facet: str) -> Optional[Any]:
+        flat_key = self._flat_key(key, facet)
+        value = self.local.get(flat_key)
+        if value is not None or self.backend is None:
+            return value
+        try:
+            value = self.backend.get(flat_key)
+        except sqlite3.Error as e:
+            logger.warning(f"Shared score cache read failed: {str(e)}")
+            return None
+        if value is not None:
+            with self._lock:
+                self.shared_hits += 1
+            self.local.set(flat_key, value, key[2])
+        return value
+
+    def put(self, key: Tuple[str, str, str], facet: str, value: Any):
+        """Store a facet for ``key`` in the local and shared caches"""
+        if key[2] != self.model_version:
+            # Result was computed against an outdated model
+            return
+        flat_key = self._flat_key(key, facet)
+        self.local.set(flat_key, value, key[2])
+        if self.backend is not None:
+            try:
+                self.backend.set(flat_key, value, key[2])
+            except sqlite3.Error as e:
+                logger.warning(f"Shared score cache write failed: {str(e)}")
+
+    def get_or_compute(self, key: Tuple[str, str, str], facet: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached facet for ``key``, computing it at most once on a miss"""
+        value = self.get(key, facet)
+        if value is not None:
+            return value
+
+        flat_key = self._flat_key(key, facet)
+        with self._lock:
+            event = self._inflight.get(flat_key)
+            owner = event is None
+            if owner:
+                event = threading.Event()
+                self._inflight[flat_key] = event
+
+        if not owner:
+            # Another thread in this process is computing the same result
+            event.wait(self.lease_wait)
+            value = self._lookup(key, facet)
+            return value if value is not None else compute()
+
+        try:
+            leased = self._acquire_shared_lease(flat_key)
+            if not leased:
+                value = self._wait_for_shared(key, facet)
+                if value is not None:
+                    return value
+            try:
+                value = compute()
+                if value is not None:
+                    self.put(key, facet, value)
+                return value
+            finally:
+                if leased and self.backend is not None:
+                    self._release_shared_lease(flat_key)
+        finally:
+            with self._lock:
+                self._inflight.pop(flat_key, None)
+            event.set()
+
+    def _acquire_shared_lease(self, flat_key: str) -> bool:
+        if self.backend is None:
+            return True
+        try:
+            return self.backend.acquire_lease(flat_key, self.lease_ttl)
+        except sqlite3.Error as e:
+            logger.warning(f"Shared score cache lease failed: {str(e)}")
+            return True
+
+    def _release_shared_lease(self, flat_key: str):
+        try:
+            self.backend.release_lease(flat_key)
+        except sqlite3.Error as e:
+            logger.warning(f"Shared score cache lease release failed: {str(e)}")
+
+    def _wait_for_shared(self, key: Tuple[str, str, str], facet: str) -> Optional[Any]:
+        """Poll the shared backend while another worker computes the result"""
+        deadline = time.time() + self.lease_wait
+        delay = 0.01
+        while time.time() < deadline:
+            time.sleep(delay)
+            value = self._lookup(key, facet)
+            if value is not None:
+                return value
+            delay = min(delay * 2, 0.2)
+        return None
+
+    def clear(self):
+        """Remove all cached entries"""
+        self.local.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters for monitoring"""
+        local_stats = self.local.stats()
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                'entries': local_stats['entries'],
+                'bytes': local_stats['bytes'],
+                'max_entries': local_stats['max_entries'],
+                'max_bytes': local_stats['max_bytes'],
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'evictions': local_stats['evictions'],
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'model_version': self.model_version
+            }
+        if self.backend is not None:
+            try:
+                stats['shared'] = self.backend.stats()
+            except sqlite3.Error as e:
+                stats['shared'] = {'error': str(e)}
+        return stats
+
+
+def create_score_cache(backend: str = 'memory', path: Optional[str] = None,
+                       max_entries: Optional[int] = 10000, max_bytes: Optional[int] = None,
+                       shared_max_entries: Optional[int] = 100000,
+                       shared_max_bytes: Optional[int] = 256 * 1024 * 1024) -> ScoreCache:
+    """Build a score cache for the configured backend ('memory' or 'sqlite')"""
+    shared = None
+    if backend == 'sqlite':
+        if not path:
+            raise ValueError("A cache file path is required for the sqlite backend")
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        shared = SQLiteCacheBackend(path, max_entries=shared_max_entries, max_bytes=shared_max_bytes)
+    elif backend != 'memory':
+        raise ValueError(f"Unknown score cache backend: {backend}")
+    return ScoreCache(max_entries=max_entries, max_bytes=max_bytes, backend=shared)
@@ -0,0 +1,217 @@
+"""
+Materialized job x resume scores for the Resume Matcher.
+
+Keeps the ``match_scores`` table up to date so read endpoints can look up
+scores with an indexed query instead of running the NLP scorer on demand.
+New jobs and resumes are scored against the whole corpus as they arrive, and
+a background sweep rescores rows left behind by a model version change.
+"""
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreMaterializer:
+    """
+    Maintains the ``match_scores`` table for an NLP processor.
+
+    Work is done on a single background thread: ``score_job`` and
+    ``score_resume`` queue incremental updates, and every wake-up ends with a
+    sweep over pairs whose stored model version is outdated or missing.
+    """
+
+    def __init__(self, db, nlp_processor, batch_size: int = 500, sweep_interval: float = 30.0):
+        self.db = db
+        self.nlp_processor = nlp_processor
+        self.batch_size = batch_size
+        self.sweep_interval = sweep_interval
+        self._tasks = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._synced_version = None
+        self._paused = 0
+        self._pause_lock = threading.Lock()
+        self.rows_written = 0
+
+    # Incremental updates
+    def score_job(self, job_id: str):
+        """Queue scoring of a new job against all resumes"""
+        self._tasks.append(('job', job_id))
+        self._wake.set()
+
+    def score_resume(self, resume_id: str):
+        """Queue scoring of a new resume against all jobs"""
+        self._tasks.append(('resume', resume_id))
+        self._wake.set()
+
+    def notify_model_changed(self):
+        """Wake the sweep after the processor was refitted"""
+        self._wake.set()
+
+    @contextmanager
+    def paused(self):
+        """Hold off background scoring, e.g. while a bulk import changes the corpus batch by batch"""
+        with self._pause_lock:
+            self._paused += 1
+        try:
+            yield
+        finally:
+            with self._pause_lock:
+                self._paused -= 1
+            self._wake.set()
+
+    def score_pairs(self, job_ids: List[str], resume_ids: List[str],
+                    only: Optional[Set[Tuple[str, str]]] = None) -> Dict[Tuple[str, str], dict]:
+        """
+        Score jobs x resumes, store the results and return them keyed by pair.
+
+        If ``only`` is given, just those (job_id, resume_id) pairs are stored.
+        """
+        if self.nlp_processor.model_version is None or not job_ids or not resume_ids:
+            return {}
+
+        # Loading unseen documents may refit the corpus, so read the version afterwards
+        self._ensure_processed(job_ids, resume_ids)
+        model_version = self.nlp_processor.model_version
+        scores, components = self.nlp_processor.calculate_similarity_matrix(
+            job_ids, resume_ids, return_components=True
+        )
+
+        results = {}
+        for j, job_id in enumerate(job_ids):
+            if job_id not in self.nlp_processor.job_embeddings:
+                continue
+            for r, resume_id in enumerate(resume_ids):
+                if resume_id not in self.nlp_processor.resume_embeddings:
+                    continue
+                if only is not None and (job_id, resume_id) not in only:
+                    continue
+                score = float(scores[j, r])
+                results[(job_id, resume_id)] = {
+                    'job_id': job_id,
+                    'resume_id': resume_id,
+                    'model_version': model_version,
+                    'similarity_score': score,
+                    'match_category': self.nlp_processor.categorize_match_strength(score),
+                    **{name: float(values[j, r]) for name, values in components.items()}
+                }
+
+        rows = list(results.values())
+        for start in range(0, len(rows), self.batch_size):
+            self.db.upsert_match_scores(rows[start:start + self.batch_size])
+        self.rows_written += len(rows)
+        return results
+
+    def _ensure_processed(self, job_ids: Iterable[str], resume_ids: Iterable[str]):
+        """Load documents written by other processes into the NLP processor"""
+        for job_id in job_ids:
+            if job_id not in self.nlp_processor.job_embeddings:
+                job = self.db.get_job_description(job_id)
+                if job:
+                    self.nlp_processor.process_job_description(job_id, job['description'])
+        for resume_id in resume_ids:
+            if resume_id not in self.nlp_processor.resume_embeddings:
+                resume = self.db.get_resume(resume_id)
+                if resume:
+                    self.nlp_processor.process_resume(resume_id, resume['content'])
+
+        if len(self.nlp_processor.all_texts) >= 2 and not self.nlp_processor.corpus_fitted:
+            self.nlp_processor.fit_corpus_vectorizers()
+
+    # Background maintenance
+    def sweep(self) -> int:
+        """Rescore pairs that are missing or were scored by another model version"""
+        model_version = self.nlp_processor.model_version
+        if model_version is None:
+            return 0
+
+        fresh, expected = self.db.get_match_score_coverage(model_version)
+        if fresh >= expected:
+            self._synced_version = model_version
+            return 0
+
+        # Load every document added by other processes (e.g. a bulk import) with a single
+        # refit, instead of one refit per batch of stale pairs
+        self._ensure_processed(self.db.get_job_ids(), self.db.get_resume_ids())
+        model_version = self.nlp_processor.model_version
+
+        logger.info(f"Rescoring {expected - fresh} stale match scores for model version {model_version}")
+        # Walk each job's stale resumes with a keyset cursor, so every pair is read once per pass
+        job_ids = self.db.get_job_ids()
+        rescored, index, after = 0, 0, None
+        while index < len(job_ids) and not self._stop.is_set():
+            job_id = job_ids[index]
+            resume_ids = self.db.get_unscored_resume_ids(job_id, model_version, after=after, limit=self.batch_size)
+            if not resume_ids:
+                index, after = index + 1, None
+                continue
+
+            written = self.score_pairs([job_id], resume_ids)
+            rescored += len(written)
+
+            if self.nlp_processor.model_version != model_version:
+                # Corpus was refitted while sweeping, start over with the new version
+                model_version = self.nlp_processor.model_version
+                index, after = 0, None
+                continue
+            if not written:
+                logger.warning(f"Could not score stale pairs for job {job_id}, retrying on next sweep")
+            after = resume_ids[-1]
+
+        if index >= len(job_ids):
+            self._synced_version = model_version
+        return rescored
+
+    def _run_task(self, kind: str, doc_id: str):
+        if kind == 'job':
+            self.score_pairs([doc_id], self.db.get_resume_ids())
+        else:
+            self.score_pairs(self.db.get_job_ids(), [doc_id])
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.sweep_interval)
+            self._wake.clear()
+            if self._paused:
+                continue
+            try:
+                while self._tasks and not self._stop.is_set():
+                    kind, doc_id = self._tasks.popleft()
+                    self._run_task(kind, doc_id)
+                # Cheap when up to date: a coverage count decides whether to scan
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Error maintaining match scores: {str(e)}")
+
+    def start(self):
+        """Start the background maintenance thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='score-materializer', daemon=True)
+        self._thread.start()
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background maintenance thread"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        """Return materializer state for monitoring"""
+        return {
+            'pending_tasks': len(self._tasks),
+            'synced_model_version': self._synced_version,
+            'current_model_version': self.nlp_processor.model_version,
+            'rows_written': self.rows_written,
+            'paused': self._paused > 0,
+            'running': self._thread is not None and self._thread.is_alive()
+        }
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the ASGI entry point: the async routes and the mounted Flask app
+"""
+
+import sys
+import os
+import json
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from starlette.testclient import TestClient
+
+from test_match_streaming import RESUMES, load_app
+
+
+def _clients():
+    app, job_id = load_app()
+    import asgi
+    # Not entered as a context manager: the lifespan shutdown would stop the shared executors
+    return TestClient(asgi.app), app.app.test_client(), app, job_id
+
+
+def test_health():
+    """/api/health is answered by the async handler"""
+    client, _, _, _ = _clients()
+    response = client.get('/api/health')
+    assert response.status_code == 200 and response.headers['content-type'] == 'application/json'
+    assert response.json()['status'] == 'healthy'
+    print("✅ Health check served")
+
+
+def test_match_same_as_flask():
+    """/api/match returns what the Flask endpoint returns, streamed or not"""
+    client, flask_client, app, job_id = _clients()
+    # The first match loads the resumes into the corpus, refitting it as it goes
+    flask_client.post('/api/match', json={'job_id': job_id})
+
+    response = client.post('/api/match', json={'job_id': job_id})
+    assert response.status_code == 200
+    assert response.json() == flask_client.post('/api/match', json={'job_id': job_id}).get_json()
+    assert response.json()['total_candidates'] == len(RESUMES)
+
+    partial = client.post('/api/match', json={'job_id': job_id, 'fields': ['skills_analysis']}).json()
+    assert all(set(app.MATCH_RESULT_FIELDS) & set(match) == {'skills_analysis'} for match in partial['matches'])
+
+    streamed = client.post('/api/match?stream=true', json={'job_id': job_id})
+    assert streamed.headers['content-type'].startswith('application/x-ndjson')
+    records = [json.loads(line) for line in streamed.content.splitlines()]
+    assert [record['type'] for record in records] == ['match'] * len(RESUMES) + ['summary']
+    assert records[-1]['best_match']['resume_id'] == response.json()['matches'][0]['resume_id']
+
+    assert client.post('/api/match', json={}).status_code == 400
+    assert client.post('/api/match', json={'job_id': job_id, 'fields': 'salary'}).status_code == 400
+    assert client.post('/api/match', json={'job_id': 'missing'}).status_code == 404
+    print("✅ Async match same as Flask")
+
+
+def test_candidate_matches_same_as_flask():
+    """/api/candidate/matches/<id> returns what the Flask endpoint returns"""
+    client, flask_client, app, _ = _clients()
+    resume_id = app.db.get_resume_ids()[0]
+
+    response = client.get(f'/api/candidate/matches/{resume_id}')
+    assert response.status_code == 200
+    assert response.json() == flask_client.get(f'/api/candidate/matches/{resume_id}').get_json()
+    assert response.json()['total_jobs'] >= 1
+
+    summary = client.get(f'/api/candidate/matches/{resume_id}?fields=summary').json()
+    assert not any(set(app.JOB_MATCH_FIELDS) & set(match) for match in summary['matching_jobs'])
+    assert client.get('/api/candidate/matches/missing').status_code == 404
+    print("✅ Async candidate matches same as Flask")
+
+
+def test_flask_routes_mounted():
+    """Other endpoints are served by the Flask app, with CORS and conditional requests intact"""
+    client, _, app, job_id = _clients()
+
+    response = client.get('/api/job-descriptions', headers={'Origin': 'https://example.com'})
+    assert response.status_code == 200 and response.headers['access-control-allow-origin'] == '*'
+    assert job_id in [job['id'] for job in response.json()['job_descriptions']]
+    cached = client.get('/api/job-descriptions', headers={'If-None-Match': response.headers['etag']})
+    assert cached.status_code == 304
+
+    created = client.post('/api/job-description', json={'title': 'Chef', 'description': 'Cooking and menus'})
+    assert created.status_code == 201 and app.db.get_job_description(created.json()['job_id'])['title'] == 'Chef'
+    assert client.get('/api/job-descriptions').headers['etag'] != response.headers['etag']
+    assert client.get('/api/not-a-route').status_code == 404
+    print("✅ Flask routes mounted")
+
+
+if __name__ == "__main__":
+    test_health()
+    test_match_same_as_flask()
+    test_candidate_matches_same_as_flask()
+    test_flask_routes_mounted()
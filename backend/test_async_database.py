@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the awaitable database wrapper used by the ASGI app
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+import threading
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from database import AsyncDatabase, Database
+
+
+def test_methods_awaitable():
+    """Database methods return the same results when awaited, from database threads"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        async_db = AsyncDatabase(db, max_workers=2)
+
+        async def scenario():
+            job_id = await async_db.create_job_description('Python Developer', 'Acme', 'python', '', 'Recruiter')
+            resume_id = await async_db.create_resume('a.txt', 'Alice', '', 'python', None)
+            job, resumes = await asyncio.gather(async_db.get_job_description(job_id), async_db.list_resumes())
+            thread = await async_db.run(lambda: threading.current_thread().name)
+            return job, resumes, resume_id, thread
+
+        job, (resumes, _), resume_id, thread = asyncio.run(scenario())
+        async_db.close()
+        assert job['title'] == 'Python Developer'
+        assert [resume['id'] for resume in resumes] == [resume_id]
+        assert thread.startswith('db') and thread != threading.current_thread().name
+        assert async_db.db_path == db.db_path
+        print("✅ Database methods awaitable")
+
+
+def test_event_loop_not_blocked():
+    """Other coroutines keep running while a slow database call is in progress"""
+    with tempfile.TemporaryDirectory() as tmp:
+        async_db = AsyncDatabase(Database(os.path.join(tmp, 'resume_matcher.db')), max_workers=1)
+
+        def slow_query():
+            with async_db.db.connection() as conn:
+                time.sleep(0.3)
+                return conn.execute('SELECT COUNT(*) FROM resumes').fetchone()[0]
+
+        async def scenario():
+            ticks = 0
+            query = asyncio.ensure_future(async_db.run(slow_query))
+            while not query.done():
+                ticks += 1
+                await asyncio.sleep(0.01)
+            return ticks, query.result()
+
+        ticks, count = asyncio.run(scenario())
+        async_db.close()
+        assert count == 0 and ticks >= 10, ticks
+        print("✅ Event loop not blocked by database calls")
+
+
+if __name__ == "__main__":
+    test_methods_awaitable()
+    test_event_loop_not_blocked()
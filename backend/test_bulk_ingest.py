@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for bulk ingestion of resumes and job descriptions
+"""
+
+import sys
+import os
+import json
+import tempfile
+import zipfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from database import Database
+from bulk_ingest import BulkIngester, default_run_id, iter_items
+from text_extraction import ExtractionError
+
+
+def extract(data, filename):
+    """Stand-in extractor: text files are decoded, 'broken' files fail like the sandbox reports"""
+    if filename.startswith('broken'):
+        raise ExtractionError('Text extraction timed out after 30 seconds')
+    return data.decode('utf-8')
+
+
+class CountingProcessor:
+    """Records processed documents and corpus fits"""
+
+    def __init__(self):
+        self.documents = []
+        self.all_texts = []
+        self.corpus_fitted = False
+        self.fits = 0
+
+    def process_job_description(self, job_id, text):
+        self.documents.append(job_id)
+        self.all_texts.append(text)
+        self.corpus_fitted = False
+
+    def process_resume(self, resume_id, text):
+        self.documents.append(resume_id)
+        self.all_texts.append(text)
+        self.corpus_fitted = False
+
+    def fit_corpus_vectorizers(self):
+        self.corpus_fitted = True
+        self.fits += 1
+
+    def get_document_skills(self, text):
+        return [word.lower() for word in ('Python', 'Django', 'Kubernetes') if word in text]
+
+
+def _write_source(directory, resumes=5):
+    for i in range(resumes):
+        with open(os.path.join(directory, f'candidate_{i}.txt'), 'w') as f:
+            f.write(f'Python developer number {i} with Django experience')
+    with open(os.path.join(directory, 'empty.txt'), 'w') as f:
+        f.write('   ')
+    with open(os.path.join(directory, 'broken.pdf'), 'wb') as f:
+        f.write(b'%PDF-1.4 garbage')
+    with open(os.path.join(directory, 'notes.md'), 'w') as f:
+        f.write('not a resume')
+    with open(os.path.join(directory, 'jobs.jsonl'), 'w') as f:
+        f.write(json.dumps({'type': 'job', 'title': 'Backend Engineer', 'description': 'Python and Django'}) + '\n')
+        f.write('\n')
+        f.write(json.dumps({'type': 'resume', 'candidate_name': 'Jane', 'content': 'Go and Kubernetes'}) + '\n')
+        f.write('{not json\n')
+        f.write(json.dumps({'type': 'job', 'title': 'No description'}) + '\n')
+
+
+def test_directory_ingested_in_batches():
+    """Files and JSONL records are stored in batches, failures are recorded and the corpus fitted once"""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'source')
+        os.makedirs(source)
+        _write_source(source)
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        processor = CountingProcessor()
+        progress = []
+        ingester = BulkIngester(db, extract, nlp_processor=processor, workers=2, batch_size=3,
+                                progress=progress.append)
+
+        run = ingester.ingest(source)
+
+        assert run['status'] == 'completed'
+        assert run['total_items'] == 11
+        assert run['processed_items'] == 11
+        assert (run['resumes'], run['jobs'], run['failed_items']) == (6, 1, 4)
+        assert [p['processed_items'] for p in progress] == [3, 6, 9, 11]
+
+        resumes = {r['candidate_name']: r for r in db.get_resumes()}
+        assert resumes['candidate 0']['content'] == 'Python developer number 0 with Django experience'
+        assert resumes['Jane']['content'] == 'Go and Kubernetes'
+        assert [job['title'] for job in db.get_job_descriptions()] == ['Backend Engineer']
+
+        failures = {f['item']: f['error'] for f in db.get_bulk_ingest_failures(run['id'])}
+        assert failures['broken.pdf'] == 'Text extraction timed out after 30 seconds'
+        assert failures['empty.txt'] == 'Could not extract text from the resume'
+        assert failures['jobs.jsonl:4'].startswith('Invalid JSON')
+        assert failures['jobs.jsonl:5'] == 'Job description is required'
+
+        assert len(processor.documents) == 7
+        assert processor.fits == 1
+        assert len(db.search_documents_by_skills(['python', 'django'])) == 5
+        assert [d['candidate_name'] for d in db.search_documents_by_skills(['kubernetes'])] == ['Jane']
+        assert [d['title'] for d in db.search_documents_by_skills(['django'], doc_type='job')] == ['Backend Engineer']
+        print("✅ Directory ingested in batches with one refit")
+
+
+def test_interrupted_run_resumes_without_duplicates():
+    """Rerunning an interrupted run skips the items it already stored"""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'source')
+        os.makedirs(source)
+        _write_source(source, resumes=10)
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+
+        def interrupt(run):
+            raise KeyboardInterrupt()
+
+        try:
+            BulkIngester(db, extract, batch_size=4, progress=interrupt).ingest(source)
+            assert False, 'the run should have been interrupted'
+        except KeyboardInterrupt:
+            pass
+
+        interrupted = db.get_bulk_ingest_run(default_run_id(source))
+        assert interrupted['status'] == 'interrupted'
+        assert interrupted['processed_items'] == 4
+
+        run = BulkIngester(db, extract, batch_size=4).ingest(source)
+        assert run['status'] == 'completed'
+        assert run['processed_items'] == run['total_items'] == 16
+        assert len(db.get_resumes()) == 11
+        assert len(db.get_job_descriptions()) == 1
+        print("✅ Interrupted runs resume without duplicates")
+
+
+def test_zip_and_jsonl_sources():
+    """Zip archives and single JSONL files are read as item streams"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_path = os.path.join(tmp, 'resumes.zip')
+        with zipfile.ZipFile(archive_path, 'w') as archive:
+            archive.writestr('team/alice.txt', 'Alice resume')
+            archive.writestr('team/bob.txt', 'Bob resume')
+            archive.writestr('__MACOSX/team/._alice.txt', 'resource fork')
+            archive.writestr('jobs.jsonl', json.dumps({'type': 'job', 'description': 'Python'}) + '\n')
+        assert [item.key for item in iter_items(archive_path)] == ['jobs.jsonl:1', 'team/alice.txt', 'team/bob.txt']
+
+        jsonl_path = os.path.join(tmp, 'resumes.jsonl')
+        with open(jsonl_path, 'w') as f:
+            for name in ('carol', 'dave'):
+                f.write(json.dumps({'candidate_name': name, 'content': f'{name} resume'}) + '\n')
+
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        ingester = BulkIngester(db, extract)
+        assert ingester.ingest(archive_path)['resumes'] == 2
+        assert ingester.ingest(jsonl_path)['resumes'] == 2
+        assert sorted(r['candidate_name'] for r in db.get_resumes()) == ['alice', 'bob', 'carol', 'dave']
+        print("✅ Zip and JSONL sources ingested")
+
+
+if __name__ == "__main__":
+    test_directory_ingested_in_batches()
+    test_interrupted_run_resumes_without_duplicates()
+    test_zip_and_jsonl_sources()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for compressed storage of resume content and match details
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from database import Database, compress_text, decompress_text, ZLIB_MARKER
+
+RESUME_TEXT = 'Senior Python developer with Django, Flask, PostgreSQL, Docker and AWS experience. ' * 50
+MATCH_DETAILS = {
+    'skills_analysis': {'common_skills': ['python', 'django', 'aws'] * 20, 'missing_skills': ['go'] * 20},
+    'component_scores': {'tfidf_similarity': 0.5, 'semantic_similarity': 0.6, 'skill_similarity': 0.7},
+    'recommendations': ['Highlight cloud experience'] * 10
+}
+
+
+def _stored(db, table, column):
+    with db.connection() as conn:
+        return conn.execute(f'SELECT {column} FROM {table}').fetchall()
+
+
+def test_round_trip():
+    """Large values are stored compressed behind the marker; short ones stay plain text"""
+    stored = compress_text(RESUME_TEXT)
+    assert isinstance(stored, bytes) and stored.startswith(ZLIB_MARKER)
+    assert len(stored) < len(RESUME_TEXT) / 10
+    assert decompress_text(stored) == RESUME_TEXT
+    assert compress_text('short resume') == 'short resume'
+    assert decompress_text('plain text row') == 'plain text row'
+    assert compress_text(None) is None and decompress_text(None) is None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        job_id = db.create_job_description('Python Developer', 'Acme', 'python django', '', 'Recruiter')
+        resume_id = db.create_resume('a.txt', 'Alice', '', RESUME_TEXT, None)
+        db.create_match(job_id, resume_id, 0.8, ['python'], [], MATCH_DETAILS)
+
+        assert _stored(db, 'resumes', 'typeof(content)') == [('blob',)]
+        assert _stored(db, 'matches', 'typeof(match_details)') == [('blob',)]
+        assert db.get_resume(resume_id)['content'] == RESUME_TEXT
+        assert db.get_resumes()[0]['content'] == RESUME_TEXT
+        assert db.get_matches_for_job(job_id)[0]['match_details'] == MATCH_DETAILS
+        assert db.get_all_matches()[0]['match_details'] == MATCH_DETAILS
+        assert db.list_matches(include_details=True)[0][0]['match_details'] == MATCH_DETAILS
+
+        db.save_bulk_ingest_batch('run', [('r2', 'b.txt', 'Bob', '', RESUME_TEXT, None)], [], [])
+        assert db.get_resume('r2')['content'] == RESUME_TEXT
+        print("✅ Compressed values round-trip")
+
+
+def test_existing_rows_compressed_and_file_shrinks():
+    """Rows stored as plain text are rewritten compressed and the file shrinks after VACUUM"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        job_id = db.create_job_description('Python Developer', 'Acme', 'python django', '', 'Recruiter')
+        # Rows written before compression existed
+        with db.connection() as conn:
+            for i in range(200):
+                conn.execute('''
+                    INSERT INTO resumes (id, filename, candidate_name, candidate_email, content, file_path)
+                    VALUES (?, ?, ?, '', ?, NULL)
+                ''', (f'r{i}', f'{i}.txt', f'Candidate {i}', RESUME_TEXT + str(i)))
+                conn.execute('''
+                    INSERT INTO matches (id, job_id, resume_id, similarity_score, common_skills,
+                                         missing_skills, match_details)
+                    VALUES (?, ?, ?, 0.5, '[]', '[]', ?)
+                ''', (f'm{i}', job_id, f'r{i}', json.dumps(MATCH_DETAILS)))
+            conn.execute("INSERT INTO resumes (id, filename, content) VALUES ('short', 's.txt', 'tiny')")
+        db.vacuum()
+        size_before = db.get_storage_size()
+
+        assert db.compress_stored_columns(batch_size=64) == {'resumes': 200, 'matches': 200}
+        db.vacuum()
+        assert db.get_storage_size() < size_before / 3
+        with db.connection() as conn:
+            assert conn.execute("SELECT typeof(content) FROM resumes WHERE id = 'short'").fetchone() == ('text',)
+        assert db.get_resume('r7')['content'] == RESUME_TEXT + '7'
+        assert db.get_matches_for_job(job_id)[0]['match_details'] == MATCH_DETAILS
+
+        # A second run finds nothing left to compress
+        assert db.compress_stored_columns() == {'resumes': 0, 'matches': 0}
+
+        assert db.compress_stored_columns(decompress=True) == {'resumes': 200, 'matches': 200}
+        with db.connection() as conn:
+            assert conn.execute("SELECT content FROM resumes WHERE id = 'r7'").fetchone()[0] == RESUME_TEXT + '7'
+        print("✅ Existing rows compressed and the file shrinks")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_existing_rows_compressed_and_file_shrinks()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Tests for the data version, ETags and the version-keyed response cache
+"""
+
+import sys
+import os
+import gzip
+import tempfile
+
+from flask import Flask, jsonify
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from database import Database
+from responses import ResponseCache, init_app, versioned
+from test_match_streaming import load_app
+
+
+def test_writes_bump_data_version():
+    """Every write to a listed table increases the version; reads leave it alone"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        versions = [db.get_data_version()]
+
+        job_id = db.create_job_description('Python Developer', 'Acme', 'python django', '', 'Recruiter')
+        versions.append(db.get_data_version())
+        resume_id = db.create_resume('a.txt', 'Alice', '', 'python', None)
+        versions.append(db.get_data_version())
+        db.create_match(job_id, resume_id, 0.8, ['python'], [], {'score': 0.8})
+        versions.append(db.get_data_version())
+        db.upsert_match_scores([{'job_id': job_id, 'resume_id': resume_id, 'model_version': 'v1',
+                                 'similarity_score': 0.8, 'match_category': 'good', 'tfidf_similarity': 0.8,
+                                 'semantic_similarity': 0.8, 'skill_similarity': 0.8,
+                                 'keyword_similarity': 0.8, 'context_similarity': 0.8}])
+        versions.append(db.get_data_version())
+        db.list_resumes()
+        db.list_matches(include_details=True)
+        versions.append(db.get_data_version())
+        with db.connection() as conn:
+            conn.execute('DELETE FROM resumes WHERE id = ?', (resume_id,))
+        versions.append(db.get_data_version())
+
+        assert versions[:-2] == sorted(set(versions[:-2])), versions
+        assert versions[-3] == versions[-2] < versions[-1], versions
+
+        # A second connection pool sees the same version
+        assert Database(db.db_path).get_data_version() == versions[-1]
+        print("✅ Writes bump the data version")
+
+
+def test_table_versions_independent():
+    """A table's version only changes with writes to that table"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        job_id = db.create_job_description('Python Developer', 'Acme', 'python django', '', 'Recruiter')
+        resume_id = db.create_resume('a.txt', 'Alice', '', 'python', None)
+        listed = ('job_descriptions',), ('resumes',), ('matches', 'job_descriptions', 'resumes')
+        before = [db.get_data_version(tables) for tables in listed]
+
+        db.upsert_match_scores([{'job_id': job_id, 'resume_id': resume_id, 'model_version': 'v1',
+                                 'similarity_score': 0.8, 'match_category': 'good', 'tfidf_similarity': 0.8,
+                                 'semantic_similarity': 0.8, 'skill_similarity': 0.8,
+                                 'keyword_similarity': 0.8, 'context_similarity': 0.8}])
+        assert [db.get_data_version(tables) for tables in listed] == before
+        db.create_match(job_id, resume_id, 0.8, ['python'], [], {'score': 0.8})
+        after_match = [db.get_data_version(tables) for tables in listed]
+        assert after_match[:2] == before[:2] and after_match[2] > before[2]
+        db.create_resume('b.txt', 'Bob', '', 'java', None)
+        after_resume = [db.get_data_version(tables) for tables in listed]
+        assert after_resume[0] == before[0] and after_resume[1] > before[1] and after_resume[2] > after_match[2]
+        print("✅ Table versions independent")
+
+
+def test_table_versions_read_after_commits_only():
+    """Versions come from memory until a commit, by this or another process, changes PRAGMA data_version"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        version = db.get_data_version()
+        statements = []
+        db._versions_conn.set_trace_callback(statements.append)
+
+        assert db.get_data_version() == version
+        db.get_data_version(('resumes',))
+        assert statements == ['PRAGMA data_version'] * 2
+
+        # Another process writing to the same database file
+        Database(db.db_path).create_resume('a.txt', 'Alice', '', 'python', None)
+        assert db.get_data_version() > version
+        assert any('table_versions' in statement for statement in statements)
+        print("✅ Table versions read only after commits")
+
+
+def test_listing_etags_follow_their_tables():
+    """Storing matches keeps the job description and resume listings' ETags valid"""
+    app, job_id = load_app()
+    client = app.app.test_client()
+    tags = {path: client.get(path).headers['ETag'] for path in ('/api/job-descriptions', '/api/resumes', '/api/matches')}
+
+    resume_id = app.db.get_resume_ids()[0]
+    app.db.create_match(job_id, resume_id, 0.5, [], [], {}, model_version='etag-test')
+
+    statuses = {path: client.get(path, headers={'If-None-Match': tag}).status_code for path, tag in tags.items()}
+    assert statuses == {'/api/job-descriptions': 304, '/api/resumes': 304, '/api/matches': 200}, statuses
+    print("✅ Listing ETags follow their tables")
+
+
+def test_candidate_resumes_etag_follows_model_version():
+    """A refit changes the candidate dashboard's ETag, since unmaterialized scores are computed on demand"""
+    app, _ = load_app()
+    client = app.app.test_client()
+    response = client.get('/api/candidate/resumes')
+    assert client.get('/api/candidate/resumes', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+    model_version = app.nlp_processor.model_version
+    app.nlp_processor.model_version = 'refitted'
+    try:
+        refitted = client.get('/api/candidate/resumes', headers={'If-None-Match': response.headers['ETag']})
+    finally:
+        app.nlp_processor.model_version = model_version
+    assert refitted.status_code == 200 and refitted.headers['ETag'] != response.headers['ETag']
+    print("✅ Candidate resumes ETag follows the model version")
+
+
+def _client(state):
+    app = Flask(__name__)
+    init_app(app)
+
+    @app.route('/items')
+    @versioned(lambda: state['version'], cache=state['cache'])
+    def items():
+        state['renders'] += 1
+        if state.get('fail'):
+            return jsonify({'error': 'Internal server error'}), 500
+        return jsonify({'items': [f'item {i}' for i in range(300)], 'version': state['version']})
+
+    return app.test_client()
+
+
+def test_not_modified_without_running_the_view():
+    """A matching If-None-Match gets a 304 until the version changes"""
+    state = {'version': 7, 'renders': 0, 'cache': ResponseCache(ttl=0)}
+    client = _client(state)
+
+    first = client.get('/items')
+    etag = first.headers['ETag']
+    assert first.status_code == 200 and etag == '"7-json-identity"' and state['renders'] == 1
+
+    unchanged = client.get('/items', headers={'If-None-Match': etag})
+    assert unchanged.status_code == 304 and unchanged.data == b'' and unchanged.headers['ETag'] == etag
+    assert state['renders'] == 1
+
+    state['version'] = 8
+    changed = client.get('/items', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.get_json()['version'] == 8 and changed.headers['ETag'] != etag
+    print("✅ Not modified without running the view")
+
+
+def test_compressed_variants_tagged_separately():
+    """The gzipped representation has its own ETag and a tag never matches the other variant"""
+    state = {'version': 1, 'renders': 0, 'cache': ResponseCache(ttl=0)}
+    client = _client(state)
+
+    plain = client.get('/items')
+    compressed = client.get('/items', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == plain.data
+    assert compressed.headers['ETag'] != plain.headers['ETag']
+    assert {'Accept', 'Accept-Encoding'} <= set(compressed.headers['Vary'].split(', '))
+
+    # The tag of the uncompressed body does not validate the gzipped one
+    assert client.get('/items', headers={'If-None-Match': plain.headers['ETag'],
+                                         'Accept-Encoding': 'gzip'}).status_code == 200
+    assert client.get('/items', headers={'If-None-Match': compressed.headers['ETag'],
+                                         'Accept-Encoding': 'gzip'}).status_code == 304
+    print("✅ Compressed variants tagged separately")
+
+
+def test_responses_cached_per_version():
+    """Repeated requests reuse the rendered response until the version changes; errors are not cached"""
+    state = {'version': 1, 'renders': 0, 'cache': ResponseCache(ttl=60)}
+    client = _client(state)
+
+    first = client.get('/items?limit=10', headers={'Accept-Encoding': 'gzip'})
+    again = client.get('/items?limit=10', headers={'Accept-Encoding': 'gzip'})
+    assert state['renders'] == 1
+    assert again.data == first.data and again.headers['ETag'] == first.headers['ETag']
+    assert again.headers['Content-Encoding'] == 'gzip'
+
+    client.get('/items?limit=10')
+    client.get('/items?limit=20', headers={'Accept-Encoding': 'gzip'})
+    assert state['renders'] == 3
+
+    state['version'] = 2
+    client.get('/items?limit=10', headers={'Accept-Encoding': 'gzip'})
+    assert state['renders'] == 4
+
+    state['fail'] = True
+    state['version'] = 3
+    for _ in range(2):
+        failed = client.get('/items')
+        assert failed.status_code == 500 and 'ETag' not in failed.headers
+    assert state['renders'] == 6
+    print("✅ Responses cached per version")
+
+
+if __name__ == "__main__":
+    test_writes_bump_data_version()
+    test_table_versions_independent()
+    test_table_versions_read_after_commits_only()
+    test_listing_etags_follow_their_tables()
+    test_candidate_resumes_etag_follows_model_version()
+    test_not_modified_without_running_the_view()
+    test_compressed_variants_tagged_separately()
+    test_responses_cached_per_version()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed document cache
+"""
+
+import sys
+import os
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from database import Database
+from nlp_processor import ResumeMatcherNLP
+
+RESUME = """
+Jane Doe - Backend Engineer
+6 years of experience building Python services with Django and Flask on AWS.
+"""
+
+
+def test_cache_roundtrip_and_versions():
+    """Cached documents are found by content hash and extractor version"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        features = {'processed_text': 'python django', 'skills': ['python', 'django']}
+        db.cache_document('hash-1', 'v1', 'Python Django', features)
+
+        assert db.get_cached_document('hash-1', 'v1') == {'text': 'Python Django', 'features': features}
+        assert db.get_cached_document('hash-1', 'v2') is None
+        assert db.get_cached_document('hash-2', 'v1') is None
+
+        db.cache_document('hash-1', 'v2', 'Python Django', features)
+        assert db.prune_document_cache('v2') == 1
+        assert db.get_cached_document('hash-1', 'v1') is None
+        print("✅ Document cache keyed by hash and version")
+
+
+def test_process_resume_with_cached_features():
+    """Precomputed features skip preprocessing and skill extraction"""
+    nlp = ResumeMatcherNLP()
+    features = nlp.document_features(RESUME)
+    assert 'python' in features['skills']
+
+    cached = ResumeMatcherNLP()
+    cached.preprocess_text = cached.extract_skills = None  # Would raise if called
+    cached.process_resume('resume-1', RESUME, features=features)
+
+    assert cached.resume_embeddings['resume-1'] == features['processed_text']
+    assert cached.get_document_skills(RESUME) == features['skills']
+    print("✅ Cached features reused by process_resume")
+
+
+if __name__ == "__main__":
+    test_cache_roundtrip_and_versions()
+    test_process_resume_with_cached_features()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for sandboxed text extraction
+"""
+
+import sys
+import os
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from extraction_sandbox import ExtractionSandbox, resource
+from text_extraction import ExtractionError
+
+
+def slow_extract(source, filename, **options):
+    """Stands in for a parser stuck on an adversarial document"""
+    if source == b'hang':
+        time.sleep(60)
+    return source.decode('utf-8')
+
+
+def hungry_extract(source, filename, **options):
+    """Stands in for a parser that keeps allocating"""
+    if source == b'bloat':
+        return 'x' * (1024 * 1024 * 1024)
+    return source.decode('utf-8')
+
+
+def crashing_extract(source, filename, **options):
+    """Stands in for a parser crashing inside a C extension"""
+    if source == b'segfault':
+        os._exit(139)
+    return source.decode('utf-8')
+
+
+def _expect_error(sandbox, source, message, filename='resume.txt'):
+    try:
+        sandbox.extract(source, filename)
+    except ExtractionError as e:
+        assert message in str(e), str(e)
+    else:
+        raise AssertionError('extraction should have failed')
+
+
+def test_extracts_and_reports_errors():
+    """Documents are extracted in the sandbox and parser errors come back as reasons"""
+    sandbox = ExtractionSandbox(workers=1)
+    try:
+        assert sandbox.extract(b'Python developer', 'resume.txt') == 'Python developer'
+        _expect_error(sandbox, b'not a pdf', 'Could not read the document', 'resume.pdf')
+        assert sandbox.stats()['completed'] == 1
+        print("✅ Sandbox extracts text and reports parser errors")
+    finally:
+        sandbox.close()
+
+
+def test_timeout_kills_and_replaces_worker():
+    """A stuck extraction is killed and the next file gets a fresh worker"""
+    sandbox = ExtractionSandbox(workers=1, timeout=2, extractor=slow_extract)
+    try:
+        start = time.time()
+        _expect_error(sandbox, b'hang', 'timed out')
+        assert time.time() - start < 10
+        assert sandbox.extract(b'next resume', 'resume.txt') == 'next resume'
+        assert sandbox.stats()['timeouts'] == 1
+        print("✅ Timed out workers are replaced")
+    finally:
+        sandbox.close()
+
+
+def test_memory_limit():
+    """An extraction over the memory cap fails without affecting later files"""
+    if resource is None:
+        print("⏭️  No resource limits on this platform")
+        return
+    sandbox = ExtractionSandbox(workers=1, memory_limit=256 * 1024 * 1024, extractor=hungry_extract)
+    try:
+        _expect_error(sandbox, b'bloat', 'memory limit')
+        assert sandbox.extract(b'next resume', 'resume.txt') == 'next resume'
+        assert sandbox.stats()['memory_errors'] == 1
+        print("✅ Memory limit enforced per worker")
+    finally:
+        sandbox.close()
+
+
+def test_crash_is_reported():
+    """A worker dying mid-file is reported and replaced"""
+    sandbox = ExtractionSandbox(workers=1, extractor=crashing_extract)
+    try:
+        _expect_error(sandbox, b'segfault', 'crashed')
+        assert sandbox.extract(b'next resume', 'resume.txt') == 'next resume'
+        assert sandbox.stats()['crashes'] == 1
+        print("✅ Crashed workers are replaced")
+    finally:
+        sandbox.close()
+
+
+if __name__ == "__main__":
+    test_extracts_and_reports_errors()
+    test_timeout_kills_and_replaces_worker()
+    test_memory_limit()
+    test_crash_is_reported()
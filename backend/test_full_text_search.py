@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the full-text indexes used to prefilter match candidates
+"""
+
+import sys
+import os
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+import database
+from database import Database
+
+KUBERNETES_RESUME = 'Platform engineer running Kubernetes clusters and Go services on AWS. ' * 20
+PYTHON_RESUME = 'Python developer building Django applications and deploying them with Docker. ' * 20
+
+
+def test_index_follows_resume_changes():
+    """Inserts, updates and deletes are reflected in search results, also after compression and VACUUM"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        kubernetes = db.create_resume('k.txt', 'Kim', '', KUBERNETES_RESUME, None)
+        python = db.create_resume('p.txt', 'Pat', '', PYTHON_RESUME, None)
+        chef = db.create_resume('c.txt', 'Cam', '', 'Chef cooking pasta', None)
+
+        assert db.search_resumes(['kubernetes', 'clusters']) == [kubernetes]
+        # Terms are stemmed: 'deploy' matches 'deploying'
+        assert db.search_resumes(['deploy']) == [python]
+        assert db.search_resumes([]) == []
+        assert db.search_resumes(['"quoted" OR ( syntax']) == []
+
+        with db.connection() as conn:
+            conn.execute('DELETE FROM resumes WHERE id = ?', (kubernetes,))
+            conn.execute("UPDATE resumes SET content = 'Kubernetes operator' WHERE id = ?", (chef,))
+        assert db.search_resumes(['kubernetes']) == [chef]
+        assert db.search_resumes(['pasta']) == []
+
+        db.compress_stored_columns(decompress=True)
+        db.vacuum()
+        assert db.search_resumes(['django']) == [python]
+        assert db.search_resumes(['kubernetes']) == [chef]
+        print("✅ Full-text index follows resume changes")
+
+
+def test_ranking_and_limit():
+    """Resumes are ranked by bm25 and the limit keeps the best"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        strong = db.create_resume('s.txt', 'Sam', '', KUBERNETES_RESUME, None)
+        weak = db.create_resume('w.txt', 'Wes', '', PYTHON_RESUME + ' Some kubernetes.', None)
+        db.create_resume('c.txt', 'Cam', '', 'Chef cooking pasta', None)
+
+        assert db.search_resumes(['kubernetes', 'go', 'aws']) == [strong, weak]
+        assert db.search_resumes(['kubernetes', 'go', 'aws'], limit=1) == [strong]
+        assert [r['id'] for r in db.get_resumes_by_ids([weak, 'missing', strong])] == [weak, strong]
+        assert db.get_resumes_by_ids([strong])[0]['content'] == KUBERNETES_RESUME
+
+        job_id = db.create_job_description('Platform Engineer', 'Acme', 'Run Kubernetes', 'Go and AWS', 'Recruiter')
+        db.create_job_description('Cook', 'Diner', 'Cook pasta', '', 'Recruiter')
+        assert db.search_job_descriptions(['aws', 'kubernetes']) == [job_id]
+        print("✅ Resumes ranked by bm25")
+
+
+def test_existing_documents_indexed_by_migration():
+    """Documents stored before the full-text migration are indexed when it runs"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'resume_matcher.db')
+        migration = database.MIGRATIONS.index(database._add_full_text_indexes)
+        pending = database.MIGRATIONS[migration:]
+        del database.MIGRATIONS[migration:]
+        try:
+            db = Database(path)
+            resume_id = db.create_resume('k.txt', 'Kim', '', KUBERNETES_RESUME, None)
+            job_id = db.create_job_description('Platform Engineer', 'Acme', 'Kubernetes', '', 'Recruiter')
+            db.close()
+        finally:
+            database.MIGRATIONS.extend(pending)
+
+        db = Database(path)
+        assert db.search_resumes(['kubernetes']) == [resume_id]
+        assert db.search_job_descriptions(['kubernetes']) == [job_id]
+        print("✅ Existing documents indexed by the migration")
+
+
+if __name__ == "__main__":
+    test_index_follows_resume_changes()
+    test_ranking_and_limit()
+    test_existing_documents_indexed_by_migration()
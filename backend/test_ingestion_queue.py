@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Tests for the durable resume ingestion queue
+"""
+
+import sys
+import os
+import io
+import tempfile
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from database import Database
+from ingestion_queue import IngestionQueue, IngestionError
+
+
+def _enqueue(queue, name):
+    return queue.enqueue(f'resume-{name}', f'{name}.txt', name, f'{name}@example.com', f'uploads/{name}.txt')
+
+
+def test_jobs_processed_and_drained_once():
+    """Queued jobs are processed in order and the drain hook runs once per burst"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        handled, drains = [], []
+        queue = IngestionQueue(db, handler=lambda job: handled.append(job['id']),
+                               on_drain=lambda: drains.append(1))
+
+        for name in ('alice', 'bob', 'carol'):
+            _enqueue(queue, name)
+        assert db.get_ingestion_job('resume-alice')['status'] == 'queued'
+
+        while queue.process_next():
+            pass
+        queue.drain()
+        queue.drain()
+
+        assert handled == ['resume-alice', 'resume-bob', 'resume-carol']
+        assert db.get_ingestion_job('resume-bob')['status'] == 'completed'
+        assert db.count_ingestion_jobs() == {'completed': 3}
+        assert drains == [1]
+        print("✅ Jobs processed in order with one drain per burst")
+
+
+def test_failures_and_retries():
+    """Permanent errors fail at once, transient errors are retried up to max_attempts"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+
+        def handler(job):
+            if job['candidate_name'] == 'empty':
+                raise IngestionError('Could not extract text from the resume')
+            raise RuntimeError('database is locked')
+
+        queue = IngestionQueue(db, handler=handler, max_attempts=2)
+        _enqueue(queue, 'empty')
+        _enqueue(queue, 'flaky')
+        while queue.process_next():
+            pass
+
+        empty = db.get_ingestion_job('resume-empty')
+        assert empty['status'] == 'failed'
+        assert empty['error'] == 'Could not extract text from the resume'
+        flaky = db.get_ingestion_job('resume-flaky')
+        assert flaky['status'] == 'failed'
+        assert flaky['attempts'] == 2
+        print("✅ Failures and retries recorded")
+
+
+def test_expired_lease_is_reclaimed():
+    """A job held by a crashed worker is claimed again after its lease expires"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        queue = IngestionQueue(db, handler=lambda job: None, lease_seconds=0.05)
+        _enqueue(queue, 'alice')
+
+        # Simulate a worker that claimed the job and died
+        assert db.claim_ingestion_job(lease_seconds=0.05)['id'] == 'resume-alice'
+        assert db.claim_ingestion_job(lease_seconds=0.05) is None
+        time.sleep(0.1)
+
+        assert queue.process_next()
+        job = db.get_ingestion_job('resume-alice')
+        assert job['status'] == 'completed'
+        assert job['attempts'] == 2
+        print("✅ Expired leases are reclaimed")
+
+
+def test_payload_jobs_reserved_for_owner():
+    """Jobs with an in-memory payload are processed by the queue holding it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        payloads = []
+        owner = IngestionQueue(db, handler=lambda job: payloads.append(job['payload'].read()),
+                               lease_seconds=0.05)
+        other = IngestionQueue(db, handler=lambda job: payloads.append(job['payload']))
+
+        owner.enqueue('resume-alice', 'alice.txt', 'alice', '', None,
+                      payload=io.BytesIO(b'resume text'), content_hash='abc')
+        assert db.get_ingestion_job('resume-alice')['content_hash'] == 'abc'
+        assert not other.process_next()
+        assert owner.process_next()
+        assert payloads == [b'resume text']
+        assert owner.stats()['buffered_payloads'] == 0
+
+        # If the owner dies, another process claims the job after the reservation without a payload
+        owner.enqueue('resume-bob', 'bob.txt', 'bob', '', None, payload=io.BytesIO(b'lost'))
+        time.sleep(0.1)
+        assert other.process_next()
+        assert payloads[-1] is None
+        print("✅ Payload jobs reserved for their owner")
+
+
+def test_payload_reservation_renewed_while_owner_busy():
+    """Buffered jobs waiting behind a busy worker longer than the lease stay reserved for their owner"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        names = ['alice', 'bob', 'carol', 'dave', 'erin']
+        payloads, stolen = [], []
+
+        def handler(job):
+            payloads.append(job['payload'].read())
+            time.sleep(0.1)  # Each job is well within the lease; the last ones wait longer
+
+        owner = IngestionQueue(db, handler=handler, workers=1, lease_seconds=0.2,
+                               heartbeat_interval=0.02, poll_interval=30)
+        other = IngestionQueue(db, handler=lambda job: stolen.append(job['id']))
+        owner.start()
+        try:
+            for name in names:
+                owner.enqueue(f'resume-{name}', f'{name}.txt', name, '', None, payload=io.BytesIO(name.encode()))
+            deadline = time.time() + 5
+            while db.count_ingestion_jobs() != {'completed': len(names)} and time.time() < deadline:
+                other.process_next()
+                time.sleep(0.01)
+        finally:
+            owner.stop()
+
+        assert stolen == []
+        assert payloads == [name.encode() for name in names]
+        assert owner.stats()['buffered_payloads'] == 0
+        print("✅ Payload reservations renewed while the owner is busy")
+
+
+def test_payload_released_when_taken_over():
+    """A payload whose job another process claimed after the reservation expired is released"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+
+        def lost(job):
+            if job['payload'] is None:
+                raise IngestionError('The upload was interrupted')
+
+        owner = IngestionQueue(db, handler=lost, lease_seconds=0.05)
+        other = IngestionQueue(db, handler=lost)
+        owner.enqueue('resume-alice', 'alice.txt', 'alice', '', None, payload=io.BytesIO(b'alice'))
+        owner.renew_reservations()
+        assert owner.stats()['buffered_payloads'] == 1
+
+        # The owner stalled without renewing, so the reservation lapsed
+        time.sleep(0.1)
+        assert other.process_next()
+        assert db.get_ingestion_job('resume-alice')['status'] == 'failed'
+
+        owner.renew_reservations()
+        assert owner.stats()['buffered_payloads'] == 0
+        assert not owner.process_next()
+        print("✅ Payloads released once another process takes the job")
+
+
+def test_worker_threads():
+    """Started workers pick up enqueued jobs without polling delay"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        handled = []
+        queue = IngestionQueue(db, handler=lambda job: handled.append(job['id']),
+                               workers=2, poll_interval=30)
+        queue.start()
+        try:
+            for name in ('alice', 'bob'):
+                _enqueue(queue, name)
+            deadline = time.time() + 5
+            while len(handled) < 2 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            queue.stop()
+
+        assert sorted(handled) == ['resume-alice', 'resume-bob']
+        assert queue.stats()['processed'] == 2
+        print("✅ Worker threads process queued jobs")
+
+
+if __name__ == "__main__":
+    test_jobs_processed_and_drained_once()
+    test_failures_and_retries()
+    test_expired_lease_is_reclaimed()
+    test_payload_jobs_reserved_for_owner()
+    test_payload_reservation_renewed_while_owner_busy()
+    test_payload_released_when_taken_over()
+    test_worker_threads()
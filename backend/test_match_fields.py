@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for sparse fieldsets: match detail sections are only computed when requested
+"""
+
+import sys
+import os
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from database import Database
+from nlp_processor import MATCH_DETAIL_SECTIONS
+from score_cache import ScoreCache
+from test_match_streaming import load_app
+from test_similarity_matrix import build_processor
+
+
+def _count_calls(nlp, *names):
+    calls = {name: 0 for name in names}
+    for name in names:
+        method = getattr(nlp, name)
+
+        def counted(*args, _name=name, _method=method, **kwargs):
+            calls[_name] += 1
+            return _method(*args, **kwargs)
+        setattr(nlp, name, counted)
+    return calls
+
+
+def test_sections_match_full_details():
+    """Each requested section equals the same section of the full analysis"""
+    nlp = build_processor()
+    full = nlp.get_match_details('job-python', 'resume-backend')
+    assert set(MATCH_DETAIL_SECTIONS) <= set(full)
+
+    for section in MATCH_DETAIL_SECTIONS:
+        partial = nlp.get_match_details('job-python', 'resume-backend', sections=[section])
+        assert set(partial) == {'overall_similarity', 'match_strength', section}, partial.keys()
+        assert partial[section] == full[section], section
+    assert nlp.get_match_details('job-python', 'resume-backend', sections=list(MATCH_DETAIL_SECTIONS)) == full
+    print("✅ Requested sections match the full details")
+
+
+def test_summary_skips_detail_work():
+    """A summary computes no component scores, skills or recommendations"""
+    nlp = build_processor()
+    # The overall score is computed (and cached) before the details, as the API does
+    nlp.score_cache = ScoreCache()
+    nlp.score_cache.set_model_version(nlp.model_version)
+    nlp.calculate_similarity('job-python', 'resume-backend')
+    calls = _count_calls(nlp, 'calculate_semantic_similarity', 'calculate_skill_similarity',
+                         'get_document_skills', 'generate_recommendations', 'calculate_experience_match')
+
+    summary = nlp.get_match_details('job-python', 'resume-backend', sections=[])
+    assert set(summary) == {'overall_similarity', 'match_strength'}
+    assert not any(calls.values()), calls
+
+    nlp.get_match_details('job-python', 'resume-backend', sections=['recommendations'])
+    assert calls['get_document_skills'] == 2 and calls['generate_recommendations'] == 1
+    assert calls['calculate_semantic_similarity'] == calls['calculate_experience_match'] == 0
+    print("✅ Summaries skip detail work")
+
+
+def test_cached_details_reused_for_sections():
+    """Sections are taken from cached full details instead of being recomputed"""
+    nlp = build_processor()
+    nlp.score_cache = ScoreCache()
+    nlp.score_cache.set_model_version(nlp.model_version)
+    full = nlp.get_match_details('job-python', 'resume-backend')
+
+    calls = _count_calls(nlp, 'get_document_skills')
+    partial = nlp.get_match_details('job-python', 'resume-backend', sections=['skills_analysis'])
+    assert partial['skills_analysis'] == full['skills_analysis'] and 'component_scores' not in partial
+    assert calls['get_document_skills'] == 0
+    print("✅ Cached details reused for sections")
+
+
+def test_list_matches_reads_requested_columns():
+    """Stored matches are listed with only the optional columns asked for"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        job_id = db.create_job_description('Python Developer', 'Acme', 'python django', '', 'Recruiter')
+        resume_id = db.create_resume('a.txt', 'Alice', '', 'python', None)
+        db.create_match(job_id, resume_id, 0.8, ['python'], ['django'], {'score': 0.8})
+
+        default, _ = db.list_matches()
+        assert default[0]['common_skills'] == ['python'] and 'match_details' not in default[0]
+        summary, _ = db.list_matches(fields=set())
+        assert not {'common_skills', 'missing_skills', 'match_details'} & set(summary[0])
+        details, _ = db.list_matches(fields={'match_details'})
+        assert details[0]['match_details'] == {'score': 0.8} and 'missing_skills' not in details[0]
+        print("✅ Listed matches read only the requested columns")
+
+
+def test_fields_in_json_body():
+    """``fields`` in a JSON body may be a list of names as well as a comma-separated string"""
+    app, job_id = load_app()
+    assert app.parse_fields(['skills_analysis', ' recommendations'], app.MATCH_RESULT_FIELDS) == \
+        app.parse_fields('skills_analysis,recommendations', app.MATCH_RESULT_FIELDS) == \
+        {'skills_analysis', 'recommendations'}
+    assert app.parse_fields(['summary'], app.MATCH_RESULT_FIELDS) == set()
+
+    client = app.app.test_client()
+    response = client.post('/api/match', json={'job_id': job_id, 'fields': ['skills_analysis', 'recommendations']})
+    assert response.status_code == 200
+    for match in response.get_json()['matches']:
+        assert set(app.MATCH_RESULT_FIELDS) & set(match) == {'skills_analysis', 'recommendations'}
+
+    response = client.post('/api/match', json={'job_id': job_id, 'fields': []})
+    assert not any(set(app.MATCH_RESULT_FIELDS) & set(match) for match in response.get_json()['matches'])
+    for fields in (['salary'], {'skills_analysis': True}):
+        response = client.post('/api/match', json={'job_id': job_id, 'fields': fields})
+        assert response.status_code == 400, fields
+    print("✅ Fields accepted as a JSON list")
+
+
+if __name__ == "__main__":
+    test_sections_match_full_details()
+    test_summary_skips_detail_work()
+    test_cached_details_reused_for_sections()
+    test_list_matches_reads_requested_columns()
+    test_fields_in_json_body()
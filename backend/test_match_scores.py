@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for the materialized match_scores table and its maintenance
+"""
+
+import sys
+import os
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+import numpy as np
+from database import Database
+from score_materializer import ScoreMaterializer
+
+COMPONENTS = ('tfidf_similarity', 'semantic_similarity', 'skill_similarity',
+              'keyword_similarity', 'context_similarity')
+
+
+class KeywordProcessor:
+    """Minimal processor scoring documents by shared words, for exercising the materializer"""
+
+    def __init__(self):
+        self.job_embeddings = {}
+        self.resume_embeddings = {}
+        self.all_texts = []
+        self.corpus_fitted = False
+        self.model_version = None
+
+    def process_job_description(self, job_id, text):
+        self.job_embeddings[job_id] = set(text.lower().split())
+        self.all_texts.append(text)
+        self.corpus_fitted = False
+
+    def process_resume(self, resume_id, text):
+        self.resume_embeddings[resume_id] = set(text.lower().split())
+        self.all_texts.append(text)
+        self.corpus_fitted = False
+
+    def fit_corpus_vectorizers(self):
+        self.corpus_fitted = True
+        self.model_version = f'v{len(self.all_texts)}'
+
+    def categorize_match_strength(self, score):
+        return 'good' if score >= 0.5 else 'poor'
+
+    def calculate_similarity_matrix(self, job_ids, resume_ids, return_components=False):
+        scores = np.zeros((len(job_ids), len(resume_ids)))
+        for j, job_id in enumerate(job_ids):
+            for r, resume_id in enumerate(resume_ids):
+                job_words = self.job_embeddings.get(job_id, set())
+                resume_words = self.resume_embeddings.get(resume_id, set())
+                if job_words and resume_words:
+                    scores[j, r] = len(job_words & resume_words) / len(job_words | resume_words)
+        return scores, {name: scores.copy() for name in COMPONENTS}
+
+
+def _create_database(tmp):
+    db = Database(os.path.join(tmp, 'resume_matcher.db'))
+    job_id = db.create_job_description('Python Developer', 'Acme', 'python django aws', '', 'Recruiter')
+    strong = db.create_resume('a.txt', 'Alice', 'alice@example.com', 'python django aws docker', None)
+    weak = db.create_resume('b.txt', 'Bob', 'bob@example.com', 'chef cooking', None)
+    return db, job_id, strong, weak
+
+
+def test_upsert_and_read_scores():
+    """Scores are upserted per pair and read back best first"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db, job_id, strong, weak = _create_database(tmp)
+        row = {name: 0.1 for name in COMPONENTS}
+        db.upsert_match_scores([
+            dict(row, job_id=job_id, resume_id=weak, model_version='v1', similarity_score=0.1, match_category='poor'),
+            dict(row, job_id=job_id, resume_id=strong, model_version='v1', similarity_score=0.4, match_category='poor'),
+        ])
+        db.upsert_match_scores([
+            dict(row, job_id=job_id, resume_id=strong, model_version='v2', similarity_score=0.9, match_category='good'),
+        ])
+
+        scores = db.get_match_scores_for_job(job_id)
+        assert [score['resume_id'] for score in scores] == [strong, weak]
+        assert scores[0]['similarity_score'] == 0.9
+        assert scores[0]['model_version'] == 'v2'
+        assert db.get_best_match_scores()[strong]['job_title'] == 'Python Developer'
+        assert db.get_best_match_scores(model_version='v2')[strong]['similarity_score'] == 0.9
+        assert weak not in db.get_best_match_scores(model_version='v2')
+        assert db.get_match_score_coverage('v2') == (1, 2)
+        assert db.get_unscored_resume_ids(job_id, 'v2') == [weak]
+        assert db.get_unscored_resume_ids(job_id, 'v3') == sorted([strong, weak])
+        assert db.get_unscored_resume_ids(job_id, 'v3', after=min(strong, weak)) == [max(strong, weak)]
+        print("✅ Materialized scores upsert and read correctly")
+
+
+def test_sweep_scores_missing_and_stale_pairs():
+    """The sweep fills missing pairs and rescores after a model change"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db, job_id, strong, weak = _create_database(tmp)
+        processor = KeywordProcessor()
+        materializer = ScoreMaterializer(db, processor, batch_size=1)
+
+        # Load the corpus like the app does on startup
+        processor.process_job_description(job_id, 'python django aws')
+        processor.process_resume(strong, 'python django aws docker')
+        processor.process_resume(weak, 'chef cooking')
+        processor.fit_corpus_vectorizers()
+        assert materializer.sweep() == 2
+        assert db.get_match_score_coverage(processor.model_version) == (2, 2)
+
+        scores = {score['resume_id']: score for score in db.get_match_scores_for_job(job_id)}
+        assert scores[strong]['similarity_score'] > scores[weak]['similarity_score']
+        assert scores[strong]['match_category'] == 'good'
+
+        # A resume written by another process is loaded, refitting the model,
+        # so all existing pairs are rescored along with the new ones
+        db.create_resume('c.txt', 'Carol', 'carol@example.com', 'python aws', None)
+        assert materializer.sweep() >= 3
+        assert db.get_match_score_coverage(processor.model_version) == (3, 3)
+        assert materializer.sweep() == 0
+        print("✅ Sweep scores missing and stale pairs")
+
+
+def test_sweep_loads_bulk_imports_with_one_refit():
+    """Documents imported by another process are loaded together and the corpus refitted once"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db, job_id, strong, weak = _create_database(tmp)
+        processor = KeywordProcessor()
+        fits = []
+        fit = processor.fit_corpus_vectorizers
+        processor.fit_corpus_vectorizers = lambda: (fits.append(1), fit())
+        materializer = ScoreMaterializer(db, processor, batch_size=2)
+
+        processor.process_job_description(job_id, 'python django aws')
+        processor.process_resume(strong, 'python django aws docker')
+        processor.process_resume(weak, 'chef cooking')
+        processor.fit_corpus_vectorizers()
+        materializer.sweep()
+
+        db.save_bulk_ingest_batch('run', [
+            (f'bulk-{i}', f'{i}.txt', f'Candidate {i}', '', f'python developer {i}', None) for i in range(10)
+        ], [], [])
+        fits.clear()
+        assert materializer.sweep() == 12
+        assert fits == [1]
+        assert db.get_match_score_coverage(processor.model_version) == (12, 12)
+
+        with materializer.paused():
+            assert materializer.stats()['paused']
+        assert not materializer.stats()['paused']
+        print("✅ Sweep loads bulk imports with one refit")
+
+
+if __name__ == "__main__":
+    test_upsert_and_read_scores()
+    test_sweep_scores_missing_and_stale_pairs()
+    test_sweep_loads_bulk_imports_with_one_refit()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for storing match results
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from database import Database
+from test_schema_migrations import _query_plans
+
+
+def _create_database(tmp, resumes=3):
+    db = Database(os.path.join(tmp, 'resume_matcher.db'))
+    job_id = db.create_job_description('Python Developer', 'Acme', 'python django aws', '', 'Recruiter')
+    resume_ids = [db.create_resume(f'{i}.txt', f'Candidate {i}', '', f'python resume {i}', None)
+                  for i in range(resumes)]
+    return db, job_id, resume_ids
+
+
+def _match(job_id, resume_id, score, model_version='v1'):
+    return {
+        'job_id': job_id,
+        'resume_id': resume_id,
+        'model_version': model_version,
+        'similarity_score': score,
+        'common_skills': ['python'],
+        'missing_skills': ['aws'],
+        'match_details': {'match_percentage': round(score * 100, 2)}
+    }
+
+
+def test_matches_stored_in_one_batch():
+    """A batch of matches is written together and read back best first"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db, job_id, resume_ids = _create_database(tmp)
+
+        written = db.create_matches([_match(job_id, resume_id, score)
+                                     for resume_id, score in zip(resume_ids, (0.2, 0.9, 0.5))])
+
+        assert written == 3
+        matches = db.get_matches_for_job(job_id)
+        assert [match['resume_id'] for match in matches] == [resume_ids[1], resume_ids[2], resume_ids[0]]
+        assert matches[0]['common_skills'] == ['python']
+        assert matches[0]['match_details'] == {'match_percentage': 90.0}
+        assert db.create_matches([]) == 0
+        print("✅ Matches stored in one batch")
+
+
+def test_failed_batch_stores_nothing():
+    """The batch is one transaction: a bad row leaves no partial results"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db, job_id, resume_ids = _create_database(tmp)
+        batch = [_match(job_id, resume_id, 0.5) for resume_id in resume_ids]
+        batch[-1]['resume_id'] = None  # Violates NOT NULL
+
+        try:
+            db.create_matches(batch)
+            assert False, 'the batch should fail'
+        except sqlite3.IntegrityError:
+            pass
+
+        assert db.get_matches_for_job(job_id) == []
+        print("✅ Failed batches store nothing")
+
+
+def test_rematching_replaces_stored_matches():
+    """Matching a job again updates its rows instead of adding new ones"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db, job_id, resume_ids = _create_database(tmp)
+        match_id = db.create_match(job_id, resume_ids[0], 0.4, [], [], {}, model_version='v1')
+
+        for score in (0.5, 0.6, 0.7):
+            db.create_matches([_match(job_id, resume_id, score) for resume_id in resume_ids])
+
+        matches = db.get_matches_for_job(job_id)
+        assert len(matches) == 3
+        assert {match['similarity_score'] for match in matches} == {0.7}
+        assert [match['id'] for match in matches if match['resume_id'] == resume_ids[0]] == [match_id]
+        assert len(db.get_all_matches()) == 3
+
+        # Rewrites keep the first store time, which orders match pages, and record their own
+        with db.connection() as conn:
+            conn.execute("UPDATE matches SET created_at = '2024-01-01 10:00:00', updated_at = created_at")
+        assert db.create_match(job_id, resume_ids[0], 0.8, [], [], {}, model_version='v1') == match_id
+        with db.connection() as conn:
+            created_at, updated_at = conn.execute('SELECT created_at, updated_at FROM matches WHERE id = ?',
+                                                  (match_id,)).fetchone()
+        assert created_at == '2024-01-01 10:00:00' and updated_at > created_at
+        print("✅ Rematching replaces stored matches")
+
+
+def test_compaction_keeps_live_pairs():
+    """Compaction drops rows of superseded model versions, per job or for the whole table"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db, job_id, resume_ids = _create_database(tmp)
+        other_job = db.create_job_description('Chef', 'Diner', 'cooking', '', 'Recruiter')
+        for version in ('v1', 'v2'):
+            db.create_matches([_match(job, resume_id, 0.5, version)
+                               for job in (job_id, other_job) for resume_id in resume_ids])
+        # A pair only scored by the old version keeps that row
+        db.create_matches([_match(job_id, 'old-resume', 0.5, 'v1')])
+        assert len(db.get_all_matches()) == 12
+
+        assert db.compact_matches('v2', job_id=job_id) == 3
+        versions = [match['model_version'] for match in db.get_matches_for_job(job_id)]
+        assert versions == ['v2'] * 3
+        assert len(db.get_matches_for_job(other_job)) == 6
+
+        assert db.compact_matches('v2') == 3
+        assert db.compact_matches('v2') == 0
+        assert len(db.get_all_matches()) == 6
+        print("✅ Compaction keeps one row per live pair")
+
+
+def test_search_filters_run_in_sqlite():
+    """Component score and skill filters select matches through the indexed columns and join table"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db, job_id, resume_ids = _create_database(tmp, resumes=6)
+        matches = []
+        for i, resume_id in enumerate(resume_ids):
+            match = _match(job_id, resume_id, 0.5 + i / 20)
+            match['common_skills'] = ['python', 'Kubernetes'] if i % 2 else ['python']
+            match['match_details']['component_scores'] = {'skill_similarity': i / 5, 'tfidf_similarity': 0.4}
+            matches.append(match)
+        db.create_matches(matches)
+
+        found = db.find_matches(job_id, min_components={'skill_similarity': 0.5}, matched_skills=['kubernetes'])
+        assert [m['resume_id'] for m in found] == [resume_ids[5], resume_ids[3]]
+        assert found[0]['component_scores']['skill_similarity'] == 1.0
+        assert found[0]['component_scores']['semantic_similarity'] is None
+        assert [m['resume_id'] for m in db.find_matches(job_id, missing_skills=['AWS'], limit=2)] == \
+            [resume_ids[5], resume_ids[4]]
+        assert db.find_matches(job_id, matched_skills=['aws']) == []
+        assert len(db.find_matches(min_score=0.7)) == 2
+
+        plans = _query_plans(db, lambda: db.find_matches(job_id, min_components={'skill_similarity': 0.5},
+                                                         matched_skills=['kubernetes']))
+        steps = ' | '.join(plans[0])
+        assert 'SEARCH m USING INDEX idx_matches_job_score' in steps, steps
+        assert 'SEARCH ms USING PRIMARY KEY' in steps, steps
+
+        # Rematching replaces the skills; deleting the match removes them
+        matches[5]['common_skills'] = ['python']
+        db.create_matches([matches[5]])
+        assert resume_ids[5] not in [m['resume_id'] for m in db.find_matches(job_id, matched_skills=['kubernetes'])]
+        db.create_matches([_match(job_id, resume_id, 0.5, 'v2') for resume_id in resume_ids])
+        assert db.compact_matches('v2') == 6
+        with db.connection() as conn:
+            # Only the python/aws rows of the v2 matches are left
+            assert conn.execute('SELECT COUNT(*) FROM match_skills').fetchone()[0] == 12
+
+        try:
+            db.find_matches(min_components={'made_up_similarity': 0.5})
+            assert False, 'unknown components should be rejected'
+        except ValueError:
+            pass
+        print("✅ Match search filters run in SQLite")
+
+
+if __name__ == "__main__":
+    test_matches_stored_in_one_batch()
+    test_failed_batch_stores_nothing()
+    test_rematching_replaces_stored_matches()
+    test_compaction_keeps_live_pairs()
+    test_search_filters_run_in_sqlite()
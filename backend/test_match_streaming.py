@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming /api/match results as newline-delimited JSON
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add current directory to path
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BACKEND_DIR)
+
+RESUMES = [
+    ('alice.txt', 'Alice', 'Senior Python developer, 6 years of Django, Flask, PostgreSQL and AWS'),
+    ('bob.txt', 'Bob', 'Frontend engineer with React, JavaScript and CSS'),
+    ('carol.txt', 'Carol', 'Head chef with 10 years of kitchen management'),
+]
+
+_app = None
+
+
+def load_app():
+    """
+    Import the Flask app once, with its database, uploads and score cache in a temporary directory.
+
+    Returns the app module and the id of a job description with RESUMES stored against it.
+    """
+    global _app
+    if _app is None:
+        if 'app' not in sys.modules:
+            os.environ.setdefault('EXTRACTION_SANDBOX_WORKERS', '0')
+            os.environ.setdefault('SCORE_CACHE_BACKEND', 'memory')
+            # The app keeps its database and uploads in the working directory (conftest.py does this under pytest)
+            os.chdir(tempfile.mkdtemp())
+        import app
+        job_id = app.db.create_job_description(
+            'Python Developer', 'Acme', 'Python developer with Django, Flask and AWS experience',
+            '5 years of Python', 'Recruiter'
+        )
+        for filename, name, content in RESUMES:
+            app.db.create_resume(filename, name, f'{name.lower()}@example.com', content, None)
+        _app = (app, job_id)
+    return _app
+
+
+def _stream(client, job_id, query=''):
+    response = client.post(f'/api/match?stream=true{query}', json={'job_id': job_id})
+    return response, [json.loads(line) for line in response.get_data().splitlines()]
+
+
+def test_stream_sends_one_match_per_line():
+    """The response is NDJSON with one match object per line, then a summary record"""
+    app, job_id = load_app()
+    response, records = _stream(app.app.test_client(), job_id)
+
+    assert response.status_code == 200 and response.mimetype == 'application/x-ndjson'
+    assert response.get_data().endswith(b'\n')
+    matches, summary = records[:-1], records[-1]
+    assert [record['type'] for record in matches] == ['match'] * len(RESUMES)
+    assert {record['candidate_name'] for record in matches} == {name for _, name, _ in RESUMES}
+    assert all(section in matches[0] for section in app.MATCH_RESULT_FIELDS)
+
+    best = max(matches, key=lambda record: record['similarity_score'])
+    assert summary == {'type': 'summary', 'success': True, 'job_id': job_id, 'total_candidates': len(RESUMES),
+                       'best_match': {'resume_id': best['resume_id'], 'similarity_score': best['similarity_score']}}
+    assert best['candidate_name'] == 'Alice'
+    print("✅ Streamed matches sent one per line")
+
+
+def test_stream_reports_errors_in_band():
+    """A failure after the first chunk ends the stream with an error record instead of a summary"""
+    app, job_id = load_app()
+    score_resume_match, chunk_size = app.score_resume_match, app.MATCH_STREAM_CHUNK_SIZE
+    calls = []
+
+    def failing_score(*args, **kwargs):
+        calls.append(1)
+        if len(calls) > 1:
+            raise RuntimeError('scoring failed')
+        return score_resume_match(*args, **kwargs)
+
+    app.score_resume_match, app.MATCH_STREAM_CHUNK_SIZE = failing_score, 1
+    try:
+        response, records = _stream(app.app.test_client(), job_id)
+    finally:
+        app.score_resume_match, app.MATCH_STREAM_CHUNK_SIZE = score_resume_match, chunk_size
+
+    assert response.status_code == 200
+    assert [record['type'] for record in records] == ['match', 'error']
+    assert records[-1] == {'type': 'error', 'error': 'Internal server error', 'total_candidates': 1}
+    print("✅ Stream errors reported in band")
+
+
+def test_stream_respects_fields():
+    """Streamed matches carry only the sections named in ``fields``"""
+    app, job_id = load_app()
+    client = app.app.test_client()
+
+    _, records = _stream(client, job_id, '&fields=summary')
+    assert records[-1]['type'] == 'summary' and records[-1]['total_candidates'] == len(RESUMES)
+    assert not any(set(app.MATCH_RESULT_FIELDS) & set(record) for record in records[:-1])
+
+    _, records = _stream(client, job_id, '&fields=skills_analysis,recommendations')
+    for record in records[:-1]:
+        assert set(app.MATCH_RESULT_FIELDS) & set(record) == {'skills_analysis', 'recommendations'}
+        assert 'similarity_score' in record and 'candidate_name' in record
+
+    response = client.post('/api/match?stream=true&fields=salary', json={'job_id': job_id})
+    assert response.status_code == 400 and 'salary' in response.get_json()['error']
+    print("✅ Streamed matches respect fields")
+
+
+if __name__ == "__main__":
+    test_stream_sends_one_match_per_line()
+    test_stream_reports_errors_in_band()
+    test_stream_respects_fields()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for keyset pagination of the list queries
+"""
+
+import sys
+import os
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from database import Database, decode_cursor, encode_cursor
+from test_schema_migrations import _query_plans
+
+
+def _all_pages(list_page, limit):
+    rows, after, pages = [], None, 0
+    while True:
+        page, after = list_page(after, limit)
+        rows.extend(page)
+        pages += 1
+        if after is None:
+            return rows, pages
+
+
+def test_pages_cover_every_row_once():
+    """Rows sharing a timestamp are split across pages without gaps or repeats"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        job_id = db.create_job_description('Python Developer', 'Acme', 'python django', '', 'Recruiter')
+        resume_ids = [db.create_resume(f'{i}.txt', f'Candidate {i}', '', 'python ' * 1000, None) for i in range(7)]
+        # CURRENT_TIMESTAMP has one second resolution; force ties across page boundaries
+        with db.connection() as conn:
+            conn.execute("UPDATE resumes SET uploaded_at = '2024-01-01 10:00:00'")
+        db.create_matches([
+            {'job_id': job_id, 'resume_id': resume_id, 'similarity_score': 0.5, 'common_skills': ['python'],
+             'missing_skills': [], 'match_details': {'score': 0.5}}
+            for resume_id in resume_ids
+        ])
+
+        resumes, pages = _all_pages(db.list_resumes, 3)
+        assert pages == 3
+        assert [r['id'] for r in resumes] == sorted(resume_ids, reverse=True)
+        assert all('content' not in r for r in resumes)
+
+        matches, _ = _all_pages(db.list_matches, 2)
+        assert sorted(m['resume_id'] for m in matches) == sorted(resume_ids)
+        assert all('match_details' not in m for m in matches)
+        detailed, _ = db.list_matches(limit=1, include_details=True)
+        assert detailed[0]['match_details'] == {'score': 0.5}
+
+        jobs, next_cursor = db.list_job_descriptions(limit=1)
+        assert [job['id'] for job in jobs] == [job_id] and next_cursor is None
+        print("✅ Pages cover every row once")
+
+
+def test_later_pages_seek_through_the_index():
+    """A page after a cursor starts at the cursor in the index instead of skipping rows"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        for i in range(3):
+            db.create_resume(f'{i}.txt', f'Candidate {i}', '', 'python', None)
+        _, after = db.list_resumes(limit=1)
+
+        plans = _query_plans(db, lambda: db.list_resumes(after, 1))
+        assert len(plans) == 1
+        assert any('SEARCH resumes USING INDEX idx_resumes_uploaded_at_id' in step for step in plans[0]), plans
+        assert not any('TEMP B-TREE' in step for step in plans[0]), plans
+        print("✅ Later pages seek through the index")
+
+
+def test_invalid_cursor_rejected():
+    """Cursors round-trip and anything else raises ValueError"""
+    assert decode_cursor(encode_cursor('2024-01-01 10:00:00', 'abc')) == ('2024-01-01 10:00:00', 'abc')
+    for cursor in ('not-a-cursor', encode_cursor('only', 'two') + 'x', 'WzFd'):
+        try:
+            decode_cursor(cursor)
+            assert False, f'{cursor} should be rejected'
+        except ValueError:
+            pass
+    print("✅ Invalid cursors rejected")
+
+
+if __name__ == "__main__":
+    test_pages_cover_every_row_once()
+    test_later_pages_seek_through_the_index()
+    test_invalid_cursor_rejected()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for response encoding: fast JSON, msgpack negotiation and compression
+"""
+
+import sys
+import os
+import gzip
+import json
+
+import numpy as np
+from flask import Flask, jsonify
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+import responses
+from responses import api_response, dumps_json, init_app, RESPONSE_COMPRESS_MIN_BYTES
+
+LARGE = {'matches': [{'resume_id': f'r{i}', 'similarity_score': np.float64(i / 1000)} for i in range(500)]}
+
+
+def _client():
+    app = Flask(__name__)
+    init_app(app)
+
+    @app.route('/large')
+    def large():
+        return api_response(LARGE)
+
+    @app.route('/small')
+    def small():
+        return jsonify({'status': 'ok', 'score': np.float32(0.5)})
+
+    return app.test_client()
+
+
+def test_numpy_values_encoded():
+    """NumPy scalars and arrays serialize as plain JSON numbers and lists"""
+    payload = {'score': np.float32(0.25), 'count': np.int64(3), 'vector': np.array([0.5, 1.5]),
+               'skills': {'python'}, 'plain': 0.1}
+    assert json.loads(dumps_json(payload)) == {'score': 0.25, 'count': 3, 'vector': [0.5, 1.5],
+                                               'skills': ['python'], 'plain': 0.1}
+    assert _client().get('/small').get_json() == {'status': 'ok', 'score': 0.5}
+    print("✅ NumPy values encoded")
+
+
+def test_compression_negotiated():
+    """Bodies above the threshold are gzipped for clients that accept it; others are sent as is"""
+    client = _client()
+    compressed = client.get('/large', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert int(compressed.headers['Content-Length']) == len(compressed.data)
+    body = gzip.decompress(compressed.data)
+    assert len(body) > RESPONSE_COMPRESS_MIN_BYTES and len(compressed.data) < len(body) / 3
+    assert json.loads(body)['matches'][2] == {'resume_id': 'r2', 'similarity_score': 0.002}
+
+    assert 'Content-Encoding' not in client.get('/large').headers
+    assert 'Content-Encoding' not in client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers
+    print("✅ Compression negotiated")
+
+
+def test_msgpack_negotiated():
+    """MessagePack is sent only to clients asking for it, and only when msgpack is installed"""
+    client = _client()
+    assert client.get('/large').mimetype == 'application/json'
+    response = client.get('/large', headers={'Accept': 'application/msgpack'})
+    if responses.msgpack is None:
+        assert response.mimetype == 'application/json'
+    else:
+        assert response.mimetype == 'application/msgpack'
+        assert responses.msgpack.unpackb(response.data)['matches'][2]['similarity_score'] == 0.002
+    print("✅ MessagePack negotiated")
+
+
+if __name__ == "__main__":
+    test_numpy_values_encoded()
+    test_compression_negotiated()
+    test_msgpack_negotiated()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for schema migrations and the indexes behind the listing queries
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+import database
+from database import Database, MIGRATIONS
+
+
+def _query_plans(db, call):
+    """Run ``call`` and return the query plan details of every SELECT it issued"""
+    statements = []
+    # The pool is LIFO, so ``call`` reuses the connection traced here
+    with db.connection() as conn:
+        conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        conn.set_trace_callback(None)
+
+    plans = []
+    for sql in statements:
+        if sql.lstrip().upper().startswith('SELECT'):
+            plans.append([row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql)])
+    return plans
+
+
+def test_listing_queries_use_indexes():
+    """Listing queries read through an index instead of scanning and sorting"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'resume_matcher.db'))
+        assert db.get_schema_version() == len(MIGRATIONS)
+        job_id = db.create_job_description('Python Developer', 'Acme', 'python django', '', 'Recruiter')
+        resume_id = db.create_resume('a.txt', 'Alice', '', 'python django aws', None)
+        db.create_match(job_id, resume_id, 0.8, ['python'], [], {})
+
+        expected = {
+            'get_matches_for_job': (lambda: db.get_matches_for_job(job_id), 'SEARCH m USING INDEX idx_matches_job_score'),
+            'get_all_matches': (db.get_all_matches, 'SCAN m USING INDEX idx_matches_created_at_id'),
+            'get_resumes': (db.get_resumes, 'SCAN resumes USING INDEX idx_resumes_uploaded_at_id'),
+            'get_resume_ids': (db.get_resume_ids, 'USING COVERING INDEX idx_resumes_uploaded_at_id'),
+            'get_job_descriptions': (db.get_job_descriptions,
+                                     'SCAN job_descriptions USING INDEX idx_job_descriptions_created_at_id'),
+            'get_job_ids': (db.get_job_ids, 'USING COVERING INDEX idx_job_descriptions_created_at_id'),
+            'list_resumes': (lambda: db.list_resumes(), 'SCAN resumes USING INDEX idx_resumes_uploaded_at_id'),
+            'list_job_descriptions': (lambda: db.list_job_descriptions(),
+                                      'SCAN job_descriptions USING INDEX idx_job_descriptions_created_at_id'),
+            'list_matches': (lambda: db.list_matches(), 'SCAN m USING INDEX idx_matches_created_at_id'),
+        }
+        for name, (call, index_step) in expected.items():
+            plans = _query_plans(db, call)
+            assert len(plans) == 1, name
+            steps = plans[0]
+            assert any(index_step in step for step in steps), f'{name}: {steps}'
+            assert not any('TEMP B-TREE' in step for step in steps), f'{name} sorts: {steps}'
+        print("✅ Listing queries use indexes")
+
+
+def test_existing_database_migrated_once():
+    """A database created before migrations existed is upgraded in place, once"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'resume_matcher.db')
+        conn = sqlite3.connect(path)
+        conn.execute('''
+            CREATE TABLE matches (
+                id TEXT PRIMARY KEY, job_id TEXT NOT NULL, resume_id TEXT NOT NULL,
+                similarity_score REAL, common_skills TEXT, missing_skills TEXT, match_details TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        # Every /api/match call used to add a row per pair
+        details = '{"component_scores": {"skill_similarity": 0.8}, "match_category": "good"}'
+        conn.executemany('''
+            INSERT INTO matches (id, job_id, resume_id, similarity_score, common_skills, missing_skills,
+                                 match_details, created_at)
+            VALUES (?, ?, ?, ?, ?, '["go"]', ?, ?)
+        ''', [
+            ('m1', 'j1', 'r1', 0.5, '["python"]', details, '2024-01-01 10:00:00'),
+            ('m2', 'j1', 'r1', 0.6, '["python"]', details, '2024-01-02 10:00:00'),
+            ('m3', 'j1', 'r2', 0.7, '["python", "docker"]', None, '2024-01-01 10:00:00'),
+        ])
+        conn.commit()
+        conn.close()
+
+        db = Database(path)
+        assert db.get_schema_version() == len(MIGRATIONS)
+        with db.connection() as conn:
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            rows = conn.execute('SELECT id, model_version FROM matches ORDER BY id').fetchall()
+            updated = conn.execute('SELECT id, updated_at FROM matches ORDER BY id').fetchall()
+            components = conn.execute('SELECT id, skill_similarity, match_category FROM matches ORDER BY id').fetchall()
+            skills = conn.execute('''
+                SELECT ms.match_id, ms.kind, s.name FROM match_skills ms JOIN skills s ON s.id = ms.skill_id
+                ORDER BY 1, 2, 3
+            ''').fetchall()
+        assert {'idx_matches_job_score', 'idx_matches_created_at_id', 'idx_resumes_uploaded_at_id',
+                'idx_job_descriptions_created_at_id', 'idx_matches_pair_version'} <= indexes
+        assert 'idx_resumes_uploaded_at' not in indexes  # Replaced by the keyset index
+        assert rows == [('m2', ''), ('m3', '')]  # Duplicates collapsed to the newest row
+        assert updated == [('m2', '2024-01-02 10:00:00'), ('m3', '2024-01-01 10:00:00')]
+        # Component scores and skills backfilled from the JSON columns
+        assert components == [('m2', 0.8, 'good'), ('m3', None, None)]
+        assert skills == [('m2', 'matched', 'python'), ('m2', 'missing', 'go'),
+                          ('m3', 'matched', 'docker'), ('m3', 'matched', 'python'), ('m3', 'missing', 'go')]
+
+        # Opening the database again finds nothing to do
+        calls = []
+        original = MIGRATIONS[0]
+        MIGRATIONS[0] = lambda cursor: calls.append(1)
+        try:
+            Database(path)
+        finally:
+            MIGRATIONS[0] = original
+        assert calls == []
+        print("✅ Existing database migrated once")
+
+
+def test_failed_migration_rolls_back():
+    """A migration that fails leaves no partial changes and the version unchanged"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'resume_matcher.db')
+        Database(path)
+
+        def broken(cursor):
+            cursor.execute('CREATE INDEX idx_half_done ON resumes (candidate_name)')
+            raise RuntimeError('migration failed')
+
+        database.MIGRATIONS.append(broken)
+        try:
+            Database(path)
+            assert False, 'the broken migration should raise'
+        except RuntimeError:
+            pass
+        finally:
+            database.MIGRATIONS.remove(broken)
+
+        db = Database(path)
+        assert db.get_schema_version() == len(MIGRATIONS)
+        with db.connection() as conn:
+            assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_half_done'").fetchone() is None
+        print("✅ Failed migrations roll back")
+
+
+if __name__ == "__main__":
+    test_listing_queries_use_indexes()
+    test_existing_database_migrated_once()
+    test_failed_migration_rolls_back()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Tests for the score cache and its shared SQLite backend
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from score_cache import ScoreCache, SQLiteCacheBackend, create_score_cache
+
+
+def test_hits_and_misses():
+    """Cached facets are returned and counted"""
+    cache = ScoreCache(max_entries=10)
+    cache.set_model_version('v1')
+    key = cache.make_key('job text', 'resume text', 'v1')
+
+    assert cache.get(key, 'score') is None
+    cache.put(key, 'score', 0.42)
+    assert cache.get(key, 'score') == 0.42
+    assert cache.get(key, 'details') is None
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    print("✅ Hits and misses counted correctly")
+
+
+def test_lru_eviction_by_entries():
+    """Least recently used entries are evicted first"""
+    cache = ScoreCache(max_entries=2)
+    cache.set_model_version('v1')
+    first = cache.make_key('job', 'resume 1', 'v1')
+    second = cache.make_key('job', 'resume 2', 'v1')
+    third = cache.make_key('job', 'resume 3', 'v1')
+
+    cache.put(first, 'score', 0.1)
+    cache.put(second, 'score', 0.2)
+    cache.get(first, 'score')  # first is now most recently used
+    cache.put(third, 'score', 0.3)
+
+    assert cache.get(first, 'score') == 0.1
+    assert cache.get(second, 'score') is None
+    assert cache.get(third, 'score') == 0.3
+    assert cache.stats()['evictions'] == 1
+    print("✅ LRU eviction by entry count works")
+
+
+def test_eviction_by_bytes():
+    """Entries are evicted when the byte budget is exceeded"""
+    cache = ScoreCache(max_entries=None, max_bytes=200)
+    cache.set_model_version('v1')
+    for i in range(10):
+        cache.put(cache.make_key('job', f'resume {i}', 'v1'), 'details', {'skills': ['python'] * 5})
+
+    stats = cache.stats()
+    assert stats['bytes'] <= 200
+    assert stats['evictions'] > 0
+    print("✅ LRU eviction by byte budget works")
+
+
+def test_model_version_invalidation():
+    """A model version change drops all cached scores"""
+    cache = ScoreCache()
+    cache.set_model_version('v1')
+    old_key = cache.make_key('job', 'resume', 'v1')
+    cache.put(old_key, 'score', 0.5)
+
+    cache.set_model_version('v2')
+    assert cache.get(old_key, 'score') is None
+    assert cache.stats()['entries'] == 0
+    assert cache.stats()['invalidations'] == 1
+
+    # Results computed against the old model are not stored
+    cache.put(old_key, 'score', 0.5)
+    assert cache.stats()['entries'] == 0
+    print("✅ Model version change invalidates the cache")
+
+
+def _shared_cache(path, **backend_options):
+    """Create a cache that behaves like one worker process sharing ``path``"""
+    cache = ScoreCache(max_entries=10, backend=SQLiteCacheBackend(path, **backend_options))
+    cache.set_model_version('v1')
+    return cache
+
+
+def test_shared_backend_between_workers():
+    """Scores computed by one worker are reused by another"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'score_cache.db')
+        worker_a = _shared_cache(path)
+        worker_b = _shared_cache(path)
+        key = worker_a.make_key('job', 'resume', 'v1')
+
+        worker_a.put(key, 'details', {'matched_skills': ['python'], 'score': 0.7})
+        assert worker_b.get(key, 'details') == {'matched_skills': ['python'], 'score': 0.7}
+        assert worker_b.stats()['shared_hits'] == 1
+        print("✅ Shared backend serves scores across workers")
+
+
+def test_shared_backend_eviction():
+    """The shared cache is trimmed when it exceeds its entry limit"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _shared_cache(os.path.join(tmp, 'score_cache.db'),
+                              max_entries=20, eviction_check_interval=5)
+        for i in range(50):
+            cache.put(cache.make_key('job', f'resume {i}', 'v1'), 'score', i / 50)
+
+        shared_stats = cache.backend.stats()
+        assert shared_stats['entries'] <= 20
+        assert shared_stats['evictions'] > 0
+        print("✅ Shared backend eviction keeps the cache bounded")
+
+
+def test_stampede_guard():
+    """Concurrent misses for the same pair compute the score only once"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'score_cache.db')
+        workers = [_shared_cache(path) for _ in range(2)]
+        key = workers[0].make_key('job', 'resume', 'v1')
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 0.8
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda c=cache: results.append(c.get_or_compute(key, 'score', compute)))
+            for cache in workers for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [0.8] * 6
+        assert len(calls) == 1
+        print("✅ Stampede guard computes each score once")
+
+
+def test_create_score_cache():
+    """The factory builds memory and sqlite caches"""
+    assert create_score_cache('memory').backend is None
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = create_score_cache('sqlite', path=os.path.join(tmp, 'cache', 'score_cache.db'))
+        assert isinstance(cache.backend, SQLiteCacheBackend)
+    print("✅ Score cache factory works")
+
+
+if __name__ == "__main__":
+    test_hits_and_misses()
+    test_lru_eviction_by_entries()
+    test_eviction_by_bytes()
+    test_model_version_invalidation()
+    test_shared_backend_between_workers()
+    test_shared_backend_eviction()
+    test_stampede_guard()
+    test_create_score_cache()
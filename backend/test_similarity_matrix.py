@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Check that batched similarity scoring matches pair-by-pair scoring
+"""
+
+import sys
+import os
+import threading
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+import numpy as np
+from nlp_processor import ResumeMatcherNLP
+from score_cache import ScoreCache
+
+
+JOBS = {
+    'job-python': """
+    Senior Python Developer
+
+    Requirements:
+    - 5+ years of experience with Python, Django and Flask
+    - PostgreSQL, Docker, Kubernetes and AWS
+    - Bachelor degree in Computer Science
+    """,
+    'job-frontend': """
+    Frontend Engineer
+
+    Skills:
+    - React, JavaScript, TypeScript, HTML and CSS
+    - 3 years experience building web applications
+    """,
+}
+
+RESUMES = {
+    'resume-backend': """
+    Jane Doe - Backend Engineer
+
+    Experience:
+    6 years of experience building Python services with Django and Flask.
+    Deployed on AWS using Docker and Kubernetes, PostgreSQL databases.
+
+    Education:
+    Bachelor of Science in Computer Science
+    """,
+    'resume-frontend': """
+    John Roe - Web Developer
+
+    Skills:
+    React, JavaScript, HTML, CSS, Redux
+
+    Experience:
+    4 years experience with web applications
+    """,
+    'resume-chef': """
+    Head Chef with 10 years of kitchen management and menu design.
+    """,
+}
+
+
+def build_processor():
+    """Create a processor with caching disabled so every score is recomputed"""
+    nlp = ResumeMatcherNLP(score_cache=ScoreCache(max_entries=0))
+    for job_id, text in JOBS.items():
+        nlp.process_job_description(job_id, text)
+    for resume_id, text in RESUMES.items():
+        nlp.process_resume(resume_id, text)
+    nlp.fit_corpus_vectorizers()
+    return nlp
+
+
+def test_matrix_matches_pairwise_scores():
+    """Every matrix entry equals calculate_similarity for the same pair"""
+    nlp = build_processor()
+    job_ids = list(JOBS) + ['unknown-job']
+    resume_ids = list(RESUMES)
+
+    matrix = nlp.calculate_similarity_matrix(job_ids, resume_ids)
+    assert matrix.shape == (len(job_ids), len(resume_ids))
+
+    for j, job_id in enumerate(job_ids):
+        for r, resume_id in enumerate(resume_ids):
+            expected = nlp.calculate_similarity(job_id, resume_id)
+            assert np.isclose(matrix[j, r], expected), (job_id, resume_id, matrix[j, r], expected)
+
+    # Unknown documents score zero like calculate_similarity does
+    assert not matrix[-1].any()
+    print("✅ Batched scores match pairwise scores")
+
+
+def test_matrix_uses_score_cache():
+    """Scores computed in a batch are served from the cache afterwards"""
+    nlp = build_processor()
+    nlp.score_cache = ScoreCache()
+    nlp.score_cache.set_model_version(nlp.model_version)
+
+    first = nlp.calculate_similarity_matrix(list(JOBS), list(RESUMES))
+    hits_before = nlp.score_cache.stats()['hits']
+    second = nlp.calculate_similarity_matrix(list(JOBS), list(RESUMES))
+
+    assert np.array_equal(first, second)
+    assert nlp.score_cache.stats()['hits'] - hits_before == len(JOBS) * len(RESUMES)
+    print("✅ Batched scores are cached")
+
+
+def test_detail_components_match_matrix_components():
+    """Component scores in match details are the same quantities the batch scorer stores"""
+    nlp = build_processor()
+    scores, components = nlp.calculate_similarity_matrix(list(JOBS), list(RESUMES), return_components=True)
+
+    for j, job_id in enumerate(JOBS):
+        for r, resume_id in enumerate(RESUMES):
+            details = nlp.get_match_details(job_id, resume_id)
+            assert np.isclose(details['overall_similarity'], scores[j, r])
+            for name, value in details['component_scores'].items():
+                assert np.isclose(value, components[name][j, r]), (job_id, resume_id, name)
+    print("✅ Detail components match matrix components")
+
+
+def test_model_version_follows_idf():
+    """Refitting the same corpus keeps the model version; a refit that changes IDF weights changes it"""
+    nlp = build_processor()
+    version = nlp.model_version
+
+    nlp.fit_corpus_vectorizers()
+    assert nlp.model_version == version
+
+    vocabulary = set(nlp.tfidf_vectorizer.vocabulary_)
+    idf = nlp.tfidf_vectorizer.idf_.copy()
+    before = nlp.calculate_tfidf_similarity('job-python', 'resume-backend')
+    # Only known terms, so the vocabulary stays the same and only the weights move
+    nlp.process_resume('resume-repeat', 'Python Django Flask PostgreSQL, 2 years')
+    nlp.fit_corpus_vectorizers()
+    assert set(nlp.tfidf_vectorizer.vocabulary_) == vocabulary
+    assert not np.allclose(nlp.tfidf_vectorizer.idf_, idf)
+    assert not np.isclose(nlp.calculate_tfidf_similarity('job-python', 'resume-backend'), before)
+    assert nlp.model_version != version
+    print("✅ Model version follows IDF weights")
+
+
+def test_refits_do_not_disturb_scoring():
+    """Scores computed while other threads refit the corpus equal scores computed alone"""
+    nlp = build_processor()
+    expected = nlp.calculate_similarity_matrix(list(JOBS), list(RESUMES))
+    results, stop = [], threading.Event()
+
+    def refit():
+        while not stop.is_set():
+            nlp.fit_corpus_vectorizers()
+
+    def score():
+        for _ in range(20):
+            results.append(nlp.calculate_similarity_matrix(list(JOBS), list(RESUMES)))
+            results.append(np.array([[nlp.calculate_similarity(job_id, resume_id) for resume_id in RESUMES]
+                                     for job_id in JOBS]))
+
+    refitter = threading.Thread(target=refit)
+    scorers = [threading.Thread(target=score) for _ in range(3)]
+    refitter.start()
+    for thread in scorers:
+        thread.start()
+    for thread in scorers:
+        thread.join()
+    stop.set()
+    refitter.join()
+
+    assert len(results) == 120
+    assert all(np.allclose(result, expected) for result in results)
+    print("✅ Refits do not disturb scoring")
+
+
+if __name__ == "__main__":
+    test_matrix_matches_pairwise_scores()
+    test_matrix_uses_score_cache()
+    test_detail_components_match_matrix_components()
+    test_model_version_follows_idf()
+    test_refits_do_not_disturb_scoring()
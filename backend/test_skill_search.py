@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent skill index and skill search
+"""
+
+import sys
+import os
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from database import Database
+from test_schema_migrations import _query_plans
+
+
+def _indexed_resumes(tmp):
+    db = Database(os.path.join(tmp, 'resume_matcher.db'))
+    skills = {
+        'ana': ['python', 'aws'],
+        'ben': ['python', 'aws', 'docker'],
+        'cat': ['python', 'aws', 'docker', 'kubernetes'],
+        'dan': ['python'],
+        'eve': ['docker'],
+    }
+    resume_ids = {name: db.create_resume(f'{name}.txt', name, '', f'{name} resume', None) for name in skills}
+    db.index_document_skills([('resume', resume_ids[name], skills[name]) for name in skills])
+    return db, resume_ids
+
+
+def test_all_and_any_skills():
+    """Results have every skill of all= and one of any=, ranked by the requested skills they have"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db, resume_ids = _indexed_resumes(tmp)
+        names = {resume_id: name for name, resume_id in resume_ids.items()}
+
+        results = db.search_documents_by_skills(['Python', 'AWS'], ['docker', 'kubernetes'])
+        assert [names[r['id']] for r in results] == ['cat', 'ben']
+        assert results[0]['matched_skills'] == ['aws', 'docker', 'kubernetes', 'python']
+        assert (results[0]['score'], results[1]['score']) == (1.0, 0.75)
+        assert results[0]['candidate_name'] == 'cat'
+
+        assert sorted(names[r['id']] for r in db.search_documents_by_skills(['python', 'aws'])) == ['ana', 'ben', 'cat']
+        assert [names[r['id']] for r in db.search_documents_by_skills(any_skills=['docker', 'kubernetes'])][0] == 'cat'
+        assert len(db.search_documents_by_skills(any_skills=['docker', 'kubernetes'])) == 3
+        assert db.search_documents_by_skills(['python', 'rust']) == []
+        assert db.search_documents_by_skills(['python'], ['rust']) == []
+        assert db.search_documents_by_skills(['python'], doc_type='job') == []
+        assert len(db.search_documents_by_skills(['python'], limit=2)) == 2
+        print("✅ all= and any= skill searches")
+
+
+def test_index_replaced_and_cleaned_up():
+    """Reindexing replaces a document's skills and deleting the document removes them"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db, resume_ids = _indexed_resumes(tmp)
+        db.index_document_skills([('resume', resume_ids['dan'], ['rust'])])
+        assert [r['id'] for r in db.search_documents_by_skills(['rust'])] == [resume_ids['dan']]
+        assert resume_ids['dan'] not in [r['id'] for r in db.search_documents_by_skills(['python'])]
+
+        with db.connection() as conn:
+            conn.execute('DELETE FROM resumes WHERE id = ?', (resume_ids['dan'],))
+        assert db.search_documents_by_skills(['rust']) == []
+        assert db.get_skill_indexed_ids('resume') == {resume_ids[name] for name in ('ana', 'ben', 'cat', 'eve')}
+
+        job_id = db.create_job_description('Platform Engineer', 'Acme', 'kubernetes', '', 'Recruiter')
+        db.index_document_skills([('job', job_id, ['kubernetes', 'go'])])
+        results = db.search_documents_by_skills(['kubernetes'], doc_type='job')
+        assert [(r['id'], r['title']) for r in results] == [(job_id, 'Platform Engineer')]
+        print("✅ Skill index replaced and cleaned up")
+
+
+def test_search_reads_the_index():
+    """The search looks skills up through the primary key instead of scanning documents"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db, _ = _indexed_resumes(tmp)
+        plans = _query_plans(db, lambda: db.search_documents_by_skills(['python', 'aws'], ['docker']))
+        steps = ' | '.join(step for plan in plans for step in plan)
+        assert 'SEARCH document_skills USING PRIMARY KEY (skill_id=? AND doc_type=?)' in steps, steps
+        assert 'SCAN document_skills' not in steps and 'SCAN r' not in steps, steps
+        print("✅ Skill search reads the index")
+
+
+if __name__ == "__main__":
+    test_all_and_any_skills()
+    test_index_replaced_and_cleaned_up()
+    test_search_reads_the_index()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming PDF and DOCX extraction
+"""
+
+import sys
+import os
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+import io
+import docx
+from concurrent.futures import ProcessPoolExecutor
+from benchmark_extraction import build_text_pdf, legacy_extract_pdf, legacy_extract_docx
+from text_extraction import extract_docx_text, extract_text, extract_pdf_text, PDF_PARALLEL_MIN_PAGES
+
+PAGES = [f'Page {i} Python Django AWS' for i in range(PDF_PARALLEL_MIN_PAGES + 4)]
+
+
+def _write_pdf(tmp):
+    path = os.path.join(tmp, 'resume.pdf')
+    with open(path, 'wb') as f:
+        f.write(build_text_pdf(PAGES))
+    return path
+
+
+def test_matches_legacy_extraction():
+    """Without budgets the engine returns the same text as page concatenation"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write_pdf(tmp)
+        expected = legacy_extract_pdf(path)
+        assert 'Page 19 Python' in expected
+        assert extract_pdf_text(path, max_pages=None, max_chars=None) == expected
+        with open(path, 'rb') as f:
+            assert extract_pdf_text(f.read(), max_pages=None, max_chars=None) == expected
+        print("✅ Streaming extraction matches the previous output")
+
+
+def test_page_and_char_budgets():
+    """Extraction stops after the page or character budget"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write_pdf(tmp)
+        two_pages = extract_pdf_text(path, max_pages=2, max_chars=None)
+        assert 'Page 1 Python' in two_pages and 'Page 2' not in two_pages
+        assert len(extract_pdf_text(path, max_pages=None, max_chars=30)) == 30
+        print("✅ Page and character budgets respected")
+
+
+def test_parallel_extraction():
+    """Page ranges extracted in a process pool are joined in page order"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write_pdf(tmp)
+        expected = extract_pdf_text(path, max_pages=None, max_chars=None)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            assert extract_pdf_text(path, max_pages=None, max_chars=None,
+                                    executor=executor, chunk_pages=3) == expected
+            assert extract_pdf_text(path, max_pages=None, max_chars=100,
+                                    executor=executor, chunk_pages=3) == expected[:100]
+        print("✅ Parallel extraction matches sequential extraction")
+
+
+def _build_docx():
+    document = docx.Document()
+    document.add_paragraph('Jane Doe\tBackend Engineer')
+    paragraph = document.add_paragraph('Experience')
+    paragraph.add_run().add_break()
+    paragraph.add_run('6 years of Python')
+    table = document.add_table(rows=1, cols=2)
+    table.cell(0, 0).text, table.cell(0, 1).text = 'Django', 'AWS'
+    document.add_paragraph('Education')
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def test_docx_matches_python_docx():
+    """Streamed DOCX text equals python-docx paragraph text, tables optional"""
+    data = _build_docx()
+    expected = legacy_extract_docx(io.BytesIO(data))
+    assert extract_docx_text(data) == expected
+    assert extract_text(io.BytesIO(data), 'resume.docx') == expected
+
+    with_tables = extract_docx_text(data, include_tables=True)
+    assert with_tables == 'Jane Doe\tBackend Engineer\nExperience\n6 years of Python\nDjango\nAWS\nEducation\n'
+    assert extract_docx_text(data, max_chars=8) == 'Jane Doe'
+    print("✅ Streaming DOCX extraction matches python-docx")
+
+
+if __name__ == "__main__":
+    test_matches_legacy_extraction()
+    test_page_and_char_budgets()
+    test_parallel_extraction()
+    test_docx_matches_python_docx()
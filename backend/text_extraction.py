@@ -0,0 +1,216 @@
+"""
+Document text extraction for the Resume Matcher.
+
+PDF pages are streamed into a list buffer and joined once, extraction stops
+after a page or character budget, and long documents can be split into page
+ranges extracted in parallel by a process pool. DOCX text is streamed out of
+``word/document.xml`` with ``iterparse`` instead of building the python-docx
+object model.
+"""
+
+import io
+import multiprocessing
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Union
+import logging
+
+import PyPDF2
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction output changes so cached document text is not reused
+EXTRACTOR_VERSION = '2'
+
+# Resumes rarely run past a few pages; the budgets bound work on huge uploads
+PDF_MAX_PAGES = 50
+PDF_MAX_CHARS = 200000
+# Below this many pages the process round trip costs more than it saves
+PDF_PARALLEL_MIN_PAGES = 16
+PDF_CHUNK_PAGES = 8
+
+PdfSource = Union[str, bytes, io.IOBase]
+
+
+class ExtractionError(Exception):
+    """Text could not be extracted from a document; the message says why"""
+
+
+_extraction_pool = None
+
+
+def get_extraction_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    """Return the shared process pool for page-parallel extraction, or None if disabled"""
+    global _extraction_pool
+    if workers <= 0:
+        return None
+    if _extraction_pool is None:
+        # spawn keeps workers independent of the threads running in the Flask process
+        _extraction_pool = ProcessPoolExecutor(max_workers=workers,
+                                               mp_context=multiprocessing.get_context('spawn'))
+    return _extraction_pool
+
+
+def _open_pdf(source: PdfSource) -> PyPDF2.PdfReader:
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    return PyPDF2.PdfReader(source)
+
+
+def _extract_page_range(source: PdfSource, start: int, end: int) -> List[str]:
+    """Extract pages [start, end) of a PDF; runs inside pool workers"""
+    reader = _open_pdf(source)
+    return [reader.pages[i].extract_text() or '' for i in range(start, end)]
+
+
+def _collect_pages(pages: Iterable[str], max_chars: Optional[int]) -> str:
+    """Buffer page texts until the character budget is reached and join them once"""
+    parts = []
+    total = 0
+    for text in pages:
+        parts.append(text)
+        total += len(text)
+        if max_chars and total >= max_chars:
+            break
+    text = ''.join(parts)
+    return text[:max_chars] if max_chars else text
+
+
+def _iter_pages_parallel(source: PdfSource, page_count: int, executor: ProcessPoolExecutor,
+                         chunk_pages: int) -> Iterable[str]:
+    futures = [
+        executor.submit(_extract_page_range, source, start, min(start + chunk_pages, page_count))
+        for start in range(0, page_count, chunk_pages)
+    ]
+    try:
+        # Results are consumed in page order so the character budget cuts at the same place
+        for future in futures:
+            yield from future.result()
+    finally:
+        # Stopping early (budget reached) drops chunks that have not started yet
+        for future in futures:
+            future.cancel()
+
+
+def extract_pdf_text(source: PdfSource, max_pages: Optional[int] = PDF_MAX_PAGES,
+                     max_chars: Optional[int] = PDF_MAX_CHARS,
+                     executor: Optional[ProcessPoolExecutor] = None,
+                     chunk_pages: int = PDF_CHUNK_PAGES) -> str:
+    """
+    Extract text from a PDF given as a path, bytes or binary file object.
+
+    At most ``max_pages`` pages and ``max_chars`` characters are extracted
+    (None disables a budget). With an ``executor``, documents of
+    ``PDF_PARALLEL_MIN_PAGES`` or more pages are split into ``chunk_pages``
+    ranges extracted in parallel.
+    """
+    reader = _open_pdf(source)
+    page_count = len(reader.pages)
+    if max_pages:
+        page_count = min(page_count, max_pages)
+
+    if executor is not None and page_count >= PDF_PARALLEL_MIN_PAGES:
+        if not isinstance(source, (str, bytes)):
+            # Pool workers need a picklable source
+            source.seek(0)
+            source = source.read()
+        pages = _iter_pages_parallel(source, page_count, executor, chunk_pages)
+    else:
+        pages = (reader.pages[i].extract_text() or '' for i in range(page_count))
+
+    return _collect_pages(pages, max_chars)
+
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_BODY, _PARAGRAPH, _RUN, _HYPERLINK, _CELL = _W + 'body', _W + 'p', _W + 'r', _W + 'hyperlink', _W + 'tc'
+# Run content and its text, as python-docx renders it (w:br depends on its type)
+_RUN_TEXT = {_W + 't': None, _W + 'tab': '\t', _W + 'ptab': '\t', _W + 'cr': '\n',
+             _W + 'noBreakHyphen': '-', _W + 'br': None}
+
+
+def extract_docx_text(source: PdfSource, max_chars: Optional[int] = PDF_MAX_CHARS,
+                      include_tables: bool = False) -> str:
+    """
+    Stream the text of a DOCX given as a path, bytes or binary file object.
+
+    Returns the body paragraphs one per line, like joining python-docx's
+    ``paragraph.text`` values, and with ``include_tables`` also the paragraphs
+    of table cells in document order. Parsed elements are cleared as soon as
+    they are read, so memory stays small regardless of document size.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    parts = []
+    total = 0
+    stack = []
+    paragraphs = []  # Text buffers of the open (possibly nested) paragraphs
+    body = None
+    with zipfile.ZipFile(source) as archive, archive.open('word/document.xml') as document:
+        for event, elem in ET.iterparse(document, events=('start', 'end')):
+            if event == 'start':
+                stack.append(elem.tag)
+                if elem.tag == _PARAGRAPH:
+                    paragraphs.append([])
+                elif elem.tag == _BODY:
+                    body = elem
+                continue
+
+            if elem.tag in _RUN_TEXT:
+                # Only runs of the paragraph itself count, directly or inside a hyperlink
+                if len(stack) >= 3 and stack[-2] == _RUN and (
+                        stack[-3] == _PARAGRAPH
+                        or (stack[-3] == _HYPERLINK and len(stack) >= 4 and stack[-4] == _PARAGRAPH)):
+                    if elem.tag == _W + 't':
+                        text = elem.text or ''
+                    elif elem.tag == _W + 'br':
+                        text = '\n' if elem.get(_W + 'type', 'textWrapping') == 'textWrapping' else ''
+                    else:
+                        text = _RUN_TEXT[elem.tag]
+                    paragraphs[-1].append(text)
+
+            elif elem.tag == _PARAGRAPH:
+                text = ''.join(paragraphs.pop())
+                parent = stack[-2] if len(stack) >= 2 else None
+                if parent == _BODY or (include_tables and parent == _CELL):
+                    parts.append(text + '\n')
+                    total += len(text) + 1
+                elem.clear()
+
+            stack.pop()
+            if body is not None and len(stack) == 2 and stack[-1] == _BODY:
+                body.clear()  # Drop finished top-level paragraphs and tables
+            if max_chars and total >= max_chars:
+                break
+
+    text = ''.join(parts)
+    return text[:max_chars] if max_chars else text
+
+
+def extract_text(source: PdfSource, filename: Optional[str] = None,
+                 max_pages: Optional[int] = PDF_MAX_PAGES, max_chars: Optional[int] = PDF_MAX_CHARS,
+                 executor: Optional[ProcessPoolExecutor] = None, include_tables: bool = False) -> str:
+    """
+    Extract text from a PDF, DOCX or TXT document given as a path, bytes or binary file object.
+
+    The format is taken from the extension of ``filename``, or of ``source`` if
+    it is a path. Unsupported formats return an empty string.
+    """
+    file_extension = (filename or source).lower().split('.')[-1]
+    if isinstance(source, bytes) and file_extension != 'pdf':
+        source = io.BytesIO(source)
+
+    if file_extension == 'pdf':
+        return extract_pdf_text(source, max_pages=max_pages, max_chars=max_chars, executor=executor)
+
+    elif file_extension == 'docx':
+        return extract_docx_text(source, max_chars=max_chars, include_tables=include_tables)
+
+    elif file_extension == 'txt':
+        if isinstance(source, str):
+            with open(source, 'r', encoding='utf-8') as file:
+                return file.read()
+        return source.read().decode('utf-8')
+
+    return ""
@@ -75,6 +75,11 @@ const CandidateDashboard = () => {
       const response = await apiService.uploadResume(formData);
       
       if (response.success) {
+        const status = await apiService.waitForResume(response.resume_id);
+        if (status.status === 'failed') {
+          toast.error(status.error || 'Failed to process resume');
+          return;
+        }
         toast.success('Resume uploaded successfully!');
         fetchResumes();
         // Clear candidate info after successful upload
@@ -45,6 +45,20 @@ api.interceptors.response.use(
   }
 );
 
+// Follow the next_cursor of a paginated list endpoint and collect every page
+async function getAllPages(url, key, params = {}) {
+  const items = [];
+  let after = null;
+  let data;
+  do {
+    const response = await api.get(url, { params: after ? { ...params, after } : params });
+    data = response.data;
+    items.push(...data[key]);
+    after = data.next_cursor;
+  } while (after);
+  return { ...data, [key]: items, next_cursor: null };
+}
+
 export const apiService = {
   // Health check
   async healthCheck() {
@@ -59,8 +73,7 @@ export const apiService = {
   },
 
   async getJobDescriptions() {
-    const response = await api.get('/api/job-descriptions');
-    return response.data;
+    return getAllPages('/api/job-descriptions', 'job_descriptions');
   },
 
   // Resume APIs
@@ -74,8 +87,7 @@ export const apiService = {
   },
 
   async getResumes() {
-    const response = await api.get('/api/resumes');
-    return response.data;
+    return getAllPages('/api/resumes', 'resumes');
   },
 
   async getResumeDetails(resumeId) {
@@ -83,15 +95,32 @@ export const apiService = {
     return response.data;
   },
 
+  async getResumeStatus(resumeId) {
+    const response = await api.get(`/api/resume/${resumeId}/status`);
+    return response.data;
+  },
+
+  // Poll until a queued resume is processed; resolves with the final status
+  async waitForResume(resumeId, { interval = 1000, timeout = 120000 } = {}) {
+    const deadline = Date.now() + timeout;
+    while (Date.now() < deadline) {
+      const status = await this.getResumeStatus(resumeId);
+      if (status.status === 'completed' || status.status === 'failed') {
+        return status;
+      }
+      await new Promise((resolve) => setTimeout(resolve, interval));
+    }
+    throw new Error('Resume processing is taking longer than expected');
+  },
+
   // Matching APIs
   async matchResumes(jobId) {
     const response = await api.post('/api/match', { job_id: jobId });
     return response.data;
   },
 
-  async getMatches() {
-    const response = await api.get('/api/matches');
-    return response.data;
+  async getMatches(params = {}) {
+    return getAllPages('/api/matches', 'matches', params);
   },
 
   // Candidate matching APIs
@@ -101,8 +130,7 @@ export const apiService = {
   },
 
   async getCandidateResumes() {
-    const response = await api.get('/api/candidate/resumes');
-    return response.data;
+    return getAllPages('/api/candidate/resumes', 'resumes');
   },
 
   // Enhanced feedback and validation APIs